@@ -5,7 +5,9 @@ import logging
 from dotenv import load_dotenv
 from flask_cors import CORS
 from app.supabase_client import supabase_bp, get_supabase
-from app.services.value_trade import calculate_player_trade_value, evaluate_trade
+from app.services.value_trade import calculate_player_trade_value, evaluate_trade, player_asset_values, store_trade_values
+from app.services.trade_value_index import get_trade_value_index
+from app.services.trade_finder import check_search_limits, find_packages, find_packages_league
 import httpx
 
 # Load environment variables
@@ -118,6 +120,86 @@ def api_evaluate_trade():
         app.logger.error(f"Error in trade evaluation: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+# Batch trade values (trade boards, AI GMs)
+@app.route('/api/trade-values', methods=['POST'])
+def api_trade_values():
+    try:
+        data = request.json or {}
+        
+        # Value the given player payloads, or players from the shared player store
+        players = data.get('players')
+        if players is not None:
+            values = player_asset_values(players)
+            return jsonify({"values": values.tolist()})
+        
+        player_ids, values = store_trade_values(data.get('player_ids'))
+        return jsonify({"player_ids": player_ids, "values": values.tolist()})
+    except Exception as e:
+        app.logger.error(f"Error in batch trade valuation: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# Players within a trade value range, from the maintained trade value index
+@app.route('/api/trade-values/range', methods=['GET'])
+def api_trade_value_range():
+    try:
+        index = get_trade_value_index()
+        if not len(index):
+            index.load_from_store()
+        
+        under_cap = request.args.get('under_cap', 'false').lower() == 'true'
+        if under_cap and not index.has_contracts:
+            return jsonify({"error": "No contract data loaded; cap hits are unknown"}), 400
+        
+        limit = request.args.get('limit', type=int)
+        players = index.range(
+            min_value=request.args.get('min', 0.0, type=float),
+            max_value=request.args.get('max', 100.0, type=float),
+            team=request.args.get('team'),
+            position=request.args.get('position'),
+            under_cap=under_cap,
+            limit=limit
+        )
+        return jsonify({"players": players, "count": len(players)})
+    except Exception as e:
+        app.logger.error(f"Error in trade value range query: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+# Trade finder: packages from one partner (or every partner) that balance a target
+@app.route('/api/trade-finder', methods=['POST'])
+def api_trade_finder():
+    try:
+        data = request.json or {}
+        
+        options = {
+            'target_players': data.get('target_players'),
+            'target_picks': data.get('target_picks'),
+            'target_value': data.get('target_value'),
+            'top_k': int(data.get('top_k', 10)),
+            'max_assets': int(data.get('max_assets', 4)),
+            'tolerance': data.get('tolerance'),
+            'time_budget': float(data.get('time_budget', 2.0)),
+            'draft_context': data.get('draft_context', 'no_context')
+        }
+        check_search_limits(options['top_k'], options['max_assets'], options['time_budget'])
+        
+        # Search all partners in parallel when given as {team: {players, picks}}
+        partners = data.get('partners')
+        if partners is not None:
+            result = find_packages_league(partners, **options)
+        else:
+            result = find_packages(
+                partner_players=data.get('partner_players', []),
+                partner_picks=data.get('partner_picks', []),
+                exclude_ids=data.get('exclude_ids'),
+                **options
+            )
+        return jsonify(result)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        app.logger.error(f"Error in trade finder: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 # Endpoint to get all leagues
 @app.route('/api/leagues', methods=['GET'])
 @app.route('/api/leagues/', methods=['GET'])  # Added trailing slash version
@@ -1,6 +1,9 @@
 from typing import Dict, List, Any, Tuple, Optional
 import math
 import random
+import numpy as np
+from .player_store import get_player_store
+from .time_played_store import TimePlayedStore, get_time_played_store, player_key
 
 class ChemistryCalculator:
     """
@@ -128,10 +131,35 @@ class ChemistryCalculator:
         }
     }
     
-    def __init__(self):
-        """Initialize the chemistry calculator with default parameters."""
-        # Dictionary to track time played together between pairs of players
-        self.time_played_together = {}
+    def __init__(self, time_played: Optional[TimePlayedStore] = None):
+        """
+        Initialize the chemistry calculator with default parameters.
+        
+        Args:
+            time_played: Store of minutes played together per pair (the
+                league-wide store when None, so time played accumulates
+                across formations and requests)
+        """
+        self.time_played = time_played if time_played is not None else get_time_played_store()
+        
+        # Precomputed pairwise compatibility for the current roster (see set_roster)
+        self.matrix = None
+        
+    def set_roster(self, players: List[Dict[str, Any]]) -> 'ChemistryMatrix':
+        """
+        Precompute the pairwise compatibility matrix for a roster.
+        
+        Once set, every line, pair, PP and PK chemistry calculation for players
+        on this roster is an index lookup into the matrix.
+        
+        Args:
+            players: List of player dictionaries
+            
+        Returns:
+            The ChemistryMatrix built for the roster
+        """
+        self.matrix = ChemistryMatrix(players, self)
+        return self.matrix
         
     def get_player_size_category(self, weight: float) -> str:
         """
@@ -161,6 +189,13 @@ class ChemistryCalculator:
         Returns:
             Tuple of (compatibility score, factors dictionary)
         """
+        # Use the precomputed roster matrix when both players are on it
+        if self.matrix is not None:
+            i = self.matrix.index_of(player1)
+            j = self.matrix.index_of(player2)
+            if i is not None and j is not None:
+                return self.matrix.pair_compatibility(i, j)
+        
         compatibility_score = 0.0
         factors = {}
         
@@ -200,8 +235,7 @@ class ChemistryCalculator:
                 factors['shooting_side'] = shoot_compat * 2
         
         # Time played together factor
-        player_pair_key = self._get_player_pair_key(player1, player2)
-        time_played = self.time_played_together.get(player_pair_key, 0)
+        time_played = self.time_played.get(player1, player2)
         
         # Chemistry improves with time played together (up to a point)
         time_factor = 0
@@ -213,26 +247,6 @@ class ChemistryCalculator:
         
         return compatibility_score, factors
     
-    def _get_player_pair_key(self, player1: Dict[str, Any], player2: Dict[str, Any]) -> str:
-        """
-        Create a consistent key for a pair of players regardless of order.
-        
-        Args:
-            player1: First player dictionary
-            player2: Second player dictionary
-            
-        Returns:
-            String key representing the player pair
-        """
-        id1 = player1.get('id', player1.get('name', ''))
-        id2 = player2.get('id', player2.get('name', ''))
-        
-        # Sort to ensure consistency regardless of player order
-        if str(id1) < str(id2):
-            return f"{id1}_{id2}"
-        else:
-            return f"{id2}_{id1}"
-    
     def calculate_forward_line_chemistry(self, players: List[Dict[str, Any]]) -> Tuple[float, Dict[str, Any]]:
         """
         Calculate chemistry for a forward line.
@@ -509,21 +523,24 @@ class ChemistryCalculator:
             players: List of player dictionaries
             minutes: Minutes played together in this session
         """
-        # For each pair of players, update their time played together
-        for i in range(len(players)):
-            if players[i] is None or players[i] == 'Empty':
-                continue
-                
-            for j in range(i + 1, len(players)):
-                if players[j] is None or players[j] == 'Empty':
-                    continue
-                    
-                pair_key = self._get_player_pair_key(players[i], players[j])
-                
-                if pair_key in self.time_played_together:
-                    self.time_played_together[pair_key] += minutes
-                else:
-                    self.time_played_together[pair_key] = minutes
+        self.update_time_played_batch([(players, minutes)])
+    
+    def update_time_played_batch(self, groups: List[Tuple[List[Dict[str, Any]], float]]) -> None:
+        """
+        Update the time played together for several groups of players at once.
+        
+        The pairs are merged into the time played store in one pass and the
+        roster matrix is refreshed once, so a game's worth of line/pair/unit
+        minutes costs a single update.
+        
+        Args:
+            groups: List of (players, minutes played together) tuples
+        """
+        self.time_played.add_groups(groups)
+        
+        # Time played is part of the roster matrix
+        if self.matrix is not None:
+            self.matrix.refresh_time_played()
     
     def get_chemistry_performance_modifier(self, chemistry_value: float) -> float:
         """
@@ -542,8 +559,25 @@ class ChemistryCalculator:
         return 1.0 + (chemistry_value / 33.33)
     
     def reset_time_played(self) -> None:
-        """Reset all time played data."""
-        self.time_played_together = {}
+        """
+        Reset all time played data, league-wide.
+
+        The store is shared by every team (the process-wide TimePlayedStore
+        by default), so this clears the time played of all teams. Use
+        reset_team_time_played to only reset this calculator's roster.
+        """
+        self.time_played.clear()
+        
+        if self.matrix is not None:
+            self.matrix.refresh_time_played()
+
+    def reset_team_time_played(self) -> None:
+        """Reset the time played of every pair involving a player of this calculator's roster."""
+        if self.matrix is None:
+            return
+        
+        self.time_played.clear_players(player_key(p) for p in self.matrix.players)
+        self.matrix.refresh_time_played()
 
     def calculate_team_chemistry(self, lines: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -601,3 +635,256 @@ class ChemistryCalculator:
         chemistry['overall'] = round(overall, 1)
         
         return chemistry
+
+
+def _compatibility_table(compatibility: Dict[str, Dict[str, float]], keys: List[str]) -> np.ndarray:
+    """Convert a nested compatibility dictionary to a square lookup table ordered by keys."""
+    return np.array([[compatibility[k1][k2] for k2 in keys] for k1 in keys], dtype=np.float64)
+
+
+class ChemistryMatrix:
+    """
+    Pairwise compatibility matrix for a roster.
+    
+    Player type, size class and shooting side are encoded as small integer
+    arrays and the full N x N compatibility matrix is computed in one
+    vectorized pass, using the same tables and weights as
+    ChemistryCalculator._calculate_player_compatibility. Line, pair and unit
+    chemistry are then index lookups.
+    """
+    
+    PLAYER_TYPES = list(ChemistryCalculator.PLAYER_TYPE_COMPATIBILITY.keys())
+    SIZE_CATEGORIES = ['Small', 'Medium', 'Large']
+    SHOOTING_SIDES = ['L', 'R']
+    
+    # Lookup tables built from the calculator's compatibility dictionaries
+    TYPE_TABLE = _compatibility_table(ChemistryCalculator.PLAYER_TYPE_COMPATIBILITY, PLAYER_TYPES)
+    SIZE_TABLE = _compatibility_table(ChemistryCalculator.SIZE_COMPATIBILITY, SIZE_CATEGORIES)
+    SHOOTING_TABLE = _compatibility_table(ChemistryCalculator.SHOOTING_SIDE_COMPATIBILITY, SHOOTING_SIDES)
+    
+    # Defensive player types that earn the PK bonus
+    DEFENSIVE_TYPES = ['2 Way Forward', 'Defensive Def.', '2 Way Def.']
+    
+    def __init__(self, players: List[Dict[str, Any]], calculator: Optional[ChemistryCalculator] = None):
+        """
+        Encode a roster and compute its compatibility matrix.
+        
+        Args:
+            players: List of player dictionaries
+            calculator: ChemistryCalculator providing time played and normalization
+        """
+        self.calculator = calculator or ChemistryCalculator()
+        self.players = [p for p in (players or []) if p is not None and p != 'Empty']
+        self.size = len(self.players)
+        
+        # Map player id (or object identity when there is no id) to matrix index
+        self._index = {}
+        for i, player in enumerate(self.players):
+            self._index.setdefault(self._player_key(player), i)
+        
+        shooting_index = {s: i for i, s in enumerate(self.SHOOTING_SIDES)}
+        
+        # Player type and weight come from the shared player store when the
+        # whole roster is loaded there, otherwise from the dictionaries
+        encoded = self._encode_from_store()
+        if encoded is None:
+            type_index = {t: i for i, t in enumerate(self.PLAYER_TYPES)}
+            weights = np.array([self._weight(p) for p in self.players], dtype=np.float64)
+            self.type_codes = np.array([type_index.get(p.get('player_type'), -1) for p in self.players], dtype=np.int8)
+        else:
+            weights, self.type_codes = encoded
+        
+        self.size_codes = np.where(weights < 180, 0, np.where(weights < 210, 1, 2)).astype(np.int8)
+        self.shooting_codes = np.array([shooting_index.get(p.get('shoots'), -1) for p in self.players], dtype=np.int8)
+        self.is_defense = np.array([str(p.get('position') or '').startswith('D') for p in self.players], dtype=bool)
+        defensive_codes = [self.PLAYER_TYPES.index(t) for t in self.DEFENSIVE_TYPES if t in self.PLAYER_TYPES]
+        self.is_defensive_type = np.isin(self.type_codes, defensive_codes)
+        
+        self._compute_static_components()
+        self.refresh_time_played()
+    
+    def _encode_from_store(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Read weights and player type codes from the player store.
+        
+        Returns:
+            Tuple of (weights, type codes), or None if any player is not stored
+        """
+        if not self.players:
+            return None
+        
+        store = get_player_store()
+        rows = store.rows([p.get('id') for p in self.players])
+        if (rows < 0).any():
+            return None
+        
+        # Default to medium if not specified
+        weights = store.column('weight')[rows]
+        weights = np.where(np.isnan(weights), 190.0, weights)
+        
+        # Translate store category codes into PLAYER_TYPES indices
+        type_index = {t: i for i, t in enumerate(self.PLAYER_TYPES)}
+        translation = np.array([type_index.get(t, -1) for t in store.categories('player_type')] + [-1], dtype=np.int8)
+        store_codes = store.column('player_type')[rows]
+        type_codes = translation[np.where(store_codes >= 0, store_codes, len(translation) - 1)]
+        
+        return weights, type_codes
+    
+    @staticmethod
+    def _player_key(player: Dict[str, Any]) -> Any:
+        player_id = player.get('id')
+        return player_id if player_id is not None else ('obj', id(player))
+    
+    @staticmethod
+    def _weight(player: Dict[str, Any]) -> float:
+        weight = player.get('weight', 190)  # Default to medium if not specified
+        return float(weight) if weight is not None else 190.0
+    
+    def _compute_static_components(self) -> None:
+        """Compute the type, size and shooting side matrices in one pass."""
+        types = self.type_codes.astype(np.intp)
+        sizes = self.size_codes.astype(np.intp)
+        shoots = self.shooting_codes.astype(np.intp)
+        
+        # Player type compatibility (only when both types are known)
+        self.type_mask = (types[:, None] >= 0) & (types[None, :] >= 0)
+        self.type_matrix = np.where(self.type_mask, self.TYPE_TABLE[types[:, None], types[None, :]], 0.0)
+        
+        # Size compatibility
+        self.size_matrix = self.SIZE_TABLE[sizes[:, None], sizes[None, :]]
+        
+        # Shooting side compatibility, doubled, for defense pairs only
+        self.shooting_mask = (self.is_defense[:, None] & self.is_defense[None, :] &
+                              (shoots[:, None] >= 0) & (shoots[None, :] >= 0))
+        self.shooting_matrix = np.where(self.shooting_mask, self.SHOOTING_TABLE[shoots[:, None], shoots[None, :]] * 2, 0.0)
+    
+    def refresh_time_played(self) -> None:
+        """Rebuild the time-played component from the calculator's totals."""
+        minutes = self.calculator.time_played.roster_minutes(self.players)
+        
+        # 0.5 at 100 minutes, 1.0 at 300 minutes, capped at 1.5
+        self.time_matrix = np.where(minutes > 0, np.minimum(1.5, minutes / 333), 0.0)
+        
+        # Add components in the same order as the scalar calculation
+        self.compatibility = self.type_matrix + self.size_matrix + self.shooting_matrix + self.time_matrix
+    
+    def index_of(self, player: Any) -> Optional[int]:
+        """Return the matrix index of a player, or None if it is not on this roster."""
+        if not isinstance(player, dict):
+            return None
+        return self._index.get(self._player_key(player))
+    
+    def indices(self, players: List[Dict[str, Any]]) -> Optional[List[int]]:
+        """Return matrix indices for a list of players, or None if any is missing."""
+        result = []
+        for player in players:
+            i = self.index_of(player)
+            if i is None:
+                return None
+            result.append(i)
+        return result
+    
+    def pair_compatibility(self, i: int, j: int) -> Tuple[float, Dict[str, float]]:
+        """
+        Compatibility between two roster players by index.
+        
+        Returns:
+            Tuple of (compatibility score, factors dictionary)
+        """
+        factors = {}
+        if self.type_mask[i, j]:
+            factors['player_type'] = float(self.type_matrix[i, j])
+        factors['size'] = float(self.size_matrix[i, j])
+        if self.shooting_mask[i, j]:
+            factors['shooting_side'] = float(self.shooting_matrix[i, j])
+        if self.time_matrix[i, j] > 0:
+            factors['time_played'] = float(self.time_matrix[i, j])
+        
+        return float(self.compatibility[i, j]), factors
+    
+    def normalize(self, raw_scores: Any) -> np.ndarray:
+        """Vectorized ChemistryCalculator._normalize_chemistry_score followed by rounding to 0.5."""
+        calc = self.calculator
+        normalized = ((np.asarray(raw_scores, dtype=np.float64) - (-3)) / (5 - (-3))) * \
+            (calc.MAX_CHEMISTRY - calc.MIN_CHEMISTRY) + calc.MIN_CHEMISTRY
+        normalized = np.clip(normalized, calc.MIN_CHEMISTRY, calc.MAX_CHEMISTRY)
+        return np.round(normalized * 2) / 2
+    
+    def forward_line_scores(self, lines: Any) -> np.ndarray:
+        """
+        Chemistry for many forward lines at once.
+        
+        Args:
+            lines: Array-like of shape (k, 3) with [LW, C, RW] indices
+            
+        Returns:
+            Array of k chemistry ratings (-5 to +5, rounded to 0.5)
+        """
+        lines = np.asarray(lines, dtype=np.intp).reshape(-1, 3)
+        c = self.compatibility
+        weighted = (c[lines[:, 0], lines[:, 1]] * 0.4) + (c[lines[:, 1], lines[:, 2]] * 0.4) + (c[lines[:, 0], lines[:, 2]] * 0.2)
+        return self.normalize(weighted)
+    
+    def defense_pair_scores(self, pairs: Any) -> np.ndarray:
+        """
+        Chemistry for many defense pairs at once.
+        
+        Args:
+            pairs: Array-like of shape (k, 2) with [LD, RD] indices
+            
+        Returns:
+            Array of k chemistry ratings (-5 to +5, rounded to 0.5)
+        """
+        pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+        return self.normalize(self.compatibility[pairs[:, 0], pairs[:, 1]])
+    
+    def forward_line_chemistry(self, lw: int, c: int, rw: int) -> float:
+        """Chemistry for one forward line by index."""
+        return float(self.forward_line_scores([[lw, c, rw]])[0])
+    
+    def defense_pair_chemistry(self, ld: int, rd: int) -> float:
+        """Chemistry for one defense pair by index."""
+        return float(self.defense_pair_scores([[ld, rd]])[0])
+    
+    def pp_unit_chemistry(self, forwards: List[int], defense: List[int]) -> float:
+        """Chemistry for a power play unit by index (same weights as calculate_pp_unit_chemistry)."""
+        if not forwards or not defense:
+            return 0
+        c = self.compatibility
+        
+        forward_scores = [c[forwards[i], forwards[j]] for i in range(len(forwards)) for j in range(i + 1, len(forwards))]
+        defense_scores = [c[defense[i], defense[j]] for i in range(len(defense)) for j in range(i + 1, len(defense))]
+        cross_scores = [c[f, d] for f in forwards for d in defense]
+        
+        total_score = 0
+        total_weight = 0
+        for scores, weight in ((forward_scores, 0.5), (defense_scores, 0.2), (cross_scores, 0.3)):
+            if scores:
+                total_score += sum(scores) / len(scores) * weight
+                total_weight += weight
+        
+        weighted_score = total_score / total_weight if total_weight > 0 else 0
+        return float(self.normalize(weighted_score))
+    
+    def pk_unit_chemistry(self, forwards: List[int], defense: List[int]) -> float:
+        """Chemistry for a penalty kill unit by index (same weights as calculate_pk_unit_chemistry)."""
+        if not forwards or not defense:
+            return 0
+        c = self.compatibility
+        
+        total_score = 0
+        total_weight = 0
+        if len(forwards) > 1:
+            total_score += c[forwards[0], forwards[1]] * 0.3
+            total_weight += 0.3
+        if len(defense) > 1:
+            total_score += c[defense[0], defense[1]] * 0.3
+            total_weight += 0.3
+        
+        defensive_bonus = 0.5 * int(self.is_defensive_type[list(forwards) + list(defense)].sum())
+        if defensive_bonus > 0:
+            total_score += defensive_bonus * 0.4
+            total_weight += 0.4
+        
+        weighted_score = total_score / total_weight if total_weight > 0 else 0
+        return float(self.normalize(weighted_score))
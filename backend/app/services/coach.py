@@ -405,6 +405,74 @@ class CoachStrategy:
             }
         }
     
+    def get_line_weights(self) -> Dict[str, float]:
+        """
+        Get the coach's base ice time weights per line, pair and special teams unit.
+
+        Returns:
+            Dictionary with weights keyed first_line..fourth_line,
+            first_pair..third_pair, pp1, pp2, pk1 and pk2
+        """
+        distribution = self.get_ice_time_distribution()
+        forwards = distribution['forward_even_strength']
+        defense = distribution['defense_even_strength']
+
+        return {
+            'first_line': forwards['line1'],
+            'second_line': forwards['line2'],
+            'third_line': forwards['line3'],
+            'fourth_line': forwards['line4'],
+            'first_pair': defense['pair1'],
+            'second_pair': defense['pair2'],
+            'third_pair': defense['pair3'],
+            'pp1': distribution['power_play']['unit1'],
+            'pp2': distribution['power_play']['unit2'],
+            'pk1': distribution['penalty_kill']['unit1'],
+            'pk2': distribution['penalty_kill']['unit2']
+        }
+
+    def get_situational_adjustment(self, situation: str) -> Dict[str, float]:
+        """
+        Get ice time multipliers per line and pair for a game situation.
+
+        A leading team leans on its checking lines and top pair, more so for
+        defensive coaches. A trailing team leans on its top lines, more so for
+        offensive coaches.
+
+        Args:
+            situation: Game situation ('leading', 'trailing' or 'tied')
+
+        Returns:
+            Dictionary with multipliers keyed line1..line4 and pair1..pair3
+            (1.0 means no change)
+        """
+        adjustment = {
+            'line1': 1.0, 'line2': 1.0, 'line3': 1.0, 'line4': 1.0,
+            'pair1': 1.0, 'pair2': 1.0, 'pair3': 1.0
+        }
+
+        if situation == 'leading':
+            defensive_bias = self.attributes.get('defensive_bias', 0.5)
+            adjustment.update({
+                'line1': 1.0 - 0.1 * defensive_bias,
+                'line3': 1.0 + 0.2 * defensive_bias,
+                'line4': 1.0 + 0.1 * defensive_bias,
+                'pair1': 1.0 + 0.2 * defensive_bias,
+                'pair3': 1.0 - 0.2 * defensive_bias
+            })
+        elif situation == 'trailing':
+            offensive_bias = self.attributes.get('offensive_bias', 0.5)
+            adjustment.update({
+                'line1': 1.0 + 0.3 * offensive_bias,
+                'line2': 1.0 + 0.15 * offensive_bias,
+                'line3': 1.0 - 0.1 * offensive_bias,
+                'line4': 1.0 - 0.3 * offensive_bias,
+                'pair1': 1.0 + 0.2 * offensive_bias,
+                'pair3': 1.0 - 0.2 * offensive_bias
+            })
+
+        return adjustment
+
     def get_matchup_preferences(self) -> Dict[str, Any]:
         """
         Get the coach's preferences for line matching.
@@ -418,6 +486,39 @@ class CoachStrategy:
             'home_advantage_factor': 0.8  # How much to leverage home ice advantage
         }
     
+    def optimize_matchups(self, our_lines: Dict[str, Any], opponent_lines: Dict[str, Any], is_home_team: bool,
+                          team_rating: Optional[Dict[str, Any]] = None,
+                          chemistry: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Recommend which of our lines and pairs should face each opposing unit.
+
+        Args:
+            our_lines: Our line combinations
+            opponent_lines: The opponent's line combinations, or a full
+                TeamFormation result (lines, team_rating, chemistry)
+            is_home_team: Whether we have the last change
+            team_rating: Our team rating (component ratings per line/pair)
+            chemistry: Our chemistry per line/pair
+
+        Returns:
+            Dictionary with forward_matchups, defense_matchups, last_change
+            and the total expected goal differential per 60 minutes
+        """
+        from .game.matchups import MatchupEngine, unit_strengths
+
+        # Defensive coaches weigh goals against more heavily than goals for
+        offensive_bias = self.attributes.get('offensive_bias', 0.5)
+        defensive_bias = self.attributes.get('defensive_bias', 0.5)
+        defensive_weight = 2 * defensive_bias / (offensive_bias + defensive_bias) if offensive_bias + defensive_bias else 1.0
+
+        engine = MatchupEngine(
+            unit_strengths(our_lines, team_rating, chemistry),
+            unit_strengths(opponent_lines),
+            is_home_team,
+            defensive_weight=defensive_weight
+        )
+        return engine.recommendations()
+
     def get_strategy_name(self) -> str:
         """
         Get a descriptive name for the coach's strategy.
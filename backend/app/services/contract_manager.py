@@ -174,6 +174,8 @@ class ContractManager:
         db.session.add(new_contract)
         db.session.commit()
         
+        ContractManager._refresh_trade_value(new_contract)
+        
         return new_contract.to_dict()
     
     @staticmethod
@@ -200,6 +202,8 @@ class ContractManager:
         # Commit changes
         db.session.commit()
         
+        ContractManager._refresh_trade_value(contract)
+        
         return contract.to_dict()
     
     @staticmethod
@@ -220,8 +224,52 @@ class ContractManager:
         db.session.delete(contract)
         db.session.commit()
         
+        ContractManager._refresh_trade_value(contract, terminated=True)
+        
         return True
     
+    @staticmethod
+    def contract_terms(contract: Contract) -> Dict[str, Any]:
+        """
+        Trade valuation terms of a contract.
+        
+        Args:
+            contract: The contract
+            
+        Returns:
+            Dictionary with 'term_years' and 'aav_millions'
+        """
+        return {'term_years': contract.years, 'aav_millions': (contract.salary or 0) / 1_000_000}
+    
+    @staticmethod
+    def get_contract_terms() -> Dict[int, Dict[str, Any]]:
+        """
+        Get the trade valuation terms of every player's current contract.
+        
+        Returns:
+            Dictionary of contract terms by player ID (the latest contract
+            of a player wins)
+        """
+        contracts = Contract.query.order_by(Contract.start_date).all()
+        return {contract.player_id: ContractManager.contract_terms(contract) for contract in contracts}
+    
+    @staticmethod
+    def _refresh_trade_value(contract: Contract, terminated: bool = False) -> None:
+        """
+        Update the player's entry in the trade value index after a contract change.
+        
+        Args:
+            contract: The created, updated or terminated contract
+            terminated: Whether the contract no longer applies
+        """
+        from .trade_value_index import refresh_trade_value
+        
+        if terminated:
+            changes = {'term_years': 0, 'aav_millions': 0}
+        else:
+            changes = ContractManager.contract_terms(contract)
+        refresh_trade_value(contract.player_id, changes)
+    
     @staticmethod
     def calculate_team_cap_hit(team_id: int) -> Dict[str, float]:
         """
@@ -11,7 +11,8 @@ import sqlalchemy as sa
 import os
 from sqlalchemy import inspect
 import logging
-from .draft_ranking import DraftRankingService
+from .draft_ranking import DraftRankingService, LOCAL_SOURCE, remove_prospects
+from .prospect_queue import get_prospect_queue, take_prospect, invalidate_prospect_queue
 
 # Create a blueprint for draft endpoints
 draft_bp = Blueprint('draft', __name__)
@@ -549,6 +550,12 @@ class DraftEngine:
             self.draft.status = "completed"
             
         db.session.commit()
+        take_prospect(self.draft.id, player.id)
+        remove_prospects([player.id], LOCAL_SOURCE)
+        
+        # The drafting team's roster changed
+        from ..formation_cache import invalidate_roster_change
+        invalidate_roster_change(player_id=player.id, team_abbreviation=team.abbreviation, team_id=team.id)
         
         # Return updated information
         return {
@@ -571,18 +578,28 @@ class DraftEngine:
         draft_pick = DraftPick.query.get(draft_pick_id)
         if not draft_pick:
             return {"error": "Invalid draft pick ID"}
-            
-        # Get best available player
-        best_player = Player.query.filter(
-            Player.age == 17,
-            Player.draft_year.is_(None)
-        ).order_by(Player.overall_rating.desc()).first()
         
-        if not best_player:
-            return {"error": "No draft-eligible players available"}
-            
-        # Make the pick
-        return self.make_pick(draft_pick_id, best_player.id)
+        # Best available player from the draft's shared prospect queue
+        queue = self.prospect_queue()
+        while True:
+            best_player = queue.peek()
+            if not best_player:
+                return {"error": "No draft-eligible players available"}
+                
+            # Make the pick (make_pick takes the player off the queue)
+            result = self.make_pick(draft_pick_id, best_player['id'])
+            if result.get("error") != "Player has already been drafted":
+                return result
+            # Drafted elsewhere since the queue was built
+            queue.take(best_player['id'])
+    
+    def prospect_queue(self):
+        """
+        Best-available prospect queue of the current draft.
+        
+        Built once per draft and shared by every DraftEngine in the process.
+        """
+        return get_prospect_queue(self.draft.id, self.draft_year)
     
     def simulate_next_pick(self) -> Dict[str, Any]:
         """
@@ -639,10 +656,15 @@ class DraftEngine:
             
         return results
     
-    def simulate_entire_draft(self) -> Dict[str, Any]:
+    def simulate_entire_draft(self, in_memory: bool = True) -> Dict[str, Any]:
         """
         Simulate all remaining picks in the draft.
         
+        Args:
+            in_memory: Run the draft in memory and write it back in one
+                transaction (see simulate_draft_in_memory); when False, every
+                pick goes through simulate_pick and is committed on its own
+        
         Returns:
             Dictionary with draft results
         """
@@ -651,6 +673,9 @@ class DraftEngine:
             
         if self.draft.status == "completed":
             return {"error": "Draft is already completed"}
+        
+        if in_memory:
+            return self.simulate_draft_in_memory()
             
         # Get all unpicked picks
         picks = DraftPick.query.filter_by(
@@ -671,6 +696,116 @@ class DraftEngine:
             "draft": self.draft.to_dict()
         }
 
+    
+    def simulate_draft_in_memory(self) -> Dict[str, Any]:
+        """
+        Simulate all remaining picks in memory and save them in one transaction.
+        
+        Loads the remaining picks and the teams once, makes every pick in
+        memory with the same rules as simulate_pick/make_pick (best available
+        from the draft's prospect queue), then writes the picks and the players' draft
+        fields back with one bulk update each and a single commit. A failure
+        rolls the whole draft back.
+        
+        Returns:
+            Dictionary with draft results
+        """
+        if not self.draft:
+            return {"error": "No active draft"}
+            
+        if self.draft.status == "completed":
+            return {"error": "Draft is already completed"}
+        
+        try:
+            picks = DraftPick.query.filter_by(
+                draft_id=self.draft.id,
+                player_id=None  # Not yet picked
+            ).order_by(DraftPick.round_num, DraftPick.pick_num).all()
+            
+            queue = self.prospect_queue()
+            
+            team_ids = {pick.team_id for pick in picks if pick.team_id is not None}
+            teams = {
+                row.id: row.abbreviation
+                for row in db.session.query(Team.id, Team.abbreviation).filter(Team.id.in_(team_ids))
+            } if team_ids else {}
+            
+            teams_count = db.session.query(sa.func.count(sa.distinct(DraftPick.team_id))).\
+                filter_by(draft_id=self.draft.id).scalar() or 32
+            
+            # Run the draft
+            pick_rows = []
+            player_rows = []
+            current_round = self.draft.current_round
+            current_pick = self.draft.current_pick
+            for pick in picks:
+                if pick.team_id not in teams:
+                    print(f"Skipping draft pick {pick.id}: invalid team {pick.team_id}")
+                    continue
+                prospect = queue.pop()
+                if not prospect:
+                    print(f"No draft-eligible players left after {len(pick_rows)} simulated picks")
+                    break
+                
+                player_id = prospect['id']
+                pick_rows.append({'id': pick.id, 'player_id': player_id})
+                player_rows.append({
+                    'id': player_id,
+                    'draft_year': self.draft_year,
+                    'draft_round': pick.round_num,
+                    'draft_pick': pick.pick_num,
+                    'draft_overall': pick.overall_pick,
+                    'draft_team_id': pick.team_id,
+                    'associated_team_id': pick.team_id  # Associate with drafting team
+                })
+                
+                # Same draft status bookkeeping as make_pick
+                current_pick += 1
+                if current_pick > teams_count:
+                    current_pick = 1
+                    current_round += 1
+            
+            # Write everything back in one transaction
+            if pick_rows:
+                db.session.bulk_update_mappings(DraftPick, pick_rows)
+                db.session.bulk_update_mappings(Player, player_rows)
+            self.draft.current_round = current_round
+            self.draft.current_pick = current_pick
+            self.draft.status = "completed"
+            db.session.commit()
+        except Exception as e:
+            print(f"Error in simulate_draft_in_memory: {str(e)}")
+            db.session.rollback()
+            # The queue already gave out the rolled back picks
+            invalidate_prospect_queue(self.draft.id)
+            raise e
+        
+        remove_prospects([row['player_id'] for row in pick_rows], LOCAL_SOURCE)
+        
+        # The drafting teams' rosters changed
+        from ..formation_cache import invalidate_roster_change
+        for pick_row in pick_rows:
+            invalidate_roster_change(player_id=pick_row['player_id'])
+        for team_id in {row['draft_team_id'] for row in player_rows}:
+            invalidate_roster_change(team_abbreviation=teams[team_id], team_id=team_id)
+        
+        return {
+            "status": "completed",
+            "message": f"Completed {len(pick_rows)} draft picks",
+            "draft": self.draft.to_dict(),
+            "picks": [
+                {
+                    'draft_pick_id': pick_row['id'],
+                    'player_id': pick_row['player_id'],
+                    'team_id': player_row['draft_team_id'],
+                    'round_num': player_row['draft_round'],
+                    'pick_num': player_row['draft_pick'],
+                    'overall_pick': player_row['draft_overall']
+                }
+                for pick_row, player_row in zip(pick_rows, player_rows)
+            ]
+        }
+
 
 # API endpoints that utilize the draft service
 
@@ -740,8 +875,9 @@ def get_draft_prospects():
                 # Calculate draft rankings
                 try:
                     # Calculate ranking value for each player
-                    for player in prospects:
-                        player['ranking_value'] = DraftRankingService.calculate_draft_ranking_value(player)
+                    values = DraftRankingService.calculate_draft_ranking_values(prospects).tolist()
+                    for player, value in zip(prospects, values):
+                        player['ranking_value'] = value
                     
                     # Sort by ranking value in descending order
                     prospects.sort(key=lambda p: p.get('ranking_value', 0), reverse=True)
@@ -785,8 +921,9 @@ def get_draft_prospects():
                     # Calculate draft rankings
                     try:
                         # Calculate ranking value for each player
-                        for player in prospects:
-                            player['ranking_value'] = DraftRankingService.calculate_draft_ranking_value(player)
+                        values = DraftRankingService.calculate_draft_ranking_values(prospects).tolist()
+                        for player, value in zip(prospects, values):
+                            player['ranking_value'] = value
                         
                         # Sort by ranking value in descending order
                         prospects.sort(key=lambda p: p.get('ranking_value', 0), reverse=True)
@@ -839,8 +976,9 @@ def get_draft_prospects():
                     # Calculate draft rankings
                     try:
                         # Calculate ranking value for each player
-                        for player in prospects:
-                            player['ranking_value'] = DraftRankingService.calculate_draft_ranking_value(player)
+                        values = DraftRankingService.calculate_draft_ranking_values(prospects).tolist()
+                        for player, value in zip(prospects, values):
+                            player['ranking_value'] = value
                         
                         # Sort by ranking value in descending order
                         prospects.sort(key=lambda p: p.get('ranking_value', 0), reverse=True)
@@ -1090,8 +1228,8 @@ def simulate_draft():
             # Initialize draft for the given year
             draft_engine.initialize_draft(year)
             
-            # Simulate the entire draft
-            results = draft_engine.simulate_entire_draft()
+            # Simulate the entire draft (in memory with a single commit unless asked otherwise)
+            results = draft_engine.simulate_entire_draft(in_memory=data.get('in_memory', True))
             
             if "error" in results:
                 # Return the error but with a 200 status
@@ -1119,6 +1257,34 @@ def simulate_draft():
         }), 200
 
 
+@draft_bp.route('/board', methods=['GET'])
+def get_draft_board():
+    """Get the best available prospects of a draft from its prospect queue"""
+    try:
+        # Get the current year or from query param
+        year = request.args.get('year', datetime.now().year, type=int)
+        position = request.args.get('position')
+        limit = request.args.get('limit', 100, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        
+        # Create a draft engine instance
+        draft_engine = DraftEngine()
+        draft_engine.initialize_draft(year)
+        
+        queue = draft_engine.prospect_queue()
+        prospects = queue.available(position=position, limit=limit, offset=offset)
+        
+        return jsonify({
+            "prospects": prospects,
+            "available": len(queue),
+            "best_available": queue.peek(position)
+        }), 200
+    except Exception as e:
+        print(f"Error in get_draft_board: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e), "prospects": []}), 500
+
 # Add a OPTIONS handler to support CORS preflight requests
 @draft_bp.route('/<path:path>', methods=['OPTIONS'])
 @draft_bp.route('/', methods=['OPTIONS'])
@@ -5,7 +5,11 @@ from flask import Blueprint, jsonify, request
 from ...extensions import db
 from datetime import datetime
 from ...services.player import Player
+from ..player_store import get_player_store
 from sqlalchemy import text
+from bisect import bisect_left
+import threading
+import numpy as np
 import pandas as pd
 from tabulate import tabulate
 import os
@@ -15,9 +19,44 @@ import os
 RANDOM_SEED = random.randint(1, 10000)
 random.seed(RANDOM_SEED)
 
+# splitmix64 constants of the per-player random factor
+_SPLITMIX_INCREMENT = np.uint64(0x9E3779B97F4A7C15)
+_SPLITMIX_MULTIPLIERS = (np.uint64(0xBF58476D1CE4E5B9), np.uint64(0x94D049BB133111EB))
+
+
+def player_random_uniforms(player_ids: np.ndarray) -> np.ndarray:
+    """
+    Deterministic uniform [0, 1) number per player id (and RANDOM_SEED).
+
+    A splitmix64 hash of id + RANDOM_SEED, so a whole class is computed in
+    one vectorized pass and a player always gets the same number.
+    """
+    with np.errstate(over='ignore'):
+        z = (np.asarray(player_ids, dtype=np.int64) + RANDOM_SEED).astype(np.uint64) + _SPLITMIX_INCREMENT
+        z = (z ^ (z >> np.uint64(30))) * _SPLITMIX_MULTIPLIERS[0]
+        z = (z ^ (z >> np.uint64(27))) * _SPLITMIX_MULTIPLIERS[1]
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) * (1.0 / (1 << 53))
+
+
 # Create a blueprint for draft ranking endpoints
 draft_ranking_bp = Blueprint('draft_ranking', __name__)
 
+# Player fields that feed calculate_draft_ranking_value or draft eligibility
+# (a change to any other field leaves cached draft boards valid)
+RANKING_FIELDS = {
+    'overall', 'overall_rating', 'potential', 'potential_volatility', 'potential_precision', 'height',
+    'league', 'team', 'team_id', 'position', 'position_primary', 'nationality', 'age', 'birthdate'
+}
+# Ranking fields that decide which draft class a player is in
+ELIGIBILITY_FIELDS = {'age', 'birthdate'}
+# Databases a draft class can be read from. Supabase and SQLAlchemy players
+# are separate id spaces, so boards, queues and update hooks name their source.
+SUPABASE_SOURCE = 'supabase'
+LOCAL_SOURCE = 'sqlalchemy'
+# Player fields that record a draft selection
+DRAFT_STATUS_FIELDS = {'draft_year', 'draft_id', 'draft_team_id', 'draft_overall', 'draft_round', 'draft_pick'}
+
 class DraftRankingService:
     """Service for calculating and managing draft prospect rankings"""
     
@@ -383,15 +422,19 @@ class DraftRankingService:
     def generate_random_factor(cls, player_id: int) -> float:
         """
         Generate consistent random factor for a player
-        Uses player_id as seed for consistency between app runs
+        Hashes player_id with RANDOM_SEED (player_random_uniforms) for consistency
         Random factor is reduced by half to minimize its impact
         """
-        # Create a player-specific random generator
-        player_random = random.Random(player_id + RANDOM_SEED)
-        
+        return float(cls.generate_random_factors([player_id])[0])
+    
+    @classmethod
+    def generate_random_factors(cls, player_ids: List[int]) -> np.ndarray:
+        """
+        Random factors of many players at once (see generate_random_factor)
+        """
         # Generate random factor between 0.9 and 1.1 (±10%)
         # Then reduce its impact by scaling it closer to 1.0
-        raw_factor = 0.9 + (player_random.random() * 0.2)
+        raw_factor = 0.9 + (player_random_uniforms(player_ids) * 0.2)
         reduced_factor = 1.0 + ((raw_factor - 1.0) / 2)  # Makes random impact half as strong
         
         return reduced_factor
@@ -561,7 +604,7 @@ class DraftRankingService:
                               random
         """
         # Extract player attributes, handling potential missing values
-        overall = float(player.get('overall_rating', player.get('overall', 50)))
+        overall = float(get_player_store().overall_of(player, 50))
         
         # Convert potential to numeric value
         potential_str = player.get('potential', '')
@@ -586,7 +629,7 @@ class DraftRankingService:
         league_value = cls.get_league_strength_value(league)
         
         # Get position bias
-        position = player.get('position_primary', player.get('position', ''))
+        position = get_player_store().position_of(player)
         position_value = cls.get_position_value(position)
         
         # Get country risk factor
@@ -656,6 +699,163 @@ class DraftRankingService:
         
         return ranking_value
     
+    @classmethod
+    def _encode(cls, values: List[Any], convert) -> np.ndarray:
+        """Convert a column of raw values, calling `convert` once per distinct value"""
+        converted = {}
+        result = []
+        for value in values:
+            try:
+                number = converted[value]
+            except KeyError:
+                number = converted[value] = convert(value)
+            except TypeError:
+                # Unhashable value
+                number = convert(value)
+            result.append(number)
+        return np.array(result, dtype=np.float64)
+    
+    @classmethod
+    def calculate_draft_ranking_components(cls, players: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Calculate every component of the draft ranking value of a whole class.
+        
+        The class is encoded into arrays once: each distinct potential,
+        volatility, precision, height, league, position and country is
+        converted a single time (so each distinct league is looked up once)
+        and the random factors come from one vectorized hash of the ids.
+        Components use the same operations, in the same order, as
+        calculate_draft_ranking_value, so the values are identical.
+        
+        Args:
+            players: List of player dictionaries
+            
+        Returns:
+            Dictionary of arrays aligned with players (the keys of
+            calculate_draft_ranking_value's calculation details)
+        """
+        store = get_player_store()
+        
+        details = {
+            'overall': np.array([float(store.overall_of(p, 50)) for p in players], dtype=np.float64),
+            'potential_value': cls._encode([p.get('potential', '') for p in players], cls.get_potential_numeric_value),
+            'volatility_value': cls._encode([p.get('potential_volatility', 'medium') for p in players],
+                                            cls.get_volatility_numeric_value),
+            'precision_value': cls._encode([p.get('potential_precision', 'medium') for p in players],
+                                           cls.get_precision_numeric_value),
+            'height_value': cls._encode([p.get('height', '') for p in players], cls.get_height_value),
+            'league_value': cls._encode([p.get('league', '') for p in players], cls.get_league_strength_value),
+            'position_value': cls._encode([store.position_of(p) for p in players], cls.get_position_value),
+            'country_value': cls._encode([p.get('nationality', '') for p in players], cls.get_country_value),
+            'random_factor': cls.generate_random_factors([p.get('id', 0) for p in players])
+        }
+        details['volatility_factor'] = details['volatility_value'] / 100
+        details['precision_factor'] = details['precision_value'] / 100
+        
+        details['overall_component'] = details['overall'] * details['volatility_factor'] * cls.WEIGHTS['overall']
+        details['potential_component'] = (details['potential_value'] * details['precision_factor'] *
+                                          details['volatility_factor'] * cls.WEIGHTS['potential'])
+        details['height_component'] = details['height_value'] * cls.WEIGHTS['height']
+        details['league_component'] = details['league_value'] * cls.WEIGHTS['league']
+        details['position_component'] = details['position_value'] * cls.WEIGHTS['position']
+        details['country_component'] = details['country_value'] * cls.WEIGHTS['country']
+        
+        details['pre_random_total'] = (
+            details['overall_component'] +
+            details['potential_component'] +
+            details['height_component'] +
+            details['league_component'] +
+            details['position_component'] +
+            details['country_component']
+        )
+        details['final_value'] = details['pre_random_total'] * details['random_factor']
+        return details
+    
+    @classmethod
+    def calculate_draft_ranking_values(cls, players: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Calculate the draft ranking value of a whole class at once.
+        
+        Same values as calling calculate_draft_ranking_value for each player.
+        When logging is enabled, the calculation of the whole class is
+        written to the audit CSV in one pass.
+        
+        Args:
+            players: List of player dictionaries
+            
+        Returns:
+            Array of ranking values aligned with players
+        """
+        if not players:
+            return np.zeros(0, dtype=np.float64)
+        
+        details = cls.calculate_draft_ranking_components(players)
+        if cls.LOG_ENABLED:
+            cls.write_ranking_audit(players, details)
+        return details['final_value']
+    
+    @classmethod
+    def write_ranking_audit(cls, players: List[Dict[str, Any]], details: Dict[str, np.ndarray]) -> Optional[str]:
+        """
+        Append the ranking calculation of a class to the daily audit CSV
+        (same columns as log_ranking_calculation) in one write.
+        
+        Only players with a first name, last name and id are logged, as in
+        calculate_draft_ranking_value.
+        
+        Returns:
+            Path of the CSV file, or None if nothing was written
+        """
+        rows = [i for i, p in enumerate(players) if p.get('first_name') and p.get('last_name') and p.get('id')]
+        if not rows:
+            return None
+        
+        try:
+            log_dir = os.path.join(os.getcwd(), 'logs')
+            os.makedirs(log_dir, exist_ok=True)
+            
+            today = datetime.now().strftime('%Y%m%d')
+            log_file = os.path.join(log_dir, f'draft_rankings_{today}.csv')
+            file_exists = os.path.isfile(log_file)
+            
+            logged = [players[i] for i in rows]
+            columns = {name: values[rows] for name, values in details.items()}
+            df = pd.DataFrame({
+                'Player ID': [p.get('id') for p in logged],
+                'Player Name': [f"{p.get('first_name', '')} {p.get('last_name', '')}" for p in logged],
+                'Overall Rating': columns['overall'],
+                'Potential Value': columns['potential_value'],
+                'Potential String': [p.get('potential', 'N/A') for p in logged],
+                'Height': [p.get('height', '') for p in logged],
+                'Height Value': columns['height_value'],
+                'League': [p.get('league', '') for p in logged],
+                'League Value': columns['league_value'],
+                'Position': [get_player_store().position_of(p) for p in logged],
+                'Position Value': columns['position_value'],
+                'Country': [p.get('nationality', '') for p in logged],
+                'Country Value': columns['country_value'],
+                'Volatility': [p.get('potential_volatility', 'N/A') for p in logged],
+                'Volatility Factor': columns['volatility_factor'],
+                'Precision': [p.get('potential_precision', 'medium') for p in logged],
+                'Precision Factor': columns['precision_factor'],
+                'Overall Component': columns['overall_component'],
+                'Potential Component': columns['potential_component'],
+                'Height Component': columns['height_component'],
+                'League Component': columns['league_component'],
+                'Position Component': columns['position_component'],
+                'Country Component': columns['country_component'],
+                'Pre-Random Total': columns['pre_random_total'],
+                'Random Factor': columns['random_factor'],
+                'Final Value': columns['final_value']
+            })
+            df.to_csv(log_file, mode='a', header=not file_exists, index=False)
+            
+            print(f"Draft ranking calculations of {len(rows)} players saved to: {log_file}")
+            return log_file
+        except Exception as e:
+            print(f"Error saving calculations to CSV: {str(e)}")
+            return None
+    
     @classmethod
     def get_draft_rankings(cls, year: int = None) -> List[Dict[str, Any]]:
         """
@@ -667,107 +867,287 @@ class DraftRankingService:
         Returns:
             List of player dictionaries with ranking information
         """
+        return get_draft_board(year).page()
+    
+    @classmethod
+    def fetch_draft_class(cls, year: int = None, source: Optional[str] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Fetch every undrafted draft-eligible player of a year
+        
+        Args:
+            year: Draft year (defaults to current year)
+            source: SUPABASE_SOURCE or LOCAL_SOURCE; None tries Supabase and
+                falls back to SQLAlchemy
+            
+        Returns:
+            Tuple of (player dictionaries, source they were read from)
+        """
         if not year:
             year = datetime.now().year
             
         # Calculate the eligible age based on draft year
         current_year = datetime.now().year
         eligible_age = 17 - (year - current_year)
-            
-        try:
+        
+        if source != LOCAL_SOURCE:
             # First try to get draft-eligible players from Supabase
             try:
                 from ...supabase_client import get_draft_eligible_players
                 eligible_players = get_draft_eligible_players(year=year)
                 
                 if eligible_players and len(eligible_players) > 0:
-                    # Calculate ranking value for each player
-                    for player in eligible_players:
-                        player['ranking_value'] = cls.calculate_draft_ranking_value(player)
-                    
-                    # Sort by ranking value in descending order
-                    eligible_players.sort(key=lambda p: p.get('ranking_value', 0), reverse=True)
-                    
-                    # Add ranking position
-                    for i, player in enumerate(eligible_players):
-                        player['draft_ranking'] = i + 1
-                    
-                    return eligible_players
+                    return eligible_players, SUPABASE_SOURCE
             except Exception as e:
                 print(f"Error fetching players from Supabase: {str(e)}")
             
-            # Fallback to using SQLAlchemy
-            # Get all draft-eligible players based on the eligible age without a draft year
-            players = Player.query.filter(
-                Player.age == eligible_age,
-                Player.draft_year.is_(None)
-            ).all()
-            
-            player_data = []
-            for player in players:
-                # Convert to dictionary
-                player_dict = player.to_dict()
-                
-                # Calculate ranking value
-                player_dict['ranking_value'] = cls.calculate_draft_ranking_value(player_dict)
-                player_data.append(player_dict)
-            
-            # Sort by ranking value in descending order
-            player_data.sort(key=lambda p: p.get('ranking_value', 0), reverse=True)
+            if source == SUPABASE_SOURCE:
+                return [], SUPABASE_SOURCE
+        
+        # Fallback to using SQLAlchemy
+        # Get all draft-eligible players based on the eligible age without a draft year
+        players = Player.query.filter(
+            Player.age == eligible_age,
+            Player.draft_year.is_(None)
+        ).all()
+        
+        return [player.to_dict() for player in players], LOCAL_SOURCE
+    
+    @classmethod
+    def rank_players(cls, players: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Score players and sort them into a draft class
+        
+        Args:
+            players: Player dictionaries (updated in place)
             
-            # Add ranking position
-            for i, player in enumerate(player_data):
-                player['draft_ranking'] = i + 1
+        Returns:
+            The players with 'ranking_value' and 'draft_ranking', best first
+        """
+        # Calculate ranking value for each player
+        values = cls.calculate_draft_ranking_values(players).tolist()
+        for player, value in zip(players, values):
+            player['ranking_value'] = value
+        
+        # Sort by ranking value in descending order
+        players.sort(key=lambda p: p.get('ranking_value', 0), reverse=True)
+        
+        # Add ranking position
+        for i, player in enumerate(players):
+            player['draft_ranking'] = i + 1
+        
+        return players
+    
+    @classmethod
+    def score_draft_class(cls, year: int = None, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch and score every draft-eligible player of a year
+        
+        Args:
+            year: Draft year to score (defaults to current year)
+            source: Database to read the class from (see fetch_draft_class)
             
-            return player_data
+        Returns:
+            List of player dictionaries with ranking information, best first
+        """
+        try:
+            players, _ = cls.fetch_draft_class(year, source)
+            return cls.rank_players(players)
         except Exception as e:
             print(f"Error getting draft rankings: {str(e)}")
             return []
     
     @classmethod
-    def get_player_ranking(cls, player_id: int) -> Dict[str, Any]:
+    def get_player_ranking(cls, player_id: int, year: int = None) -> Dict[str, Any]:
         """
         Get ranking information for a specific player
         
         Args:
             player_id: ID of the player to get ranking for
+            year: Draft year (defaults to current year)
             
         Returns:
             Dictionary with ranking information
         """
         try:
-            # Try to get player from database
-            player = Player.query.get(player_id)
-            if not player:
-                return {"error": "Player not found"}
-            
-            # Convert to dictionary
-            player_dict = player.to_dict()
-            
-            # Calculate ranking value
-            ranking_value = cls.calculate_draft_ranking_value(player_dict)
+            board = get_draft_board(year)
+            ranking_value = board.value_of(player_id)
             
-            # Get all players and their rankings
-            all_rankings = cls.get_draft_rankings()
-            
-            # Find player's rank
-            player_rank = None
-            for i, p in enumerate(all_rankings):
-                if p.get('id') == player_id:
-                    player_rank = i + 1
-                    break
+            if ranking_value is None:
+                # Not in the draft class: rank the player on their own
+                player = Player.query.get(player_id)
+                if not player:
+                    return {"error": "Player not found"}
+                ranking_value = cls.calculate_draft_ranking_value(player.to_dict())
             
             return {
                 "player_id": player_id,
                 "ranking_value": ranking_value,
-                "draft_ranking": player_rank,
-                "total_prospects": len(all_rankings)
+                "draft_ranking": board.rank_of(player_id),
+                "total_prospects": len(board)
             }
         except Exception as e:
             print(f"Error getting player ranking: {str(e)}")
             return {"error": str(e)}
 
 
+class DraftBoard:
+    """
+    Scored and sorted draft class of one year.
+    
+    Players are kept in a sorted list of (-ranking value, id) keys plus an
+    id -> key index, so a player's rank is a binary search and a page of
+    the board is a slice; neither re-scores anything. Drafted players are
+    removed in place. Any other change to a prospect invalidates the board,
+    which is re-scored on next use.
+    """
+    
+    def __init__(self, year: int, players: List[Dict[str, Any]], source: Optional[str] = None):
+        self.year = year
+        # Database the player ids belong to (SUPABASE_SOURCE or LOCAL_SOURCE)
+        self.source = source
+        self._players = {}
+        self._keys_by_id = {}
+        for player in players:
+            if player.get('id') is not None:
+                self._players[player['id']] = player
+                self._keys_by_id[player['id']] = (-player.get('ranking_value', 0), player['id'])
+        self._keys = sorted(self._keys_by_id.values())
+        self.version = 0
+    
+    def __len__(self) -> int:
+        return len(self._keys)
+    
+    def __contains__(self, player_id: Any) -> bool:
+        return player_id in self._keys_by_id
+    
+    def rank_of(self, player_id: Any) -> Optional[int]:
+        """1-based rank of a player on the board, or None if not on it."""
+        key = self._keys_by_id.get(player_id)
+        return bisect_left(self._keys, key) + 1 if key is not None else None
+    
+    def value_of(self, player_id: Any) -> Optional[float]:
+        """Ranking value of a player on the board, or None."""
+        key = self._keys_by_id.get(player_id)
+        return -key[0] if key is not None else None
+    
+    def page(self, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        A slice of the board, best first.
+        
+        Returns:
+            Player dictionaries with their current 'draft_ranking'
+        """
+        offset = max(0, offset)
+        end = len(self._keys) if limit is None else offset + max(0, limit)
+        page = []
+        for rank, (_, player_id) in enumerate(self._keys[offset:end], offset + 1):
+            page.append(dict(self._players[player_id], draft_ranking=rank))
+        return page
+    
+    def remove(self, player_id: Any) -> bool:
+        """Take a drafted player off the board. Returns True if it was on it."""
+        key = self._keys_by_id.pop(player_id, None)
+        if key is None:
+            return False
+        del self._keys[bisect_left(self._keys, key)]
+        del self._players[player_id]
+        self.version += 1
+        return True
+
+
+# Process-wide draft boards, one per (year, requested source)
+_draft_boards = {}
+_draft_boards_lock = threading.RLock()
+
+
+def get_draft_board(year: int = None, source: Optional[str] = None) -> DraftBoard:
+    """
+    Return the cached draft board of a year, scoring the class on first use.
+    
+    Args:
+        year: Draft year (defaults to the current year)
+        source: Database to read the class from (see fetch_draft_class);
+            callers that write picks back must ask for that database
+    """
+    year = year or datetime.now().year
+    with _draft_boards_lock:
+        board = _draft_boards.get((year, source))
+        if board is None:
+            try:
+                players, actual_source = DraftRankingService.fetch_draft_class(year, source)
+                board = DraftBoard(year, DraftRankingService.rank_players(players), actual_source)
+            except Exception as e:
+                print(f"Error getting draft rankings: {str(e)}")
+                board = DraftBoard(year, [], source)
+            # An empty class may be a failed fetch: score again next time
+            if len(board):
+                _draft_boards[(year, source)] = board
+        return board
+
+
+def _boards_of(source: Optional[str]) -> List[Tuple[Any, DraftBoard]]:
+    """Cached boards whose players come from a source (every board when None)."""
+    return [(key, board) for key, board in _draft_boards.items() if source is None or board.source == source]
+
+
+def invalidate_draft_boards(year: int = None) -> None:
+    """Drop the cached boards of a year (every board when year is None)."""
+    with _draft_boards_lock:
+        for key in [key for key in _draft_boards if year is None or key[0] == year]:
+            del _draft_boards[key]
+
+
+def remove_prospects(player_ids: List[Any], source: Optional[str] = None) -> None:
+    """
+    Take drafted (or deleted) players off the cached boards and prospect queues.
+    
+    Args:
+        player_ids: Player IDs
+        source: Database the ids belong to (every board and queue when None)
+    """
+    from .prospect_queue import take_prospects
+    
+    with _draft_boards_lock:
+        for _, board in _boards_of(source):
+            for player_id in player_ids:
+                board.remove(player_id)
+    # Prospect queues hold SQLAlchemy players
+    if source in (None, LOCAL_SOURCE):
+        take_prospects(player_ids)
+
+
+def prospect_changed(player_id: Any, changes: Optional[Dict[str, Any]] = None,
+                     source: Optional[str] = None) -> None:
+    """
+    Keep cached draft boards and prospect queues in sync after a player update.
+    
+    Args:
+        player_id: Player ID
+        changes: Changed player fields (None when unknown)
+        source: Database the player was updated in (None when unknown)
+    """
+    from .prospect_queue import invalidate_prospect_queue, invalidate_prospect_queues_with
+    
+    try:
+        fields = set(changes) if changes is not None else RANKING_FIELDS | DRAFT_STATUS_FIELDS
+        if fields & DRAFT_STATUS_FIELDS and changes is not None and changes.get('draft_year') is not None:
+            remove_prospects([player_id], source)
+        elif fields & (DRAFT_STATUS_FIELDS | ELIGIBILITY_FIELDS):
+            # Undrafted (or unknown) draft status, or a new age: the player may
+            # have joined or left any class
+            invalidate_draft_boards()
+            if source in (None, LOCAL_SOURCE):
+                invalidate_prospect_queue()
+        elif fields & RANKING_FIELDS:
+            with _draft_boards_lock:
+                for key in [key for key, board in _boards_of(source) if player_id in board]:
+                    del _draft_boards[key]
+            if source in (None, LOCAL_SOURCE):
+                invalidate_prospect_queues_with(player_id)
+    except Exception as e:
+        print(f"Error updating draft boards: {e}")
+
+
 # API Routes for draft rankings
 
 @draft_ranking_bp.route('/', methods=['GET'])
@@ -776,9 +1156,11 @@ def get_draft_rankings():
     try:
         # Get year from query params, default to current year
         year = request.args.get('year', datetime.now().year, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        limit = request.args.get('limit', type=int)
         
-        # Get draft rankings
-        rankings = DraftRankingService.get_draft_rankings(year)
+        # Get draft rankings (a page of the cached board)
+        rankings = get_draft_board(year).page(offset, limit)
         
         # Return rankings
         return jsonify(rankings), 200
@@ -791,7 +1173,8 @@ def get_player_ranking(player_id):
     """Get ranking for a specific player"""
     try:
         # Get player ranking
-        ranking = DraftRankingService.get_player_ranking(player_id)
+        year = request.args.get('year', datetime.now().year, type=int)
+        ranking = DraftRankingService.get_player_ranking(player_id, year)
         
         # Return ranking
         return jsonify(ranking), 200
@@ -0,0 +1,230 @@
+from typing import Dict, List, Any, Iterable, Optional
+from datetime import datetime
+import heapq
+import threading
+from ..player_store import get_player_store
+from ..trade_value_index import position_group
+from .draft_ranking import LOCAL_SOURCE, get_draft_board
+
+# Rebuild the heaps once more than this share of their entries are taken
+COMPACT_RATIO = 0.5
+
+
+class ProspectQueue:
+    """
+    Best available draft prospects, ranked by DraftRankingService.
+
+    Prospects and their ranking values come from the year's SQLAlchemy
+    DraftBoard when the queue is built, so the queue ranks exactly like
+    that board and holds the same player ids the draft engine writes. A max-heap of
+    (ranking value, id) covers the whole class and one more heap covers
+    each position group (C, W, D, G), so the best available prospect
+    overall or at a position is an O(log n) pop. Drafted players are
+    deleted lazily: they are only marked as taken, and skipped when they
+    reach the top of a heap. Heaps are compacted once most of their
+    entries are taken.
+    """
+
+    def __init__(self, prospects: Iterable[Dict[str, Any]]):
+        """
+        Args:
+            prospects: Prospect dictionaries with 'id' and 'ranking_value'
+        """
+        self._lock = threading.RLock()
+        self._prospects = {}
+        for prospect in prospects:
+            if prospect.get('id') is not None:
+                self._prospects[prospect['id']] = prospect
+
+        # Board order, best first; a sorted list of (-value, id) is already a heap
+        board = sorted((-p.get('ranking_value', 0), player_id) for player_id, p in self._prospects.items())
+        for rank, (_, player_id) in enumerate(board, 1):
+            self._prospects[player_id]['draft_ranking'] = rank
+        self._board = [player_id for _, player_id in board]
+
+        self._groups = {}
+        self._heaps = {None: board}
+        for entry in board:
+            group = self._groups[entry[1]] = position_group(get_player_store().position_of(self._prospects[entry[1]]))
+            self._heaps.setdefault(group, []).append(entry)
+
+        self._taken = set()
+        # Players taken since the heaps were last compacted
+        self._stale = 0
+        self.version = 0
+
+    def _top(self, position: Optional[str]) -> Optional[Any]:
+        """Id of the best available prospect of a heap, dropping taken entries on the way."""
+        heap = self._heaps.get(position_group(position) if position else None)
+        if not heap:
+            return None
+        while heap and heap[0][1] in self._taken:
+            heapq.heappop(heap)
+        return heap[0][1] if heap else None
+
+    def _compact(self) -> None:
+        if self._stale <= COMPACT_RATIO * len(self._heaps[None]):
+            return
+        for key, heap in self._heaps.items():
+            heap = [entry for entry in heap if entry[1] not in self._taken]
+            heapq.heapify(heap)
+            self._heaps[key] = heap
+        self._stale = 0
+
+    def peek(self, position: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Best available prospect, without taking it.
+
+        Args:
+            position: Only prospects of this position group (any position
+                name, e.g. 'C', 'LW', 'D', 'Goalie')
+
+        Returns:
+            Prospect dictionary, or None if none is left
+        """
+        with self._lock:
+            player_id = self._top(position)
+            return self._prospects[player_id] if player_id is not None else None
+
+    def pop(self, position: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Take and return the best available prospect (see peek)."""
+        with self._lock:
+            player_id = self._top(position)
+            if player_id is None:
+                return None
+            self.take(player_id)
+            return self._prospects[player_id]
+
+    def take(self, player_id: Any) -> bool:
+        """
+        Mark a prospect as drafted.
+
+        Returns:
+            True if the prospect was available
+        """
+        with self._lock:
+            if player_id not in self._prospects or player_id in self._taken:
+                return False
+            self._taken.add(player_id)
+            self._stale += 1
+            self.version += 1
+            self._compact()
+            return True
+
+    def __contains__(self, player_id: Any) -> bool:
+        return player_id in self._prospects
+
+    def is_available(self, player_id: Any) -> bool:
+        """Whether a player is in the queue and not drafted yet."""
+        return player_id in self._prospects and player_id not in self._taken
+
+    def available(self, position: Optional[str] = None, limit: Optional[int] = None,
+                  offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Board view of the available prospects, best first.
+
+        Args:
+            position: Only prospects of this position group
+            limit: Maximum number of prospects returned
+            offset: Number of available prospects to skip
+
+        Returns:
+            Prospect dictionaries (with their 'draft_ranking' in the class)
+        """
+        group = position_group(position) if position else None
+        result = []
+        with self._lock:
+            for player_id in self._board:
+                if player_id in self._taken:
+                    continue
+                if group and self._groups[player_id] != group:
+                    continue
+                if offset:
+                    offset -= 1
+                    continue
+                if limit is not None and len(result) >= limit:
+                    break
+                result.append(self._prospects[player_id])
+        return result
+
+    def __len__(self) -> int:
+        return len(self._prospects) - len(self._taken)
+
+    def stats(self) -> Dict[str, int]:
+        """Return queue size information."""
+        with self._lock:
+            return {
+                'prospects': len(self._prospects),
+                'available': len(self),
+                'heap_entries': sum(len(heap) for heap in self._heaps.values()),
+                'version': self.version
+            }
+
+
+def load_prospect_queue(year: Optional[int] = None) -> ProspectQueue:
+    """
+    Build a ProspectQueue from the cached SQLAlchemy draft board of a year.
+
+    The draft engine records picks in the SQLAlchemy players and draft_picks
+    tables, so the queue never takes prospects from Supabase, whose ids are
+    a different id space.
+
+    Args:
+        year: Draft year (defaults to the current year)
+    """
+    prospects = get_draft_board(year, LOCAL_SOURCE).page()
+
+    print(f"Built prospect queue with {len(prospects)} prospects for {year or datetime.now().year}")
+    return ProspectQueue(prospects)
+
+
+# Process-wide queues, one per draft
+_queues = {}
+_queues_lock = threading.Lock()
+
+
+def get_prospect_queue(draft_id: Any, year: Optional[int] = None) -> ProspectQueue:
+    """
+    Return the shared ProspectQueue of a draft, building it on first use.
+
+    Args:
+        draft_id: Draft ID
+        year: Draft year, used when the queue has to be built
+    """
+    with _queues_lock:
+        queue = _queues.get(draft_id)
+        if queue is None:
+            queue = _queues[draft_id] = load_prospect_queue(year)
+        return queue
+
+
+def take_prospect(draft_id: Any, player_id: Any) -> None:
+    """Mark a player as drafted in a draft's queue (no-op if the queue is not built)."""
+    queue = _queues.get(draft_id)
+    if queue is not None:
+        queue.take(player_id)
+
+
+def take_prospects(player_ids: Iterable[Any]) -> None:
+    """Mark players as drafted in every built queue."""
+    with _queues_lock:
+        queues = list(_queues.values())
+    for queue in queues:
+        for player_id in player_ids:
+            queue.take(player_id)
+
+
+def invalidate_prospect_queue(draft_id: Any = None) -> None:
+    """Drop a draft's queue (all queues when draft_id is None); it is rebuilt on next use."""
+    with _queues_lock:
+        if draft_id is None:
+            _queues.clear()
+        else:
+            _queues.pop(draft_id, None)
+
+
+def invalidate_prospect_queues_with(player_id: Any) -> None:
+    """Drop every queue the player is in; they are rebuilt on next use."""
+    with _queues_lock:
+        for draft_id in [draft_id for draft_id, queue in _queues.items() if player_id in queue]:
+            del _queues[draft_id]
@@ -9,6 +9,7 @@ import time
 import random
 import argparse
 import requests
+import numpy as np
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dotenv import load_dotenv
@@ -29,6 +30,41 @@ TEAM_NEEDS = {
     "G": 0.8     # Goalies slightly less valuable
 }
 
+# Positions tracked in team needs; prospects with any other position use the last slot
+POSITIONS = ['C', 'LW', 'RW', 'D', 'G']
+POSITION_INDEX = {pos: i for i, pos in enumerate(POSITIONS)}
+OTHER_POSITION = len(POSITIONS)
+# Need assumed for positions that are not tracked
+DEFAULT_POSITION_NEED = 0.5
+
+# Numeric value of a prospect's potential for the HIGH_POTENTIAL strategy
+POTENTIAL_SCORES = {
+    "High Elite": 100,
+    "Elite": 90,
+    "Medium Elite": 85,
+    "Low Elite": 80,
+    "High Top 6/4": 75,
+    "Top 6/4": 70,
+    "Medium Top 6/4": 65,
+    "Low Top 6/4": 60,
+    "High Top 9/6": 55,
+    "Top 9/6": 50,
+    "Medium Top 9/6": 45,
+    "Low Top 9/6": 40,
+    "High Bottom 6/Fringe": 35,
+    "Bottom 6/Fringe": 30,
+    "Medium Bottom 6/Fringe": 25,
+    "Low Bottom 6/Fringe": 20,
+    "Average": 10
+}
+DEFAULT_POTENTIAL_SCORE = 10
+
+OFFENSIVE_ATTRIBUTES = ['shooting_skill', 'shooting_accuracy', 'stickhandling', 'offensive_awareness']
+DEFENSIVE_ATTRIBUTES = ['defense', 'shotblocking', 'defensive_awareness', 'strength']
+
+# Random adjustment of every score, to make the draft less predictable
+SCORE_NOISE = 5
+
 # Team draft strategies
 STRATEGIES = [
     "BEST_AVAILABLE",  # Pick the best overall player regardless of position
@@ -39,6 +75,62 @@ STRATEGIES = [
     "NHL_READY"        # Prioritize players who can play immediately
 ]
 
+# Strategy weights as coefficient vectors. A prospect's score is
+#   overall x position[pos] x (1 + need x team_need[pos]) x age_factor
+#     x features[0] + offensive x features[1] + defensive x features[2]
+#     + potential x features[3]
+# where age_factor is the NHL-ready boost when 'age' is set (1 otherwise).
+_NEUTRAL_POSITIONS = [1.0] * (len(POSITIONS) + 1)
+STRATEGY_WEIGHTS = {
+    "BEST_AVAILABLE": {'features': [1.0, 0.0, 0.0, 0.0], 'position': _NEUTRAL_POSITIONS, 'need': 0.0, 'age': False},
+    "POSITION_NEED": {'features': [1.0, 0.0, 0.0, 0.0], 'position': _NEUTRAL_POSITIONS, 'need': 0.5, 'age': False},
+    "OFFENSIVE": {'features': [0.7, 0.3, 0.0, 0.0], 'position': [1.2, 1.2, 1.2, 1.0, 1.0, 1.0], 'need': 0.0, 'age': False},
+    "DEFENSIVE": {'features': [0.7, 0.0, 0.3, 0.0], 'position': [1.0, 1.0, 1.0, 1.2, 1.2, 1.0], 'need': 0.0, 'age': False},
+    "HIGH_POTENTIAL": {'features': [0.3, 0.0, 0.0, 0.7], 'position': _NEUTRAL_POSITIONS, 'need': 0.0, 'age': False},
+    "NHL_READY": {'features': [1.0, 0.0, 0.0, 0.0], 'position': _NEUTRAL_POSITIONS, 'need': 0.0, 'age': True},
+}
+STRATEGY_WEIGHTS = {
+    strategy: {
+        'features': np.array(weights['features']),
+        'position': np.array(weights['position']),
+        'need': weights['need'],
+        'age': weights['age']
+    }
+    for strategy, weights in STRATEGY_WEIGHTS.items()
+}
+
+
+def needs_from_counts(counts: np.ndarray) -> np.ndarray:
+    """
+    Position needs (0-1, 1 = highest need) from a team's player counts per position.
+
+    Args:
+        counts: Player counts in POSITIONS order
+
+    Returns:
+        Needs in POSITIONS order, plus DEFAULT_POSITION_NEED for other positions
+    """
+    total = counts.sum()
+    if total == 0:
+        # New team with no players, needs everything
+        needs = np.ones(len(POSITIONS))
+    else:
+        # Positions with fewer players have higher need
+        needs = 1 - counts / max(counts.max(), 1)
+    return np.append(needs, DEFAULT_POSITION_NEED)
+
+
+def nhl_ready_factor(age: int) -> float:
+    """Score multiplier of the NHL_READY strategy for a prospect's age."""
+    if age >= 20:
+        return 1.3
+    elif age >= 19:
+        return 1.2
+    elif age >= 18:
+        return 1.1
+    return 1.0
+
+
 class DraftSimulator:
     def __init__(self, year: int = None, rounds: int = 7, interactive: bool = False):
         self.year = year or datetime.now().year
@@ -50,6 +142,16 @@ class DraftSimulator:
         self.current_pick = 1
         self.overall_pick = 1
         self.draft_order = []
+        # Player counts per position (POSITIONS order) and resulting needs, per team
+        self.position_counts = {}
+        self.team_needs = {}
+        # Prospect pool, encoded once at draft start (see load_prospect_pool)
+        self.prospects = []
+        self.prospect_features = None
+        self.prospect_positions = None
+        self.prospect_ages = None
+        self.available = None
+        self.rng = np.random.default_rng(random.getrandbits(32))
         self.positions_map = {
             'C': 'Center',
             'LW': 'Left Wing',
@@ -207,127 +309,124 @@ class DraftSimulator:
             
         return prospects
 
+    def load_team_needs(self):
+        """
+        Count every team's players by position, once at draft start.
+        
+        Needs are then kept up to date by record_pick as prospects are drafted.
+        """
+        players = self.fetch_data("Player", select="team_id,position_primary")
+        
+        self.position_counts = {team_id: np.zeros(len(POSITIONS)) for team_id in self.team_strategies}
+        for player in players:
+            team_id = player.get('team_id')
+            position = POSITION_INDEX.get(player.get('position_primary'))
+            if team_id is None or position is None:
+                continue
+            if team_id not in self.position_counts:
+                self.position_counts[team_id] = np.zeros(len(POSITIONS))
+            self.position_counts[team_id][position] += 1
+            
+        self.team_needs = {team_id: needs_from_counts(counts) for team_id, counts in self.position_counts.items()}
+        print(f"Calculated position needs for {len(self.team_needs)} teams")
+
+    def _needs_vector(self, team_id):
+        needs = self.team_needs.get(team_id)
+        if needs is None:
+            needs = self.team_needs[team_id] = needs_from_counts(
+                self.position_counts.setdefault(team_id, np.zeros(len(POSITIONS)))
+            )
+        return needs
+
     def calculate_team_needs(self, team_id):
         """Calculate position needs for a team."""
-        team_players = self.fetch_data("Player", filters={
-            "team_id": team_id,
-            "position_primary": True
-        }, select="position_primary")
-            
-        positions = {'C': 0, 'LW': 0, 'RW': 0, 'D': 0, 'G': 0}
+        needs = self._needs_vector(team_id)
+        return {pos: float(needs[i]) for i, pos in enumerate(POSITIONS)}
+
+    def load_prospect_pool(self):
+        """
+        Fetch the available prospects once and encode them into arrays.
         
-        # Count current players by position
-        for player in team_players:
-            pos = player.get('position_primary')
-            if pos in positions:
-                positions[pos] += 1
-                
-        # Calculate needs (lower count = higher need)
-        total = sum(positions.values())
-        if total == 0:
-            # New team with no players, needs everything
-            return {pos: 1.0 for pos in positions}
-            
-        # Invert and normalize to get needs (0-1 scale where 1 = highest need)
-        max_count = max(positions.values())
-        if max_count == 0:
-            max_count = 1
-            
-        needs = {}
-        for pos, count in positions.items():
-            # Positions with fewer players have higher need
-            needs[pos] = 1 - (count / max_count)
-            
-        return needs
+        Columns of prospect_features: overall, offensive rating, defensive
+        rating and potential score.
+        """
+        self.prospects = self.get_available_prospects() or []
+        
+        features = []
+        positions = []
+        ages = []
+        for prospect in self.prospects:
+            features.append([
+                prospect.get('overall') or 0,
+                sum(prospect.get(attr) or 0 for attr in OFFENSIVE_ATTRIBUTES) / 4,
+                sum(prospect.get(attr) or 0 for attr in DEFENSIVE_ATTRIBUTES) / 4,
+                POTENTIAL_SCORES.get(prospect.get('potential', 'Average'), DEFAULT_POTENTIAL_SCORE)
+            ])
+            positions.append(POSITION_INDEX.get(prospect.get('position_primary', 'C'), OTHER_POSITION))
+            ages.append(self.year - int((prospect.get('birthdate') or '2000-01-01')[:4]))
+            
+        self.prospect_features = np.array(features, dtype=np.float64).reshape(len(self.prospects), 4)
+        self.prospect_positions = np.array(positions, dtype=np.int64)
+        self.prospect_ages = np.array([nhl_ready_factor(age) for age in ages], dtype=np.float64)
+        self.available = np.ones(len(self.prospects), dtype=bool)
+        print(f"Loaded {len(self.prospects)} available prospects")
+
+    def score_prospects(self, team_id, strategy):
+        """
+        Score every prospect of the pool for a team in one vectorized pass.
+        
+        Returns:
+            Array of scores aligned with self.prospects (-inf for drafted prospects)
+        """
+        weights = STRATEGY_WEIGHTS.get(strategy, STRATEGY_WEIGHTS["BEST_AVAILABLE"])
+        features = self.prospect_features
+        positions = self.prospect_positions
+        
+        multiplier = weights['position'][positions]
+        if weights['need']:
+            multiplier = multiplier * (1 + self._needs_vector(team_id)[positions] * weights['need'])
+        if weights['age']:
+            multiplier = multiplier * self.prospect_ages
+            
+        coefficients = weights['features']
+        scores = features[:, 0] * multiplier * coefficients[0] + features[:, 1:] @ coefficients[1:]
+        
+        # Add some randomness to make draft less predictable
+        scores = scores + self.rng.uniform(-SCORE_NOISE, SCORE_NOISE, len(scores))
+        return np.where(self.available, scores, -np.inf)
 
     def evaluate_prospect(self, prospect, team_id, strategy):
         """Evaluate a prospect based on team strategy and needs."""
-        # Base score is overall rating
-        score = prospect.get('overall', 0)
+        weights = STRATEGY_WEIGHTS.get(strategy, STRATEGY_WEIGHTS["BEST_AVAILABLE"])
+        position = POSITION_INDEX.get(prospect.get('position_primary', 'C'), OTHER_POSITION)
         
-        # Get team needs
-        team_needs = self.calculate_team_needs(team_id)
-        position = prospect.get('position_primary', 'C')
+        multiplier = weights['position'][position]
+        if weights['need']:
+            multiplier = multiplier * (1 + self._needs_vector(team_id)[position] * weights['need'])
+        if weights['age']:
+            multiplier = multiplier * nhl_ready_factor(self.year - int((prospect.get('birthdate') or '2000-01-01')[:4]))
+            
+        features = [
+            sum(prospect.get(attr) or 0 for attr in OFFENSIVE_ATTRIBUTES) / 4,
+            sum(prospect.get(attr) or 0 for attr in DEFENSIVE_ATTRIBUTES) / 4,
+            POTENTIAL_SCORES.get(prospect.get('potential', 'Average'), DEFAULT_POTENTIAL_SCORE)
+        ]
+        coefficients = weights['features']
+        score = (prospect.get('overall') or 0) * multiplier * coefficients[0] + float(np.dot(features, coefficients[1:]))
         
-        # Apply strategy adjustments
-        if strategy == "BEST_AVAILABLE":
-            # No adjustment, just use overall rating
-            pass
-            
-        elif strategy == "POSITION_NEED":
-            # Boost score based on team needs for this position
-            need_factor = team_needs.get(position, 0.5)
-            score = score * (1 + need_factor * 0.5)
-            
-        elif strategy == "OFFENSIVE":
-            # Prioritize offensive positions and skills
-            if position in ['C', 'LW', 'RW']:
-                score *= 1.2
-            # Prioritize offensive attributes
-            offensive_rating = (
-                prospect.get('shooting_skill', 0) + 
-                prospect.get('shooting_accuracy', 0) + 
-                prospect.get('stickhandling', 0) + 
-                prospect.get('offensive_awareness', 0)
-            ) / 4
-            score = score * 0.7 + offensive_rating * 0.3
-            
-        elif strategy == "DEFENSIVE":
-            # Prioritize defensive positions and skills
-            if position in ['D', 'G']:
-                score *= 1.2
-            # Prioritize defensive attributes
-            defensive_rating = (
-                prospect.get('defense', 0) + 
-                prospect.get('shotblocking', 0) + 
-                prospect.get('defensive_awareness', 0) + 
-                prospect.get('strength', 0)
-            ) / 4
-            score = score * 0.7 + defensive_rating * 0.3
-            
-        elif strategy == "HIGH_POTENTIAL":
-            # Prioritize potential over current skill
-            potential_score = 0
-            potential = prospect.get('potential', 'Average')
-            
-            # Map potential to numeric value
-            potential_map = {
-                "High Elite": 100,
-                "Elite": 90,
-                "Medium Elite": 85,
-                "Low Elite": 80,
-                "High Top 6/4": 75,
-                "Top 6/4": 70,
-                "Medium Top 6/4": 65,
-                "Low Top 6/4": 60,
-                "High Top 9/6": 55,
-                "Top 9/6": 50,
-                "Medium Top 9/6": 45,
-                "Low Top 9/6": 40,
-                "High Bottom 6/Fringe": 35,
-                "Bottom 6/Fringe": 30,
-                "Medium Bottom 6/Fringe": 25,
-                "Low Bottom 6/Fringe": 20,
-                "Average": 10
-            }
-            
-            potential_score = potential_map.get(potential, 10)
-            score = score * 0.3 + potential_score * 0.7
-            
-        elif strategy == "NHL_READY":
-            # Prioritize older, more developed players
-            age = self.year - int(prospect.get('birthdate', '2000-01-01')[:4])
-            if age >= 20:
-                score *= 1.3
-            elif age >= 19:
-                score *= 1.2
-            elif age >= 18:
-                score *= 1.1
-                
         # Add some randomness to make draft less predictable
-        score += random.uniform(-5, 5)
+        score += random.uniform(-SCORE_NOISE, SCORE_NOISE)
             
-        return score
+        return float(score)
+
+    def record_pick(self, team_id, prospect_index):
+        """Take a drafted prospect out of the pool and update the team's needs."""
+        self.available[prospect_index] = False
+        position = self.prospect_positions[prospect_index]
+        if position != OTHER_POSITION:
+            counts = self.position_counts.setdefault(team_id, np.zeros(len(POSITIONS)))
+            counts[position] += 1
+            self.team_needs[team_id] = needs_from_counts(counts)
 
     def make_pick(self, pick_data):
         """Make a draft pick."""
@@ -335,23 +434,21 @@ class DraftSimulator:
         team_name = pick_data['team_name']
         strategy = self.team_strategies.get(team_id, {}).get('strategy', 'BEST_AVAILABLE')
         
-        # Get available prospects
-        prospects = self.get_available_prospects()
-        if not prospects:
+        # Load the pool on first use
+        if self.available is None:
+            self.load_prospect_pool()
+        if not self.available.any():
             print(f"No prospects available for pick {pick_data['overall']}")
             return None
             
-        # Evaluate each prospect based on team strategy
-        prospect_scores = []
-        for prospect in prospects:
-            score = self.evaluate_prospect(prospect, team_id, strategy)
-            prospect_scores.append((prospect, score))
-            
-        # Sort by score (highest first)
-        prospect_scores.sort(key=lambda x: x[1], reverse=True)
+        # Evaluate every available prospect based on team strategy
+        scores = self.score_prospects(team_id, strategy)
         
         # Select top prospect
-        selected_prospect, score = prospect_scores[0]
+        selected_index = int(np.argmax(scores))
+        selected_prospect = self.prospects[selected_index]
+        score = float(scores[selected_index])
+        self.record_pick(team_id, selected_index)
         
         # Update the draft pick with the selected prospect
         pick_update = {
@@ -457,6 +554,10 @@ class DraftSimulator:
         # Initialize draft in database
         if not self.initialize_draft():
             return False
+        
+        # Team needs and the prospect pool are loaded once, then updated pick by pick
+        self.load_team_needs()
+        self.load_prospect_pool()
             
         print(f"\nStarting {self.year} NHL Draft Simulation ({self.rounds} rounds)")
         print(f"Total picks: {len(self.draft_order)}")
@@ -0,0 +1,143 @@
+from typing import Dict, List, Any, Optional
+from collections import OrderedDict
+import copy
+import hashlib
+import json
+import os
+import threading
+from .player_store import get_player_store
+
+# Maximum number of teams kept in memory
+DEFAULT_CACHE_SIZE = int(os.environ.get("FORMATION_CACHE_SIZE", 128))
+
+
+def roster_key(players: List[Dict[str, Any]], coach: Optional[Dict[str, Any]] = None,
+               time_played_version: Any = 0) -> str:
+    """
+    Build a version key for a roster and its coach.
+
+    Any change to a player row or to the coach produces a different key, so a
+    cached formation is only reused while the inputs are identical.
+
+    Args:
+        players: List of player dictionaries
+        coach: Optional coach dictionary
+        time_played_version: TimePlayedStore.roster_version() of the roster
+                (generation and update count)
+
+    Returns:
+        Hex digest identifying this roster version
+    """
+    ordered_players = sorted(players or [], key=lambda p: str(p.get('id')))
+    payload = json.dumps({'players': ordered_players, 'coach': coach, 'time_played': time_played_version},
+                         sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class FormationCache:
+    """
+    LRU cache of TeamFormation.generate_optimal_lines() results.
+
+    Entries are stored per team abbreviation together with the roster key they
+    were computed from. A lookup only hits when the current roster key matches,
+    and roster-changing operations (player updates, draft picks) drop the
+    affected teams explicitly.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, team_abbreviation: str, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for this roster version, or None."""
+        abbr = str(team_abbreviation).upper()
+        with self._lock:
+            entry = self._entries.get(abbr)
+            if not entry or entry['key'] != key:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(abbr)
+            self.hits += 1
+            result = entry['result']
+        return copy.deepcopy(result)
+
+    def put(self, team_abbreviation: str, key: str, result: Dict[str, Any],
+            team_id: Optional[int] = None, player_ids: Optional[List[Any]] = None) -> None:
+        """Store a result for a team, evicting the least recently used team if full."""
+        abbr = str(team_abbreviation).upper()
+        entry = {
+            'key': key,
+            'team_id': team_id,
+            'player_ids': frozenset(player_ids or []),
+            'result': copy.deepcopy(result)
+        }
+        with self._lock:
+            self._entries[abbr] = entry
+            self._entries.move_to_end(abbr)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_team(self, team_abbreviation: Optional[str] = None, team_id: Optional[int] = None) -> int:
+        """
+        Drop the cached formation for a team.
+
+        Args:
+            team_abbreviation: Team abbreviation (e.g. 'MTL')
+            team_id: Team ID
+
+        Returns:
+            Number of entries removed
+        """
+        abbr = str(team_abbreviation).upper() if team_abbreviation else None
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if (abbr and key == abbr) or (team_id is not None and entry['team_id'] == team_id)
+            ]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def invalidate_player(self, player_id: Any) -> int:
+        """Drop every cached formation whose roster contains this player."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if player_id in entry['player_ids']]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
+# Process-wide cache instance
+formation_cache = FormationCache()
+
+
+def invalidate_roster_change(player_id: Any = None, team_abbreviation: Optional[str] = None,
+                             team_id: Optional[int] = None) -> None:
+    """
+    Invalidate cached formations after a roster change.
+
+    Drops the player's current team (any cached roster containing the player)
+    and the destination team when given, and evicts the player from the shared
+    player store so the next roster load re-normalizes it.
+    """
+    try:
+        if player_id is not None:
+            formation_cache.invalidate_player(player_id)
+            get_player_store().remove(player_id)
+        if team_abbreviation or team_id is not None:
+            formation_cache.invalidate_team(team_abbreviation=team_abbreviation, team_id=team_id)
+    except Exception as e:
+        print(f"Error invalidating formation cache: {e}")
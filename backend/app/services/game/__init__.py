@@ -0,0 +1,4 @@
+from .game_playbyplay import PlayByPlayEngine, TeamProfile
+from .season_simulation import SeasonSimulator, simulate_season
+
+__all__ = ['PlayByPlayEngine', 'TeamProfile', 'SeasonSimulator', 'simulate_season']
@@ -0,0 +1,255 @@
+from typing import Dict, List, Any, Iterable, Optional
+import json
+import struct
+import zlib
+import numpy as np
+
+# Binary format identifier and version
+MAGIC = b'HLEV'
+VERSION = 1
+
+# Event type codes (index in this list)
+EVENT_TYPES = ['face_off', 'shot', 'goal', 'penalty']
+EVENT_CODES = {name: code for code, name in enumerate(EVENT_TYPES)}
+
+TEAM_CODES = {'home': 0, 'away': 1}
+TEAM_NAMES = {code: name for name, code in TEAM_CODES.items()}
+
+# Player index used when an event has no player
+NO_PLAYER = 0xFFFF
+
+# Presence flags for optional fields
+HAS_TEAM = 1
+HAS_PLAYER = 2
+HAS_ASSIST = 4
+HAS_POSITION = 8
+HAS_PENALTY = 16
+
+# Fixed-width record columns, stored column by column inside each period block
+COLUMNS = [
+    ('type', np.uint8),
+    ('flags', np.uint8),
+    ('team', np.uint8),
+    ('time', np.uint16),
+    ('player', np.uint16),
+    ('assist', np.uint16),
+    ('x', np.uint8),
+    ('y', np.uint8),
+    ('detail', np.uint16),
+    ('duration', np.uint8),
+]
+
+# Header: magic, version, number of periods, string table length
+_HEADER = struct.Struct('<4sBBI')
+# Period index entry: period number, block offset, block length
+_PERIOD_ENTRY = struct.Struct('<BII')
+
+
+def encode_events(events: Iterable[Dict[str, Any]]) -> bytes:
+    """
+    Encode play-by-play events into the compact binary event log.
+
+    Events are grouped by period. Each period is stored as fixed-width
+    columns (type code, presence flags, team, time, player/assist index,
+    coordinates, penalty type and duration) and compressed separately,
+    so a single period can be decoded without touching the others.
+    Player names and penalty types go into a shared string table.
+
+    Args:
+        events: Event dictionaries as produced by the play-by-play engine
+
+    Returns:
+        Encoded event log
+    """
+    strings = []
+    string_index = {}
+
+    def intern(value: Any) -> int:
+        value = str(value)
+        index = string_index.get(value)
+        if index is None:
+            index = len(strings)
+            if index >= NO_PLAYER:
+                raise ValueError("Event log string table is full")
+            strings.append(value)
+            string_index[value] = index
+        return index
+
+    by_period = {}
+    for event in events:
+        event_type = event.get('type')
+        if event_type not in EVENT_CODES:
+            raise ValueError(f"Unknown event type: {event_type}")
+
+        flags = 0
+        team = TEAM_CODES.get(event.get('team'), 0)
+        if event.get('team') in TEAM_CODES:
+            flags |= HAS_TEAM
+
+        player = event.get('scorer') if event_type == 'goal' else event.get('player')
+        if player is not None:
+            flags |= HAS_PLAYER
+        assist = event.get('assist')
+        if assist is not None:
+            flags |= HAS_ASSIST
+        if 'x' in event and 'y' in event:
+            flags |= HAS_POSITION
+        if event.get('penalty_type') is not None:
+            flags |= HAS_PENALTY
+
+        by_period.setdefault(int(event.get('period', 1)), []).append((
+            EVENT_CODES[event_type],
+            flags,
+            team,
+            int(event.get('time', 0)),
+            intern(player) if player is not None else NO_PLAYER,
+            intern(assist) if assist is not None else NO_PLAYER,
+            int(event.get('x', 0)) if flags & HAS_POSITION else 0,
+            int(event.get('y', 0)) if flags & HAS_POSITION else 0,
+            intern(event['penalty_type']) if flags & HAS_PENALTY else 0,
+            int(event.get('duration', 0) or 0),
+        ))
+
+    blocks = []
+    for period in sorted(by_period):
+        rows = by_period[period]
+        columns = list(zip(*rows))
+        raw = struct.pack('<I', len(rows)) + b''.join(
+            np.asarray(values, dtype=dtype).tobytes() for values, (_, dtype) in zip(columns, COLUMNS)
+        )
+        blocks.append((period, zlib.compress(raw, 6)))
+
+    string_table = zlib.compress(json.dumps(strings).encode('utf-8'), 6)
+    header = _HEADER.pack(MAGIC, VERSION, len(blocks), len(string_table))
+
+    index_size = _PERIOD_ENTRY.size * len(blocks)
+    offset = _HEADER.size + index_size + len(string_table)
+    index = b''
+    for period, block in blocks:
+        index += _PERIOD_ENTRY.pack(period, offset, len(block))
+        offset += len(block)
+
+    return header + index + string_table + b''.join(block for _, block in blocks)
+
+
+class EventLog:
+    """
+    Lazily decoded view of a binary event log.
+
+    Only the header and period index are read on construction. The string
+    table and each period block are decompressed the first time they are
+    needed.
+    """
+
+    def __init__(self, data: bytes):
+        magic, version, n_periods, string_table_length = _HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError("Not an event log")
+        if version != VERSION:
+            raise ValueError(f"Unsupported event log version: {version}")
+
+        self._data = data
+        self._periods = {}
+        position = _HEADER.size
+        for _ in range(n_periods):
+            period, offset, length = _PERIOD_ENTRY.unpack_from(data, position)
+            self._periods[period] = (offset, length)
+            position += _PERIOD_ENTRY.size
+
+        self._string_table_span = (position, string_table_length)
+        self._strings = None
+        self._columns = {}
+
+    @property
+    def periods(self) -> List[int]:
+        """Periods present in the log."""
+        return sorted(self._periods)
+
+    @property
+    def strings(self) -> List[str]:
+        if self._strings is None:
+            start, length = self._string_table_span
+            self._strings = json.loads(zlib.decompress(self._data[start:start + length]).decode('utf-8'))
+        return self._strings
+
+    def columns(self, period: int) -> Dict[str, np.ndarray]:
+        """
+        Return the typed columns of one period, decompressing it on first use.
+
+        Args:
+            period: Period number
+
+        Returns:
+            Dictionary of column name to NumPy array (empty if the period has no events)
+        """
+        if period in self._columns:
+            return self._columns[period]
+        if period not in self._periods:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS}
+
+        offset, length = self._periods[period]
+        raw = zlib.decompress(self._data[offset:offset + length])
+        count = struct.unpack_from('<I', raw, 0)[0]
+
+        columns = {}
+        position = 4
+        for name, dtype in COLUMNS:
+            size = np.dtype(dtype).itemsize * count
+            columns[name] = np.frombuffer(raw, dtype=dtype, count=count, offset=position)
+            position += size
+
+        self._columns[period] = columns
+        return columns
+
+    def count(self, event_type: str, team: Optional[str] = None, period: Optional[int] = None) -> int:
+        """Count events of a type (optionally for one team and/or period) without building dictionaries."""
+        total = 0
+        for p in ([period] if period is not None else self.periods):
+            columns = self.columns(p)
+            mask = columns['type'] == EVENT_CODES[event_type]
+            if team is not None:
+                mask &= ((columns['flags'] & HAS_TEAM) > 0) & (columns['team'] == TEAM_CODES[team])
+            total += int(mask.sum())
+        return total
+
+    def events(self, period: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Decode events into dictionaries.
+
+        Args:
+            period: Only decode this period (all periods when None)
+
+        Returns:
+            Event dictionaries in the same form they were encoded from
+        """
+        events = []
+        for p in ([period] if period is not None else self.periods):
+            columns = self.columns(p)
+            if not len(columns['type']):
+                continue
+            rows = zip(*(columns[name].tolist() for name, _ in COLUMNS))
+            events.extend(self._decode_row(p, row) for row in rows)
+        return events
+
+    def _decode_row(self, period: int, row) -> Dict[str, Any]:
+        event_code, flags, team, time, player, assist, x, y, detail, duration = row
+        event_type = EVENT_TYPES[event_code]
+        strings = self.strings
+
+        event = {"type": event_type, "time": time, "period": period}
+        if flags & HAS_TEAM:
+            event["team"] = TEAM_NAMES[team]
+        if flags & HAS_PLAYER:
+            event["scorer" if event_type == 'goal' else "player"] = strings[player]
+        if flags & HAS_ASSIST:
+            event["assist"] = strings[assist]
+        if flags & HAS_POSITION:
+            event["x"] = x
+            event["y"] = y
+        if flags & HAS_PENALTY:
+            event["penalty_type"] = strings[detail]
+            event["duration"] = duration
+        return event
+
+    def __len__(self) -> int:
+        return sum(len(self.columns(p)['type']) for p in self.periods)
@@ -0,0 +1,507 @@
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+import bisect
+import copy
+import random
+import numpy as np
+from .rate_tables import GameRates, TeamRateTable
+from .shift_scheduler import ShiftScheduler, deployment_weights, FORWARD_LINES, DEFENSE_PAIRS, POWER_PLAY, PENALTY_KILL
+from .matchups import MatchupEngine, unit_strengths
+
+# Placeholder roster used when a team's lines cannot be loaded
+DEFAULT_SKATERS = [f"Player{i}" for i in range(1, 13) if i not in (6, 12)]
+
+# Initial positions (simplified)
+INITIAL_POSITIONS = {
+    "home": {
+        "Player1": {"x": 10, "y": 50, "role": "center"},
+        "Player2": {"x": 20, "y": 30, "role": "left_wing"},
+        "Player3": {"x": 20, "y": 70, "role": "right_wing"},
+        "Player4": {"x": 30, "y": 40, "role": "defense"},
+        "Player5": {"x": 30, "y": 60, "role": "defense"},
+        "Player6": {"x": 5, "y": 50, "role": "goalie"},
+        # Bench players
+        "Player7": {"x": -10, "y": 20, "role": "bench"},
+        "Player8": {"x": -10, "y": 25, "role": "bench"},
+        "Player9": {"x": -10, "y": 30, "role": "bench"},
+        "Player10": {"x": -10, "y": 35, "role": "bench"},
+        "Player11": {"x": -10, "y": 40, "role": "bench"},
+        "Player12": {"x": -10, "y": 45, "role": "backup_goalie"},
+    },
+    "away": {
+        "Player1": {"x": 90, "y": 50, "role": "center"},
+        "Player2": {"x": 80, "y": 30, "role": "left_wing"},
+        "Player3": {"x": 80, "y": 70, "role": "right_wing"},
+        "Player4": {"x": 70, "y": 40, "role": "defense"},
+        "Player5": {"x": 70, "y": 60, "role": "defense"},
+        "Player6": {"x": 95, "y": 50, "role": "goalie"},
+        # Bench players
+        "Player7": {"x": 110, "y": 20, "role": "bench"},
+        "Player8": {"x": 110, "y": 25, "role": "bench"},
+        "Player9": {"x": 110, "y": 30, "role": "bench"},
+        "Player10": {"x": 110, "y": 35, "role": "bench"},
+        "Player11": {"x": 110, "y": 40, "role": "bench"},
+        "Player12": {"x": 110, "y": 45, "role": "backup_goalie"},
+    },
+    "puck": {"x": 50, "y": 50, "possession": None}
+}
+
+
+class TeamProfile:
+    """
+    Ratings and skater pool of one team, as used by the play-by-play engine.
+
+    Built from a TeamFormation result (team_rating, lines and chemistry, plus
+    the team's coach strategy) when available; otherwise every rating
+    defaults to league average and the placeholder roster is used.
+    """
+
+    DEFAULT_RATING = 75.0
+
+    # Share of even-strength ice time per forward line / defense pair
+    FORWARD_LINE_TOI = [0.35, 0.30, 0.22, 0.13]
+    DEFENSE_PAIR_TOI = [0.42, 0.34, 0.24]
+
+    def __init__(self, abbreviation: str = None, team_rating: Optional[Dict[str, Any]] = None,
+                 lines: Optional[Dict[str, Any]] = None, chemistry: Optional[Dict[str, Any]] = None,
+                 coach_strategy: Any = None):
+        team_rating = team_rating or {}
+        self.abbreviation = abbreviation
+
+        self.overall = self._rating(team_rating, 'overall')
+        self.offense = self._rating(team_rating, 'offense')
+        self.defense = self._rating(team_rating, 'defense')
+        self.special_teams = self._rating(team_rating, 'special_teams')
+        self.goaltending = self._rating(team_rating, 'goaltending')
+
+        # Per-situation strengths, adjusted by chemistry and coach
+        self.rate_table = TeamRateTable(team_rating, chemistry, coach_strategy)
+
+        self.skaters, self.skater_weights = self._build_skater_pool(lines or {})
+        self._cumulative_weights = self._cumulative(self.skater_weights)
+
+        # Shift deployment probabilities and the players of each unit
+        self.deployment = deployment_weights(coach_strategy)
+        self.units = self._build_units(lines or {})
+        self._on_ice_pools = {}
+
+        # Line/pair ratings and chemistry for matchups (empty without real lines)
+        self.matchup_strengths = unit_strengths(lines, team_rating, chemistry) if (lines or {}).get('forward_lines') else {}
+
+    def signature(self) -> List[Any]:
+        """Everything the engine reads from this profile, for lineup hashing."""
+        return [
+            self.abbreviation,
+            [self.overall, self.offense, self.defense, self.special_teams, self.goaltending],
+            self.rate_table.signature(),
+            self.skaters,
+            self.skater_weights,
+            self.deployment,
+            self.units
+        ]
+
+    @classmethod
+    def _rating(cls, team_rating: Dict[str, Any], key: str) -> float:
+        value = team_rating.get(key)
+        if isinstance(value, (int, float)) and value > 0:
+            return float(value)
+        return cls.DEFAULT_RATING
+
+    @staticmethod
+    def _player_name(player: Any) -> Optional[str]:
+        if not isinstance(player, dict):
+            return None
+        name = f"{player.get('first_name', '')} {player.get('last_name', '')}".strip()
+        return name or player.get('name') or (f"Player{player['id']}" if player.get('id') is not None else None)
+
+    @staticmethod
+    def _player_rating(player: Dict[str, Any]) -> float:
+        for field in ('overall_rating', 'overall'):
+            value = player.get(field)
+            if isinstance(value, (int, float)):
+                return float(value)
+        return TeamProfile.DEFAULT_RATING
+
+    def _build_skater_pool(self, lines: Dict[str, Any]) -> Tuple[List[str], List[float]]:
+        """
+        Weight each skater by ice-time share and rating.
+
+        Returns:
+            Tuple of (skater names, selection weights)
+        """
+        weights = {}
+
+        def add(player, share):
+            name = self._player_name(player)
+            if name:
+                weights[name] = weights.get(name, 0.0) + share * self._player_rating(player)
+
+        for i, line in enumerate((lines.get('forward_lines') or [])[:len(self.FORWARD_LINE_TOI)]):
+            for position in ('LW', 'C', 'RW'):
+                add(line.get(position), self.FORWARD_LINE_TOI[i])
+
+        # Defensemen shoot and score less often than forwards
+        for i, pair in enumerate((lines.get('defense_pairs') or [])[:len(self.DEFENSE_PAIR_TOI)]):
+            for position in ('LD', 'RD'):
+                add(pair.get(position), self.DEFENSE_PAIR_TOI[i] * 0.5)
+
+        if not weights:
+            return list(DEFAULT_SKATERS), [1.0] * len(DEFAULT_SKATERS)
+
+        names = list(weights)
+        return names, [weights[name] for name in names]
+
+    def _build_units(self, lines: Dict[str, Any]) -> Dict[str, List[List[Tuple[str, float]]]]:
+        """
+        Players of every forward line, defense pair and special teams unit.
+
+        Returns:
+            Dictionary of unit group to a list of units, each a list of
+            (skater name, selection weight); defensemen count half
+        """
+        def unit(forwards, defense):
+            members = []
+            for players, share in ((forwards, 1.0), (defense, 0.5)):
+                for player in players:
+                    name = self._player_name(player)
+                    if name:
+                        members.append((name, share * self._player_rating(player)))
+            return members
+
+        units = {
+            FORWARD_LINES: [
+                unit([line.get(p) for p in ('LW', 'C', 'RW')], [])
+                for line in (lines.get('forward_lines') or [])[:len(self.FORWARD_LINE_TOI)]
+            ],
+            DEFENSE_PAIRS: [
+                unit([], [pair.get(p) for p in ('LD', 'RD')])
+                for pair in (lines.get('defense_pairs') or [])[:len(self.DEFENSE_PAIR_TOI)]
+            ]
+        }
+        for group, prefix in ((POWER_PLAY, 'power_play'), (PENALTY_KILL, 'penalty_kill')):
+            units[group] = []
+            for i in (1, 2):
+                special = lines.get(f'{prefix}_{i}') or {}
+                units[group].append(unit(special.get('forwards') or [], special.get('defense') or []))
+        return units
+
+    @staticmethod
+    def _cumulative(weights: List[float]) -> List[float]:
+        cumulative = []
+        total = 0.0
+        for weight in weights:
+            total += weight
+            cumulative.append(total)
+        return cumulative
+
+    def _on_ice_pool(self, on_ice: Tuple[Any, ...]) -> Optional[Tuple[List[str], List[float]]]:
+        """Skaters and cumulative weights of the units on the ice (None if a unit is unknown)."""
+        if on_ice in self._on_ice_pools:
+            return self._on_ice_pools[on_ice]
+
+        members = []
+        for entry in on_ice:
+            if entry is None:
+                continue
+            group, index = entry
+            units = self.units.get(group) or []
+            if index >= len(units) or not units[index]:
+                members = None
+                break
+            members.extend(units[index])
+
+        pool = None
+        if members:
+            names = [name for name, _ in members]
+            pool = (names, self._cumulative([weight for _, weight in members]))
+        self._on_ice_pools[on_ice] = pool
+        return pool
+
+    def pick_skater(self, rng: random.Random, exclude: Optional[str] = None,
+                    on_ice: Optional[Tuple[Any, ...]] = None) -> str:
+        """
+        Pick a skater weighted by ice time and rating.
+
+        Args:
+            rng: Random generator
+            exclude: Skater that must not be picked (e.g. the scorer for an assist)
+            on_ice: Units on the ice as returned by ShiftScheduler.on_ice; the
+                pick is limited to their players when they are known
+        """
+        skaters, cumulative = self.skaters, self._cumulative_weights
+        if on_ice is not None:
+            pool = self._on_ice_pool(on_ice)
+            if pool is not None and len(pool[0]) > 1:
+                skaters, cumulative = pool
+
+        total = cumulative[-1]
+        for _ in range(8):
+            skater = skaters[bisect.bisect_right(cumulative, rng.random() * total)]
+            if skater != exclude:
+                return skater
+        others = [s for s in skaters if s != exclude]
+        return rng.choice(others) if others else skaters[0]
+
+
+class PlayByPlayEngine:
+    """
+    Event-driven play-by-play simulator.
+
+    Shots, goals, penalties and face-offs are modelled as competing Poisson
+    processes. Their rates come from a GameRates table built once from the
+    two teams' rate tables, one row per manpower state. The engine
+    samples the exponential waiting time to the next event and jumps straight
+    to it, so the cost of a game scales with the number of events rather than
+    with the number of seconds played. Penalty expiries and period ends are
+    scheduled events; because waiting times are memoryless, the clock simply
+    restarts from them with the updated rates.
+
+    Who is on the ice comes from each team's ShiftScheduler, which is
+    re-planned in chunks whenever the score situation or manpower changes.
+    At every face-off the home team uses its last change to send out its
+    matchup counter (Hungarian assignment) to the visitor's units.
+    """
+
+    # Length of a regulation period in seconds; penalties scale with it
+    REGULATION_PERIOD_LENGTH = 1200
+    MINOR_PENALTY_LENGTH = 120
+
+    PENALTY_TYPES = ["tripping", "hooking", "interference", "slashing", "high-sticking"]
+
+    def __init__(self, home: TeamProfile, away: TeamProfile, period_length: int = 1200,
+                 periods: int = 3, rng: Optional[random.Random] = None):
+        """
+        Args:
+            home: Home team profile
+            away: Away team profile
+            period_length: Period length in seconds of game time
+            periods: Number of periods
+            rng: Random generator (defaults to a new unseeded generator)
+        """
+        self.teams = {"home": home, "away": away}
+        self.period_length = period_length
+        self.periods = periods
+        self.rng = rng or random.Random()
+        self.penalty_length = self.MINOR_PENALTY_LENGTH * period_length / self.REGULATION_PERIOD_LENGTH
+        self.rate_table = GameRates(home.rate_table, away.rate_table)
+
+        # The home team has the last change: at every stoppage it sends out
+        # the unit the matchup assignment holds for the visitor's unit on the ice
+        self.counters = {}
+        if home.matchup_strengths and away.matchup_strengths:
+            matchups = MatchupEngine(home.matchup_strengths, away.matchup_strengths, is_home_team=True)
+            for group in (FORWARD_LINES, DEFENSE_PAIRS):
+                self.counters[group] = {theirs: ours for ours, theirs, _ in matchups.assignment(group)}
+
+    @staticmethod
+    def _other(side: str) -> str:
+        return "away" if side == "home" else "home"
+
+    def _rates(self, penalties: Dict[str, List[float]]) -> Tuple[List[Tuple[str, str, float]], float]:
+        """
+        Per-second rates of every (event, team) pair for the current manpower state.
+
+        Returns:
+            Tuple of (list of (event type, team side, rate), total rate),
+            looked up from the game's precomputed rate table
+        """
+        state = GameRates.state(len(penalties["home"]), len(penalties["away"]))
+        return self.rate_table.rate_lists[state], self.rate_table.totals[state]
+
+    def _plan_shifts(self, clock: float, period_end: float, penalties: Dict[str, List[float]]) -> None:
+        """Re-plan both teams' shifts from `clock` for the current score and manpower."""
+        state = GameRates.state(len(penalties["home"]), len(penalties["away"]))
+        for side, scheduler in self.shifts.items():
+            lead = self.score[side] - self.score[self._other(side)]
+            situation = "leading" if lead > 0 else ("trailing" if lead < 0 else "tied")
+            scheduler.plan(clock, period_end, situation, GameRates.manpower(state, side))
+
+    def _last_change(self, clock: float) -> None:
+        """At a stoppage, the home team counters the visitor's units on the ice."""
+        if not self.counters:
+            return
+        home = self.shifts["home"]
+        for timeline, unit in zip(ShiftScheduler.TIMELINES, self.shifts["away"].on_ice(clock)):
+            if unit is None:
+                continue
+            group, index = unit
+            counter = self.counters.get(group, {}).get(index)
+            if counter is not None:
+                home.change(timeline, clock, group, counter)
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """
+        Simulate a full game, yielding each event as it happens.
+
+        Only the running totals are kept in memory (see `summary()`), so the
+        events can be streamed to a client while the game is being played.
+
+        Yields:
+            Event dictionaries in game order
+        """
+        rng = self.rng
+        score = self.score = {"home": 0, "away": 0}
+        shots = self.shots = {"home": 0, "away": 0}
+        penalty_counts = self.penalty_counts = {"home": 0, "away": 0}
+        period_scores = self.period_scores = []
+        self.positions = copy.deepcopy(INITIAL_POSITIONS)
+
+        # Expiry times (game clock, seconds) of active minor penalties per team
+        penalties = {"home": [], "away": []}
+        rates, total_rate = self._rates(penalties)
+
+        # Shift timelines, drawn from their own generator seeded by the game RNG
+        shift_rng = np.random.default_rng(rng.getrandbits(64))
+        time_scale = self.period_length / self.REGULATION_PERIOD_LENGTH
+        self.shifts = {
+            side: ShiftScheduler(team.deployment, shift_rng, time_scale) for side, team in self.teams.items()
+        }
+
+        for period in range(1, self.periods + 1):
+            period_start = (period - 1) * self.period_length
+            period_end = period_start + self.period_length
+            period_goals = {"home": 0, "away": 0}
+            clock = period_start
+            self._plan_shifts(clock, period_end, penalties)
+
+            while True:
+                wait = rng.expovariate(total_rate) if total_rate > 0 else float('inf')
+
+                # Next scheduled event: earliest penalty expiry or period end
+                expiries = penalties["home"] + penalties["away"]
+                next_scheduled = min([period_end] + expiries)
+                if clock + wait >= next_scheduled:
+                    clock = next_scheduled
+                    if clock >= period_end:
+                        for scheduler in self.shifts.values():
+                            scheduler.finish(period_end)
+                        break
+                    for side in ("home", "away"):
+                        penalties[side] = [t for t in penalties[side] if t > clock]
+                    rates, total_rate = self._rates(penalties)
+                    self._plan_shifts(clock, period_end, penalties)
+                    continue
+
+                clock += wait
+                time = int(clock - period_start)
+
+                # Choose the event in proportion to its rate
+                threshold = rng.random() * total_rate
+                for event_type, side, rate in rates:
+                    threshold -= rate
+                    if threshold < 0:
+                        break
+
+                if event_type == "face_off":
+                    self._last_change(clock)
+                    yield {
+                        "type": "face_off",
+                        "time": time,
+                        "period": period,
+                        "x": 50,
+                        "y": 50
+                    }
+                    continue
+
+                team = self.teams[side]
+                on_ice = self.shifts[side].on_ice(clock)
+
+                if event_type == "shot":
+                    shooter = team.pick_skater(rng, on_ice=on_ice)
+                    shots[side] += 1
+                    x = rng.randint(50, 95) if side == "home" else rng.randint(5, 50)
+                    y = rng.randint(30, 70)
+                    yield {
+                        "type": "shot",
+                        "time": time,
+                        "period": period,
+                        "team": side,
+                        "player": shooter,
+                        "x": x,
+                        "y": y
+                    }
+                    self.positions["puck"] = {"x": x, "y": y, "possession": shooter}
+
+                elif event_type == "goal":
+                    scorer = team.pick_skater(rng, on_ice=on_ice)
+                    assist = team.pick_skater(rng, exclude=scorer, on_ice=on_ice)
+                    score[side] += 1
+                    shots[side] += 1
+                    period_goals[side] += 1
+                    yield {
+                        "type": "goal",
+                        "time": time,
+                        "period": period,
+                        "team": side,
+                        "scorer": scorer,
+                        "assist": assist,
+                        "x": 90 if side == "home" else 10,
+                        "y": rng.randint(40, 60)
+                    }
+
+                    # A power-play goal ends the earliest opposing minor
+                    opponent = self._other(side)
+                    if len(penalties[opponent]) > len(penalties[side]):
+                        penalties[opponent].remove(min(penalties[opponent]))
+                        rates, total_rate = self._rates(penalties)
+
+                    # New score situation (and possibly manpower) for both benches
+                    self._plan_shifts(clock, period_end, penalties)
+
+                    self.positions = copy.deepcopy(INITIAL_POSITIONS)
+                    self._last_change(clock)
+                    yield {"type": "face_off", "time": time, "period": period, "x": 50, "y": 50}
+
+                elif event_type == "penalty":
+                    offender = team.pick_skater(rng, on_ice=on_ice)
+                    penalty_counts[side] += 1
+                    yield {
+                        "type": "penalty",
+                        "time": time,
+                        "period": period,
+                        "team": side,
+                        "player": offender,
+                        "penalty_type": rng.choice(self.PENALTY_TYPES),
+                        "duration": 2  # 2-minute minor penalty
+                    }
+                    penalties[side].append(clock + self.penalty_length)
+                    rates, total_rate = self._rates(penalties)
+                    self._plan_shifts(clock, period_end, penalties)
+
+                    self.positions = copy.deepcopy(INITIAL_POSITIONS)
+                    self._last_change(clock)
+                    yield {"type": "face_off", "time": time, "period": period, "x": 50, "y": 50}
+
+            period_scores.append(period_goals)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Final totals of the last simulated game.
+
+        Returns:
+            Dictionary with score, shots and penalties per team, per-period
+            goals, minutes played per line/pair/unit of each team and the
+            final puck position
+        """
+        shifts = getattr(self, "shifts", {})
+        return {
+            "home_score": self.score["home"],
+            "away_score": self.score["away"],
+            "periods": self.period_scores,
+            "shots": self.shots,
+            "penalties": self.penalty_counts,
+            "ice_time": {side: scheduler.minutes() for side, scheduler in shifts.items()},
+            "positions": self.positions
+        }
+
+    def simulate(self) -> Dict[str, Any]:
+        """
+        Simulate a full game.
+
+        Returns:
+            Dictionary with events, score, shots and penalties per team,
+            per-period goals and the final puck position
+        """
+        events = list(self.iter_events())
+        result = self.summary()
+        result["events"] = events
+        return result
@@ -0,0 +1,259 @@
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+import numpy as np
+from .rate_tables import GameRates, DEFAULT_RATING, performance_modifier
+
+# Unit groups that can be matched against each other
+MATCHUP_GROUPS = {
+    'forward_lines': ('line', ('LW', 'C', 'RW'), 'line_'),
+    'defense_pairs': ('pair', ('LD', 'RD'), 'pair_'),
+}
+
+# Even-strength goals per 60 minutes of a league-average unit
+BASE_GOALS_PER_60 = GameRates.SHOTS_PER_60 * GameRates.SHOOTING_PERCENTAGE
+
+
+def hungarian(cost: Sequence[Sequence[float]]) -> Tuple[List[int], List[int]]:
+    """
+    Minimum-cost assignment (Hungarian algorithm with potentials, O(n^2 m)).
+
+    Rectangular matrices are supported; every row (or every column, if
+    there are fewer columns than rows) is assigned exactly once.
+
+    Args:
+        cost: n x m cost matrix
+
+    Returns:
+        Tuple of (row indices, column indices) of the assignment, sorted by row
+    """
+    matrix = [list(map(float, row)) for row in cost]
+    if not matrix or not matrix[0]:
+        return [], []
+
+    transposed = len(matrix) > len(matrix[0])
+    if transposed:
+        matrix = [list(column) for column in zip(*matrix)]
+
+    n, m = len(matrix), len(matrix[0])
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    # p[j]: row (1-based) assigned to column j; column 0 is the virtual start
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = matrix[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    current = row[j - 1] - u[i0] - v[j]
+                    if current < minv[j]:
+                        minv[j] = current
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # Augment along the alternating path
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    pairs = sorted((p[j] - 1, j - 1) for j in range(1, m + 1) if p[j])
+    if transposed:
+        pairs = sorted((col, row) for row, col in pairs)
+    return [row for row, _ in pairs], [col for _, col in pairs]
+
+
+def _player_rating(player: Any) -> Optional[float]:
+    if not isinstance(player, dict):
+        return None
+    for field in ('overall_rating', 'overall'):
+        value = player.get(field)
+        if isinstance(value, (int, float)):
+            return float(value)
+    return None
+
+
+def unit_strengths(formation: Dict[str, Any], team_rating: Optional[Dict[str, Any]] = None,
+                   chemistry: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Rating and chemistry performance modifier of every forward line and defense pair.
+
+    Args:
+        formation: Either a TeamFormation result ({'lines', 'team_rating',
+            'chemistry'}) or a plain line combinations dictionary
+        team_rating: Team rating whose component ratings (line_1, pair_1, ...)
+            are used when available; they already include rating-level chemistry
+        chemistry: Chemistry entries per line/pair
+
+    Returns:
+        Dictionary of group to {'ratings': array, 'chemistry': array}
+    """
+    formation = formation or {}
+    if 'lines' in formation and isinstance(formation.get('lines'), dict):
+        team_rating = team_rating or formation.get('team_rating')
+        chemistry = chemistry or formation.get('chemistry')
+        lines = formation['lines']
+    else:
+        lines = formation
+
+    components = (team_rating or {}).get('component_ratings') or {}
+    chemistry = chemistry or {}
+
+    strengths = {}
+    for group, (_, positions, component_prefix) in MATCHUP_GROUPS.items():
+        ratings = []
+        modifiers = []
+        entries = chemistry.get(group) or []
+        for i, unit in enumerate(lines.get(group) or []):
+            rating = components.get(f'{component_prefix}{i + 1}')
+            if not isinstance(rating, (int, float)) or rating <= 0:
+                player_ratings = [r for r in (_player_rating(unit.get(p)) for p in positions) if r is not None]
+                rating = sum(player_ratings) / len(player_ratings) if player_ratings else DEFAULT_RATING
+            ratings.append(float(rating))
+
+            entry = entries[i] if i < len(entries) else None
+            value = entry.get('chemistry', 0) if isinstance(entry, dict) else 0
+            modifiers.append(performance_modifier(value or 0))
+
+        strengths[group] = {'ratings': np.array(ratings), 'chemistry': np.array(modifiers)}
+    return strengths
+
+
+class MatchupEngine:
+    """
+    Line matchup optimizer for one game.
+
+    Expected-goal-differential matrices of our units against the opponent's
+    are built once from cached ratings and chemistry. Full-game matchups
+    are solved with the Hungarian algorithm and cached; per-stoppage
+    decisions (`counter`, `lead`) are lookups into the matrices.
+
+    The home team has the last change: it sees the visitor's unit before
+    choosing its own, so it can pick the best counter for every opposing
+    unit. The visitor changes first and has to expect to be countered.
+    """
+
+    def __init__(self, ours: Dict[str, Dict[str, np.ndarray]], theirs: Dict[str, Dict[str, np.ndarray]],
+                 is_home_team: bool, defensive_weight: float = 1.0):
+        """
+        Args:
+            ours: unit_strengths() of our team
+            theirs: unit_strengths() of the opponent
+            is_home_team: Whether we have the last change
+            defensive_weight: Weight of goals against relative to goals for
+        """
+        self.is_home_team = is_home_team
+        self.defensive_weight = defensive_weight
+        self.matrices = {}
+        for group in MATCHUP_GROUPS:
+            if group in ours and group in theirs:
+                self.matrices[group] = self._differential(ours[group], theirs[group])
+        self._assignments = {}
+
+    def _differential(self, ours: Dict[str, np.ndarray], theirs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Weighted expected goal differential per 60 minutes, ours (rows) vs theirs (columns)."""
+        if not len(ours['ratings']) or not len(theirs['ratings']):
+            return np.zeros((len(ours['ratings']), len(theirs['ratings'])))
+
+        gap = (ours['ratings'][:, None] - theirs['ratings'][None, :]) / GameRates.RATING_SPREAD
+        chemistry = ours['chemistry'][:, None] / theirs['chemistry'][None, :]
+        goals_for = BASE_GOALS_PER_60 * np.exp(gap) * chemistry
+        goals_against = BASE_GOALS_PER_60 * np.exp(-gap) / chemistry
+        return goals_for - self.defensive_weight * goals_against
+
+    def assignment(self, group: str) -> List[Tuple[int, int, float]]:
+        """
+        Full-game matchups of a unit group.
+
+        With the last change we get the assignment that maximizes our total
+        expected differential; without it, the opponent imposes the one
+        that minimizes it.
+
+        Returns:
+            List of (our unit index, opponent unit index, expected goal differential per 60)
+        """
+        if group in self._assignments:
+            return self._assignments[group]
+
+        matrix = self.matrices.get(group)
+        if matrix is None or not matrix.size:
+            self._assignments[group] = []
+            return []
+
+        cost = -matrix if self.is_home_team else matrix
+        rows, cols = hungarian(cost.tolist())
+        result = [(r, c, float(matrix[r, c])) for r, c in zip(rows, cols)]
+        self._assignments[group] = result
+        return result
+
+    def counter(self, group: str, opponent_unit: int, available: Optional[Sequence[int]] = None) -> int:
+        """
+        Our best unit against an opposing unit already on the ice (last change).
+
+        Args:
+            group: Unit group
+            opponent_unit: Index of the opponent's unit
+            available: Our units that are rested enough to go (all when None)
+        """
+        column = self.matrices[group][:, opponent_unit]
+        if available is None:
+            return int(np.argmax(column))
+        return max(available, key=lambda i: column[i])
+
+    def lead(self, group: str, available: Optional[Sequence[int]] = None,
+             opponent_available: Optional[Sequence[int]] = None) -> int:
+        """
+        Our best unit when we change first and expect to be countered.
+
+        Picks the unit whose worst case over the opponent's possible
+        counters is best (maximin).
+        """
+        matrix = self.matrices[group]
+        rows = list(available) if available is not None else list(range(matrix.shape[0]))
+        columns = list(opponent_available) if opponent_available is not None else list(range(matrix.shape[1]))
+        worst = matrix[np.ix_(rows, columns)].min(axis=1)
+        return rows[int(np.argmax(worst))]
+
+    def recommendations(self) -> Dict[str, Any]:
+        """
+        Full-game matchup recommendations for every unit group.
+
+        Returns:
+            Dictionary with forward_matchups and defense_matchups (our unit
+            key -> opponent unit key and expected goal differential per 60),
+            whether we have the last change and the total expected differential
+        """
+        result = {'last_change': self.is_home_team}
+        total = 0.0
+        for group, (key_prefix, _, _) in MATCHUP_GROUPS.items():
+            name = 'forward_matchups' if group == 'forward_lines' else 'defense_matchups'
+            result[name] = {}
+            for ours, theirs, differential in self.assignment(group):
+                result[name][f'{key_prefix}{ours + 1}'] = {
+                    'opponent': f'{key_prefix}{theirs + 1}',
+                    'expected_goal_differential': round(differential, 3)
+                }
+                total += differential
+        result['expected_goal_differential'] = round(total, 3)
+        return result
@@ -0,0 +1,279 @@
+from typing import Dict, List, Any, Optional, Tuple
+import math
+import numpy as np
+
+# Manpower states of a game (index into the rate tables)
+EVEN_STRENGTH = 0
+HOME_POWER_PLAY = 1
+AWAY_POWER_PLAY = 2
+STATES = ('even_strength', 'home_power_play', 'away_power_play')
+
+# Event columns of a game rate table, in the order the engine draws them
+EVENTS = [
+    ('shot', 'home'),
+    ('goal', 'home'),
+    ('penalty', 'home'),
+    ('shot', 'away'),
+    ('goal', 'away'),
+    ('penalty', 'away'),
+    ('face_off', None),
+]
+EVENT_INDEX = {event: i for i, event in enumerate(EVENTS)}
+
+DEFAULT_RATING = 75.0
+
+# Ice-time shares used when no coach strategy is available
+DEFAULT_ICE_TIME = {
+    'forward_even_strength': {'line1': 0.35, 'line2': 0.30, 'line3': 0.22, 'line4': 0.13},
+    'defense_even_strength': {'pair1': 0.42, 'pair2': 0.34, 'pair3': 0.24},
+    'power_play': {'unit1': 0.7, 'unit2': 0.3},
+    'penalty_kill': {'unit1': 0.6, 'unit2': 0.4}
+}
+
+# How strongly a coach's biases move the rates (bias 0.5 is neutral)
+COACH_OFFENSE_EFFECT = 0.2
+COACH_DEFENSE_EFFECT = 0.2
+COACH_PHYSICAL_EFFECT = 0.3
+
+
+_chemistry_calculator = None
+
+
+def performance_modifier(chemistry_value: float) -> float:
+    """Game-performance multiplier of a chemistry rating (ChemistryCalculator scale)."""
+    global _chemistry_calculator
+    if _chemistry_calculator is None:
+        # Lazy import: the chemistry module is only needed while building tables
+        from ..chemistry import ChemistryCalculator
+        _chemistry_calculator = ChemistryCalculator()
+    return _chemistry_calculator.get_chemistry_performance_modifier(chemistry_value)
+
+
+class TeamRateTable:
+    """
+    Per-situation strengths of one team, precomputed from its formation.
+
+    Each line, pair, power-play and penalty-kill unit rating is weighted by
+    the coach's ice-time distribution and paired with the game-performance
+    modifier of its chemistry. Coach biases become multipliers on the shots
+    a team generates, the shots it allows and the penalties it takes.
+
+    A table holds only floats, so it is cheap to pickle to worker processes
+    and is built once per team per sim day.
+    """
+
+    def __init__(self, team_rating: Optional[Dict[str, Any]] = None,
+                 chemistry: Optional[Dict[str, Any]] = None, coach_strategy: Any = None):
+        """
+        Args:
+            team_rating: TeamFormation team rating (overall, offense, ..., component_ratings)
+            chemistry: TeamFormation chemistry (forward_lines, defense_pairs, power_play, penalty_kill)
+            coach_strategy: CoachStrategy of the team (balanced defaults when None)
+        """
+        team_rating = team_rating or {}
+        chemistry = chemistry or {}
+        components = team_rating.get('component_ratings') or {}
+
+        self.overall = self._rating(team_rating.get('overall'))
+        self.offense = self._rating(team_rating.get('offense'))
+        self.defense = self._rating(team_rating.get('defense'))
+        special_teams = self._rating(team_rating.get('special_teams'))
+        self.goaltending = self._rating(team_rating.get('goaltending'))
+
+        ice_time = self._ice_time(coach_strategy)
+        attributes = getattr(coach_strategy, 'attributes', None) or {}
+
+        forward_shares = list(ice_time['forward_even_strength'].values())
+        defense_shares = list(ice_time['defense_even_strength'].values())
+        pp_shares = list(ice_time['power_play'].values())
+        pk_shares = list(ice_time['penalty_kill'].values())
+
+        self.even_strength_attack = self._weighted(components, 'line_', forward_shares, self.offense)
+        self.even_strength_defense = self._weighted(components, 'pair_', defense_shares, self.defense)
+        self.power_play = self._weighted(components, 'power_play_', pp_shares, special_teams)
+        self.penalty_kill = self._weighted(components, 'penalty_kill_', pk_shares, special_teams)
+
+        self.attack_chemistry = self._chemistry(chemistry.get('forward_lines'), forward_shares)
+        self.defense_chemistry = self._chemistry(chemistry.get('defense_pairs'), defense_shares)
+        self.power_play_chemistry = self._chemistry(chemistry.get('power_play'), pp_shares)
+        self.penalty_kill_chemistry = self._chemistry(chemistry.get('penalty_kill'), pk_shares)
+
+        self.offense_multiplier = 1.0 + (attributes.get('offensive_bias', 0.5) - 0.5) * COACH_OFFENSE_EFFECT
+        self.defense_multiplier = 1.0 - (attributes.get('defensive_bias', 0.5) - 0.5) * COACH_DEFENSE_EFFECT
+        self.penalty_multiplier = 1.0 + (attributes.get('physical_bias', 0.5) - 0.5) * COACH_PHYSICAL_EFFECT
+
+    @staticmethod
+    def _rating(value: Any) -> float:
+        if isinstance(value, (int, float)) and value > 0:
+            return float(value)
+        return DEFAULT_RATING
+
+    @staticmethod
+    def _ice_time(coach_strategy: Any) -> Dict[str, Dict[str, float]]:
+        if coach_strategy is not None:
+            try:
+                return coach_strategy.get_ice_time_distribution()
+            except Exception as e:
+                print(f"TeamRateTable: Could not read coach ice time, using defaults: {e}")
+        return DEFAULT_ICE_TIME
+
+    @staticmethod
+    def _weighted(components: Dict[str, Any], prefix: str, shares: List[float], fallback: float) -> float:
+        """Ice-time weighted rating of numbered components, missing ones rated at the fallback."""
+        total = 0.0
+        weight = 0.0
+        for i, share in enumerate(shares):
+            rating = components.get(f'{prefix}{i + 1}')
+            if not isinstance(rating, (int, float)) or rating <= 0:
+                rating = fallback
+            total += rating * share
+            weight += share
+        return total / weight if weight > 0 else fallback
+
+    @staticmethod
+    def _chemistry(entries: Any, shares: List[float]) -> float:
+        """Ice-time weighted performance modifier of chemistry entries (1.0 when unknown)."""
+        if not entries:
+            return 1.0
+        total = 0.0
+        weight = 0.0
+        for entry, share in zip(entries, shares):
+            value = entry.get('chemistry', 0) if isinstance(entry, dict) else 0
+            total += performance_modifier(value or 0) * share
+            weight += share
+        return total / weight if weight > 0 else 1.0
+
+    def signature(self) -> List[float]:
+        """Every value the rate tables are built from, for lineup hashing."""
+        return [
+            self.overall, self.offense, self.defense, self.goaltending,
+            self.even_strength_attack, self.even_strength_defense, self.power_play, self.penalty_kill,
+            self.attack_chemistry, self.defense_chemistry, self.power_play_chemistry, self.penalty_kill_chemistry,
+            self.offense_multiplier, self.defense_multiplier, self.penalty_multiplier
+        ]
+
+
+class GameRates:
+    """
+    Event rates of one game for every manpower state.
+
+    Built once per game from the two teams' rate tables. `rates[state]`
+    holds the per-second rate of each of the EVENTS, so a simulator only
+    has to look up the current state instead of recomputing ratings.
+    """
+
+    # League-average event rates per team per 60 minutes of game time
+    SHOTS_PER_60 = 30.0
+    PENALTIES_PER_60 = 3.5
+    # Face-offs from ordinary stoppages (goals and penalties add their own)
+    FACEOFFS_PER_60 = 45.0
+
+    # League-average shooting percentage
+    SHOOTING_PERCENTAGE = 0.095
+    MAX_GOAL_PROBABILITY = 0.5
+
+    # Rating points per e-fold change of a rate
+    RATING_SPREAD = 60.0
+
+    # Shot rate adjustments while a team is on the power play / shorthanded
+    POWER_PLAY_SHOT_MULTIPLIER = 1.8
+    SHORTHANDED_SHOT_MULTIPLIER = 0.45
+    POWER_PLAY_SHOOTING_MULTIPLIER = 1.3
+
+    # Upper bound on the share of a period a team spends on the power play
+    MAX_POWER_PLAY_SHARE = 0.3
+
+    def __init__(self, home: TeamRateTable, away: TeamRateTable):
+        self.teams = {'home': home, 'away': away}
+
+        rates = np.zeros((len(STATES), len(EVENTS)))
+        for state in range(len(STATES)):
+            for side, opponent in (('home', 'away'), ('away', 'home')):
+                shot_rate, goal_probability, penalty_rate = self._team_rates(
+                    self.teams[side], self.teams[opponent], self.manpower(state, side)
+                )
+                # A shot on goal either is saved ("shot") or goes in ("goal")
+                rates[state, EVENT_INDEX[('shot', side)]] = shot_rate * (1 - goal_probability)
+                rates[state, EVENT_INDEX[('goal', side)]] = shot_rate * goal_probability
+                rates[state, EVENT_INDEX[('penalty', side)]] = penalty_rate
+            rates[state, EVENT_INDEX[('face_off', None)]] = self.FACEOFFS_PER_60 / 3600
+
+        self.rates = rates
+        # Plain Python copies for the event loop, which is faster on floats than on NumPy scalars
+        self.rate_lists = [
+            [(event, side, float(rate)) for (event, side), rate in zip(EVENTS, rates[state])]
+            for state in range(len(STATES))
+        ]
+        self.totals = [sum(rate for _, _, rate in state_rates) for state_rates in self.rate_lists]
+
+    @staticmethod
+    def state(home_penalties: int, away_penalties: int) -> int:
+        """Manpower state for the number of active penalties of each team."""
+        if home_penalties > away_penalties:
+            return AWAY_POWER_PLAY
+        if away_penalties > home_penalties:
+            return HOME_POWER_PLAY
+        return EVEN_STRENGTH
+
+    @staticmethod
+    def manpower(state: int, side: str) -> int:
+        """+1 when the side is on the power play, -1 when shorthanded, 0 at even strength."""
+        if state == EVEN_STRENGTH:
+            return 0
+        on_power_play = (state == HOME_POWER_PLAY) == (side == 'home')
+        return 1 if on_power_play else -1
+
+    def _factor(self, attack: float, defend: float) -> float:
+        return math.exp((attack - defend) / self.RATING_SPREAD)
+
+    def _team_rates(self, team: TeamRateTable, opponent: TeamRateTable, manpower: int) -> Tuple[float, float, float]:
+        """
+        Per-second shot rate, goal probability per shot and per-second penalty rate of a team.
+        """
+        shot_rate = (self.SHOTS_PER_60 / 3600
+                     * self._factor(team.even_strength_attack, opponent.even_strength_defense)
+                     * team.offense_multiplier * opponent.defense_multiplier)
+
+        if manpower > 0:
+            shot_rate *= (self.POWER_PLAY_SHOT_MULTIPLIER
+                          * self._factor(team.power_play, opponent.penalty_kill)
+                          * team.power_play_chemistry / opponent.penalty_kill_chemistry)
+        elif manpower < 0:
+            shot_rate *= self.SHORTHANDED_SHOT_MULTIPLIER
+        else:
+            shot_rate *= team.attack_chemistry / opponent.defense_chemistry
+
+        goal_probability = self.SHOOTING_PERCENTAGE * self._factor(team.offense, opponent.goaltending)
+        if manpower > 0:
+            goal_probability *= self.POWER_PLAY_SHOOTING_MULTIPLIER
+        goal_probability = min(self.MAX_GOAL_PROBABILITY, goal_probability)
+
+        # Better teams take slightly fewer penalties
+        penalty_rate = (self.PENALTIES_PER_60 / 3600 / self._factor(team.overall, opponent.overall) ** 0.5
+                        * team.penalty_multiplier)
+
+        return shot_rate, goal_probability, penalty_rate
+
+    def expected_counts(self, period_length: float, penalty_length: float) -> np.ndarray:
+        """
+        Expected number of each event in one period.
+
+        Mixes the manpower states by the expected share of the period each
+        team spends on the power play, so that simulators which draw whole
+        period totals at once see the same scoring environment as the
+        event-driven engine.
+
+        Args:
+            period_length: Period length in seconds
+            penalty_length: Minor penalty length in seconds
+
+        Returns:
+            Array of expected counts, one per entry of EVENTS
+        """
+        even = self.rates[EVEN_STRENGTH]
+        home_pp = min(self.MAX_POWER_PLAY_SHARE, even[EVENT_INDEX[('penalty', 'away')]] * penalty_length)
+        away_pp = min(self.MAX_POWER_PLAY_SHARE, even[EVENT_INDEX[('penalty', 'home')]] * penalty_length)
+        mixed = ((1 - home_pp - away_pp) * even
+                 + home_pp * self.rates[HOME_POWER_PLAY]
+                 + away_pp * self.rates[AWAY_POWER_PLAY])
+        return mixed * period_length
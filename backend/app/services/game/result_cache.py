@@ -0,0 +1,83 @@
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+
+# Maximum number of simulated games kept in memory
+DEFAULT_RESULT_CACHE_SIZE = int(os.environ.get("SIM_RESULT_CACHE_SIZE", 256))
+
+
+def lineup_hash(*profiles: Any) -> str:
+    """
+    Hash the lineups a simulation was run with.
+
+    Args:
+        profiles: TeamProfile objects, or plain team identifiers for modes
+            that do not depend on lineups
+
+    Returns:
+        Hex digest identifying the lineups
+    """
+    payload = [profile.signature() if hasattr(profile, 'signature') else profile for profile in profiles]
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class SimulationResultCache:
+    """
+    LRU cache of simulation results keyed by (game id, mode, seed, lineup hash).
+
+    Results are stored as their JSON serialization, so a cache hit returns an
+    independent copy that serializes to exactly the same bytes as the
+    original result.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_RESULT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return json.loads(payload)
+
+    def put(self, key: Tuple[Any, ...], result: Dict[str, Any]) -> None:
+        """Store a result, evicting the least recently used one if full."""
+        payload = json.dumps(result)
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_game(self, game_id: Any) -> int:
+        """Drop every cached result of a game. Returns the number removed."""
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == game_id]
+            for key in stale:
+                del self._entries[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            return {'size': len(self._entries), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
+# Process-wide cache instance
+simulation_cache = SimulationResultCache()
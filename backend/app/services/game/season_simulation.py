@@ -0,0 +1,326 @@
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+import numpy as np
+
+# League-average goals per team per game
+LEAGUE_GOALS_PER_GAME = 3.05
+
+# Expected-goals multiplier for the home team
+HOME_ADVANTAGE = 1.05
+
+# Rating points per e-fold change of a rate (same scale as the play-by-play GameRates)
+RATING_SPREAD = 60.0
+
+# Points for a win, an overtime/shootout loss and a regulation loss
+WIN_POINTS = 2
+OT_LOSS_POINTS = 1
+
+# Seasons simulated per vectorized batch (bounds memory use)
+SEASON_BATCH_SIZE = 2000
+
+# Default number of worker processes for large season runs, and the most
+# a run may use
+DEFAULT_SEASON_WORKERS = min(8, os.cpu_count() or 1)
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# Rating vector columns
+RATING_FIELDS = ('offense', 'defense', 'goaltending')
+DEFAULT_RATING = 75.0
+
+
+def rating_matrix(teams: Sequence[Any], ratings: Dict[Any, Any]) -> np.ndarray:
+    """
+    Build the (teams x 3) rating matrix used by the simulator.
+
+    Args:
+        teams: Team keys in simulator order
+        ratings: Mapping of team key to either a rating dictionary (offense,
+            defense, goaltending, or overall) or a sequence of three values
+
+    Returns:
+        float64 array of [offense, defense, goaltending] per team
+    """
+    matrix = np.full((len(teams), len(RATING_FIELDS)), DEFAULT_RATING, dtype=np.float64)
+    for i, team in enumerate(teams):
+        rating = ratings.get(team)
+        if rating is None:
+            continue
+        if isinstance(rating, dict):
+            overall = rating.get('overall', DEFAULT_RATING) or DEFAULT_RATING
+            matrix[i] = [float(rating.get(field) or overall) for field in RATING_FIELDS]
+        elif isinstance(rating, (int, float)):
+            matrix[i] = float(rating)
+        else:
+            matrix[i] = [float(value) for value in list(rating)[:len(RATING_FIELDS)]]
+    return matrix
+
+
+def expected_goals(home_idx: np.ndarray, away_idx: np.ndarray, ratings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Expected goals for each scheduled game.
+
+    A team's scoring rate grows with its offense against the opponent's
+    defense and goaltending, as in the play-by-play engine.
+
+    Returns:
+        Tuple of (home expected goals, away expected goals)
+    """
+    offense, defense, goaltending = ratings[:, 0], ratings[:, 1], ratings[:, 2]
+
+    def rate(attack, defend):
+        return LEAGUE_GOALS_PER_GAME * np.exp(
+            (2 * offense[attack] - defense[defend] - goaltending[defend]) / RATING_SPREAD
+        )
+
+    return rate(home_idx, away_idx) * HOME_ADVANTAGE, rate(away_idx, home_idx)
+
+
+def simulate_seasons_batch(home_idx: np.ndarray, away_idx: np.ndarray, home_xg: np.ndarray,
+                           away_xg: np.ndarray, n_teams: int, n_seasons: int,
+                           seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simulate `n_seasons` copies of the schedule at once.
+
+    Goals are Poisson draws of shape (seasons x games). Tied games go to
+    overtime, won by the home team with probability home_xg / (home_xg + away_xg).
+
+    Returns:
+        Tuple of (points, regulation+OT wins), each of shape (seasons x teams)
+    """
+    rng = np.random.default_rng(seed)
+    n_games = len(home_idx)
+
+    home_goals = rng.poisson(home_xg, size=(n_seasons, n_games))
+    away_goals = rng.poisson(away_xg, size=(n_seasons, n_games))
+
+    tied = home_goals == away_goals
+    overtime_home_win = rng.random((n_seasons, n_games)) < (home_xg / (home_xg + away_xg))
+    home_win = (home_goals > away_goals) | (tied & overtime_home_win)
+
+    home_points = np.where(home_win, WIN_POINTS, np.where(tied, OT_LOSS_POINTS, 0))
+    away_points = np.where(home_win, np.where(tied, OT_LOSS_POINTS, 0), WIN_POINTS)
+
+    # Scatter per-game results into per-season team totals with one bincount each
+    offsets = (np.arange(n_seasons) * n_teams)[:, None]
+    home_slots = (offsets + home_idx[None, :]).ravel()
+    away_slots = (offsets + away_idx[None, :]).ravel()
+    size = n_seasons * n_teams
+
+    points = (np.bincount(home_slots, weights=home_points.ravel(), minlength=size) +
+              np.bincount(away_slots, weights=away_points.ravel(), minlength=size))
+    wins = (np.bincount(home_slots, weights=home_win.ravel(), minlength=size) +
+            np.bincount(away_slots, weights=(~home_win).ravel(), minlength=size))
+
+    return points.reshape(n_seasons, n_teams).astype(np.int16), wins.reshape(n_seasons, n_teams).astype(np.int16)
+
+
+def _simulate_chunk(args) -> Tuple[np.ndarray, np.ndarray]:
+    """Process-pool worker: simulate a chunk of seasons in batches."""
+    home_idx, away_idx, home_xg, away_xg, n_teams, n_seasons, seed, batch_size = args
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    seeds = seed.spawn(max(1, -(-n_seasons // batch_size)))
+
+    points, wins = [], []
+    for i, start in enumerate(range(0, n_seasons, batch_size)):
+        count = min(batch_size, n_seasons - start)
+        batch_points, batch_wins = simulate_seasons_batch(
+            home_idx, away_idx, home_xg, away_xg, n_teams, count, seed=seeds[i]
+        )
+        points.append(batch_points)
+        wins.append(batch_wins)
+
+    return np.concatenate(points), np.concatenate(wins)
+
+
+def final_ranks(points: np.ndarray, wins: np.ndarray, groups: np.ndarray, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Rank teams within their group for every simulated season.
+
+    Ties on points are broken by wins, then at random.
+
+    Args:
+        points: (seasons x teams) points
+        wins: (seasons x teams) wins
+        groups: Group code per team (conference, or all zeros for the league)
+
+    Returns:
+        (seasons x teams) ranks starting at 1
+    """
+    rng = np.random.default_rng(seed)
+    score = points * 1000.0 + wins + rng.random(points.shape) * 0.5
+    ranks = np.zeros(points.shape, dtype=np.int16)
+
+    for group in np.unique(groups):
+        members = np.flatnonzero(groups == group)
+        order = np.argsort(-score[:, members], axis=1)
+        group_ranks = np.empty_like(order)
+        np.put_along_axis(group_ranks, order, np.arange(1, len(members) + 1)[None, :], axis=1)
+        ranks[:, members] = group_ranks
+
+    return ranks
+
+
+class SeasonSimulator:
+    """
+    Vectorized Monte Carlo simulator for a full season schedule.
+
+    Every game of every simulated season is drawn with NumPy in one pass per
+    batch of seasons; standings are accumulated with bincount. Large runs can
+    be split across a process pool, each worker using an independent seed
+    stream, so results are reproducible for a given seed and worker count.
+    """
+
+    def __init__(self, schedule: Sequence[Any], ratings: Dict[Any, Any],
+                 conferences: Optional[Dict[Any, Any]] = None, playoff_spots: int = 8):
+        """
+        Args:
+            schedule: Games as (home, away) pairs or dictionaries with
+                'home_team'/'away_team' (or 'home_team_id'/'away_team_id')
+            ratings: Mapping of team key to rating dictionary or vector
+            conferences: Optional mapping of team key to conference; playoff
+                spots are then awarded per conference
+            playoff_spots: Playoff spots per conference (or league-wide)
+        """
+        pairs = [self._game_teams(game) for game in schedule]
+        pairs = [pair for pair in pairs if pair[0] is not None and pair[1] is not None]
+        if not pairs:
+            raise ValueError("Schedule contains no games")
+
+        teams = []
+        index = {}
+        for home, away in pairs:
+            for team in (home, away):
+                if team not in index:
+                    index[team] = len(teams)
+                    teams.append(team)
+
+        self.teams = teams
+        self.n_teams = len(teams)
+        self.n_games = len(pairs)
+        self.home_idx = np.array([index[home] for home, _ in pairs], dtype=np.intp)
+        self.away_idx = np.array([index[away] for _, away in pairs], dtype=np.intp)
+
+        self.ratings = rating_matrix(teams, ratings or {})
+        self.home_xg, self.away_xg = expected_goals(self.home_idx, self.away_idx, self.ratings)
+
+        conferences = conferences or {}
+        conference_codes = {}
+        self.groups = np.array(
+            [conference_codes.setdefault(conferences.get(team), len(conference_codes)) for team in teams],
+            dtype=np.intp
+        )
+        self.group_names = {code: name for name, code in conference_codes.items()}
+        self.playoff_spots = playoff_spots
+
+    @staticmethod
+    def _game_teams(game: Any) -> Tuple[Any, Any]:
+        if isinstance(game, dict):
+            home = game.get('home_team') or game.get('home_team_id')
+            away = game.get('away_team') or game.get('away_team_id')
+            return home, away
+        home, away = game[0], game[1]
+        return home, away
+
+    def simulate(self, n_seasons: int = 10000, seed: Optional[int] = None, workers: int = 1,
+                 batch_size: int = SEASON_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Simulate the season `n_seasons` times.
+
+        Args:
+            n_seasons: Number of seasons to simulate
+            seed: Seed for reproducible results
+            workers: Worker processes (1 runs in this process; at most
+                DEFAULT_SEASON_WORKERS are used)
+            batch_size: Seasons drawn per vectorized batch
+
+        Returns:
+            Dictionary with per-team standings distributions
+        """
+        n_seasons = max(1, int(n_seasons))
+        workers = max(1, min(int(workers or 1), n_seasons, DEFAULT_SEASON_WORKERS))
+        chunk_sizes = [n_seasons // workers + (1 if i < n_seasons % workers else 0) for i in range(workers)]
+        chunk_seeds = np.random.SeedSequence(seed).spawn(workers + 1)
+
+        jobs = [
+            (self.home_idx, self.away_idx, self.home_xg, self.away_xg, self.n_teams, size, chunk_seeds[i], batch_size)
+            for i, size in enumerate(chunk_sizes) if size > 0
+        ]
+
+        results = None
+        if len(jobs) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=len(jobs)) as executor:
+                    results = list(executor.map(_simulate_chunk, jobs))
+            except Exception as pool_error:
+                print(f"SeasonSimulator: Process pool failed, simulating serially: {pool_error}")
+                results = None
+        if results is None:
+            results = [_simulate_chunk(job) for job in jobs]
+
+        points = np.concatenate([r[0] for r in results])
+        wins = np.concatenate([r[1] for r in results])
+        ranks = final_ranks(points, wins, self.groups, seed=chunk_seeds[-1])
+
+        return self.summarize(points, ranks)
+
+    def summarize(self, points: np.ndarray, ranks: np.ndarray) -> Dict[str, Any]:
+        """
+        Summarize simulated standings per team.
+
+        Returns:
+            Dictionary with per-team mean/std points, percentiles, playoff
+            probability and the distribution of final ranks
+        """
+        n_seasons = points.shape[0]
+        percentiles = np.percentile(points, PERCENTILES, axis=0)
+        made_playoffs = (ranks <= self.playoff_spots).mean(axis=0)
+        max_rank = int(ranks.max())
+        rank_counts = np.stack([(ranks == r).sum(axis=0) for r in range(1, max_rank + 1)], axis=1)
+
+        standings = []
+        for i, team in enumerate(self.teams):
+            standings.append({
+                'team': team,
+                'conference': self.group_names.get(self.groups[i]),
+                'rating': dict(zip(RATING_FIELDS, self.ratings[i].round(1).tolist())),
+                'mean_points': round(float(points[:, i].mean()), 2),
+                'std_points': round(float(points[:, i].std()), 2),
+                'points_percentiles': {str(p): float(v) for p, v in zip(PERCENTILES, percentiles[:, i])},
+                'playoff_probability': round(float(made_playoffs[i]), 4),
+                'rank_distribution': (rank_counts[i] / n_seasons).round(4).tolist()
+            })
+
+        standings.sort(key=lambda s: s['mean_points'], reverse=True)
+        return {
+            'seasons': n_seasons,
+            'games': self.n_games,
+            'teams': self.n_teams,
+            'playoff_spots': self.playoff_spots,
+            'standings': standings
+        }
+
+
+def simulate_season(schedule: Sequence[Any], ratings: Dict[Any, Any], n_seasons: int = 10000,
+                    seed: Optional[int] = None, workers: int = 1,
+                    conferences: Optional[Dict[Any, Any]] = None, playoff_spots: int = 8) -> Dict[str, Any]:
+    """
+    Run the Monte Carlo season simulator.
+
+    Args:
+        schedule: Games as (home, away) pairs or game dictionaries
+        ratings: Mapping of team key to rating dictionary or vector
+        n_seasons: Number of seasons to simulate
+        seed: Seed for reproducible results
+        workers: Worker processes (defaults to 1)
+        conferences: Optional mapping of team key to conference
+        playoff_spots: Playoff spots per conference (or league-wide)
+
+    Returns:
+        Standings distribution dictionary (see SeasonSimulator.summarize)
+    """
+    simulator = SeasonSimulator(schedule, ratings, conferences=conferences, playoff_spots=playoff_spots)
+    return simulator.simulate(n_seasons=n_seasons, seed=seed, workers=workers)
+
@@ -0,0 +1,297 @@
+from typing import Dict, List, Any, Optional, Tuple
+import bisect
+import numpy as np
+from .rate_tables import DEFAULT_ICE_TIME
+
+# Score situations from a team's point of view
+SITUATIONS = ('tied', 'leading', 'trailing')
+
+# Unit groups a shift can belong to, with the minutes keys of their units
+# (the keys TeamFormation.simulate_game_effects expects)
+FORWARD_LINES = 'forward_lines'
+DEFENSE_PAIRS = 'defense_pairs'
+POWER_PLAY = 'power_play'
+PENALTY_KILL = 'penalty_kill'
+
+MINUTES_KEYS = {
+    FORWARD_LINES: ['line1', 'line2', 'line3', 'line4'],
+    DEFENSE_PAIRS: ['pair1', 'pair2', 'pair3'],
+    POWER_PLAY: ['pp1', 'pp2'],
+    PENALTY_KILL: ['pk1', 'pk2'],
+}
+GROUPS = list(MINUTES_KEYS)
+
+# Flat list of all minutes keys, and where each group's keys start in it
+MINUTES = [key for group in GROUPS for key in MINUTES_KEYS[group]]
+KEY_OFFSETS = {}
+for _group in GROUPS:
+    KEY_OFFSETS[_group] = MINUTES.index(MINUTES_KEYS[_group][0])
+
+# Average shift length in seconds of a regulation (20 minute) period
+SHIFT_LENGTHS = {FORWARD_LINES: 45.0, DEFENSE_PAIRS: 55.0, POWER_PLAY: 60.0, PENALTY_KILL: 50.0}
+# Gamma shape of the shift length distribution (higher is more regular)
+SHIFT_LENGTH_SHAPE = 4.0
+MIN_SHIFT_LENGTH = 10.0
+
+# Random numbers drawn per refill of a scheduler's pools
+RANDOM_POOL_SIZE = 1024
+
+# Shifts laid out per chunk; a timeline is extended one chunk at a time as
+# the game clock reaches its end, so a re-plan never discards much work
+CHUNK_SHIFTS = 8
+
+
+def _normalized(weights: List[float]) -> List[float]:
+    total = sum(weights)
+    if total <= 0:
+        return [1.0 / len(weights)] * len(weights)
+    return [w / total for w in weights]
+
+
+def deployment_weights(coach_strategy: Any = None) -> Dict[str, Any]:
+    """
+    Precompute the probability of each unit taking the next shift.
+
+    Even-strength shares come from the coach's ice time distribution and
+    situational adjustments; special teams use the coach's unit shares.
+
+    Args:
+        coach_strategy: CoachStrategy (league-default shares when None)
+
+    Returns:
+        Dictionary with, for each of SITUATIONS, the probabilities of the
+        forward lines and defense pairs, plus the power-play and
+        penalty-kill unit probabilities
+    """
+    distribution = DEFAULT_ICE_TIME
+    if coach_strategy is not None:
+        try:
+            distribution = coach_strategy.get_ice_time_distribution()
+        except Exception as e:
+            print(f"ShiftScheduler: Could not read coach ice time, using defaults: {e}")
+
+    deployment = {}
+    for situation in SITUATIONS:
+        adjustment = {}
+        if coach_strategy is not None:
+            try:
+                adjustment = coach_strategy.get_situational_adjustment(situation)
+            except Exception as e:
+                print(f"ShiftScheduler: Could not read situational adjustment for {situation}: {e}")
+
+        deployment[situation] = {
+            FORWARD_LINES: _normalized([
+                share * adjustment.get(key, 1.0) for key, share in distribution['forward_even_strength'].items()
+            ]),
+            DEFENSE_PAIRS: _normalized([
+                share * adjustment.get(key, 1.0) for key, share in distribution['defense_even_strength'].items()
+            ])
+        }
+
+    deployment[POWER_PLAY] = _normalized(list(distribution['power_play'].values()))
+    deployment[PENALTY_KILL] = _normalized(list(distribution['penalty_kill'].values()))
+    return deployment
+
+
+class ShiftScheduler:
+    """
+    Shift timeline of one team.
+
+    Instead of deciding every second who is on the ice, the scheduler plans
+    chunks of CHUNK_SHIFTS shifts at once. Shift lengths (gamma distributed)
+    and unit choices (inverse CDF of the coach's deployment probabilities)
+    come from pools of variates drawn in bulk with NumPy. A plan runs until
+    the end of the period and is laid out chunk by chunk as the clock
+    reaches it; when the score situation or manpower changes, the rest of
+    the plan is dropped and a new one starts from that moment. Minutes per
+    unit are aggregated with a single bincount at the end.
+
+    Forwards and defensemen change on separate timelines at even strength.
+    On special teams, a single timeline of PP/PK units covers both.
+    """
+
+    TIMELINES = ('forwards', 'defense')
+
+    def __init__(self, deployment: Dict[str, Any], rng: np.random.Generator, time_scale: float = 1.0):
+        """
+        Args:
+            deployment: Unit probabilities from deployment_weights()
+            rng: NumPy random generator
+            time_scale: Period length relative to a 20 minute period
+        """
+        self.deployment = deployment
+        self.rng = rng
+        self.time_scale = time_scale
+
+        # Cumulative unit probabilities per (situation or special teams, group)
+        self._cumulative = {}
+        for situation in SITUATIONS:
+            for group in (FORWARD_LINES, DEFENSE_PAIRS):
+                self._cumulative[(situation, group)] = self._cumulative_probabilities(deployment[situation][group])
+        for group in (POWER_PLAY, PENALTY_KILL):
+            self._cumulative[(group, group)] = self._cumulative_probabilities(deployment[group])
+
+        # Pre-drawn unit-mean gamma variates and uniforms, consumed in order by _chunk
+        self._pools = {'gamma': [], 'uniform': []}
+        self._positions = {'gamma': 0, 'uniform': 0}
+
+        # Index into MINUTES keys and length (seconds) of every shift played
+        self._played_units = []
+        self._played_seconds = []
+        # Chunk currently being played per timeline
+        self._current = {timeline: None for timeline in self.TIMELINES}
+
+    def plan(self, start: float, end: float, situation: str = 'tied', manpower: int = 0) -> None:
+        """
+        Replace the remaining schedule from `start` with a new chunk ending at `end`.
+
+        Args:
+            start: Game clock (seconds) from which the new plan applies
+            end: End of the chunk, normally the end of the period
+            situation: Score situation of the team ('tied', 'leading', 'trailing')
+            manpower: +1 on the power play, -1 shorthanded, 0 at even strength
+        """
+        self.finish(start)
+        if manpower == 0:
+            if situation not in SITUATIONS:
+                situation = 'tied'
+            self._current['forwards'] = self._chunk(FORWARD_LINES, situation, start, end)
+            self._current['defense'] = self._chunk(DEFENSE_PAIRS, situation, start, end)
+        else:
+            group = POWER_PLAY if manpower > 0 else PENALTY_KILL
+            self._current['forwards'] = self._chunk(group, group, start, end)
+
+    @staticmethod
+    def _cumulative_probabilities(probabilities: List[float]) -> List[float]:
+        cumulative = np.cumsum(probabilities, dtype=np.float64).tolist()
+        # Uniforms are < 1, so pinning the last bound keeps every draw in range
+        cumulative[-1] = 1.0
+        return cumulative
+
+    def _next(self, kind: str) -> float:
+        """Take the next pre-drawn variate of a kind, refilling its pool in bulk when empty."""
+        position = self._positions[kind]
+        pool = self._pools[kind]
+        if position >= len(pool):
+            if kind == 'gamma':
+                fresh = self.rng.standard_gamma(SHIFT_LENGTH_SHAPE, RANDOM_POOL_SIZE) / SHIFT_LENGTH_SHAPE
+            else:
+                fresh = self.rng.random(RANDOM_POOL_SIZE)
+            pool = self._pools[kind] = fresh.tolist()
+            position = 0
+        self._positions[kind] = position + 1
+        return pool[position]
+
+    def _chunk(self, group: str, deployment_key: str, start: float, end: float) -> Dict[str, Any]:
+        """Start the plan of one timeline between start and end."""
+        chunk = {
+            'group': group,
+            'cumulative': self._cumulative[(deployment_key, group)],
+            'offset': KEY_OFFSETS[group],
+            'mean': SHIFT_LENGTHS[group] * self.time_scale,
+            'starts': [],
+            'units': [],
+            # End of the last shift laid out so far
+            'clock': start,
+            'end': end
+        }
+        self._extend(chunk, start)
+        return chunk
+
+    def _extend(self, chunk: Dict[str, Any], time: float) -> None:
+        """Lay out shifts in chunks until the timeline covers `time` (or its end)."""
+        minimum = MIN_SHIFT_LENGTH * self.time_scale
+        cumulative = chunk['cumulative']
+        offset = chunk['offset']
+        mean = chunk['mean']
+        end = chunk['end']
+        starts = chunk['starts']
+        units = chunk['units']
+        clock = chunk['clock']
+
+        while clock <= time and clock < end:
+            for _ in range(CHUNK_SHIFTS):
+                starts.append(clock)
+                units.append(offset + bisect.bisect_right(cumulative, self._next('uniform')))
+                clock += max(self._next('gamma') * mean, minimum)
+                if clock >= end:
+                    break
+
+        chunk['clock'] = clock
+
+    def finish(self, time: float) -> None:
+        """Stop the current plans at `time` and record the shifts played so far."""
+        for timeline in self.TIMELINES:
+            chunk = self._current[timeline]
+            if chunk is None:
+                continue
+            self._extend(chunk, time)
+            starts = chunk['starts']
+            count = bisect.bisect_left(starts, time)
+            if count:
+                self._played_units.extend(chunk['units'][:count])
+                self._played_seconds.extend(b - a for a, b in zip(starts, starts[1:count]))
+                self._played_seconds.append(min(time, chunk['clock']) - starts[count - 1])
+            self._current[timeline] = None
+
+    def _unit_at(self, timeline: str, time: float) -> Optional[Tuple[str, int]]:
+        chunk = self._current[timeline]
+        if chunk is None:
+            return None
+        if time >= chunk['clock']:
+            self._extend(chunk, time)
+        index = max(0, bisect.bisect_right(chunk['starts'], time) - 1)
+        return chunk['group'], chunk['units'][index] - chunk['offset']
+
+    def change(self, timeline: str, time: float, group: str, unit: int) -> None:
+        """
+        Send a different unit out at a stoppage, for the rest of the current shift.
+
+        Args:
+            timeline: 'forwards' or 'defense'
+            time: Game clock of the stoppage
+            group: Unit group the new unit belongs to (ignored if the
+                timeline is currently playing another group)
+            unit: Index of the unit within its group
+        """
+        chunk = self._current[timeline]
+        if chunk is None or chunk['group'] != group:
+            return
+        if time >= chunk['clock']:
+            self._extend(chunk, time)
+
+        starts = chunk['starts']
+        units = chunk['units']
+        index = max(0, bisect.bisect_right(starts, time) - 1)
+        unit += chunk['offset']
+        if units[index] == unit:
+            return
+        if starts[index] == time:
+            units[index] = unit
+        else:
+            starts.insert(index + 1, time)
+            units.insert(index + 1, unit)
+
+    def on_ice(self, time: float) -> Tuple[Optional[Tuple[str, int]], Optional[Tuple[str, int]]]:
+        """
+        Units on the ice at a time of the current chunk.
+
+        Returns:
+            Tuple of (forward unit, defense unit), each a (group, unit index)
+            pair or None; the defense unit is None on special teams
+        """
+        return self._unit_at('forwards', time), self._unit_at('defense', time)
+
+    def minutes(self) -> Dict[str, float]:
+        """
+        Minutes played by each unit over the recorded shifts.
+
+        Returns:
+            Dictionary keyed line1..line4, pair1..pair3, pp1, pp2, pk1, pk2 with
+            minutes scaled to regulation-length periods
+        """
+        seconds = np.bincount(np.asarray(self._played_units, dtype=np.int64),
+                              weights=np.asarray(self._played_seconds, dtype=np.float64),
+                              minlength=len(MINUTES))
+        minutes = seconds / 60.0 / self.time_scale
+        return {key: round(float(value), 2) for key, value in zip(MINUTES, minutes)}
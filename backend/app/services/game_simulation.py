@@ -1,13 +1,44 @@
-from typing import Dict, List, Any, Optional
-from flask import Blueprint, jsonify, request
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 from ..extensions import db
+from .game.result_cache import simulation_cache, lineup_hash
+from .game.rate_tables import EVENT_INDEX, GameRates
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
 import random
 from datetime import datetime
 import json
+import traceback
+import numpy as np
 
 # Create a blueprint for game endpoints
 game_bp = Blueprint('game', __name__)
 
+# Whether the games table has the event_log column, per database URL
+_event_log_columns = {}
+
+
+def event_log_supported() -> bool:
+    """
+    Whether the games table has the event_log column.
+    
+    Databases created before the event log was added need
+    ALTER TABLE games ADD COLUMN event_log bytea (see README); until then
+    event logs are neither read nor written.
+    """
+    url = str(db.engine.url)
+    supported = _event_log_columns.get(url)
+    if supported is None:
+        try:
+            columns = db.inspect(db.engine).get_columns(Game.__tablename__)
+            supported = any(column['name'] == 'event_log' for column in columns)
+        except Exception as e:
+            print(f"GameSimulation: Error checking for the event_log column: {e}")
+            supported = False
+        _event_log_columns[url] = supported
+    return supported
+
 # Game Model
 class Game(db.Model):
     """Game model for hockey games"""
@@ -36,6 +67,10 @@ class Game(db.Model):
     home_stats = db.Column(db.Text)  # JSON string with home team stats
     away_stats = db.Column(db.Text)  # JSON string with away team stats
     
+    # Play-by-play event log (compact binary format, see game/event_log.py);
+    # deferred so game queries work on databases without the column
+    event_log = db.deferred(db.Column(db.LargeBinary))
+    
     # Other game details
     arena = db.Column(db.String(100))
     attendance = db.Column(db.Integer)
@@ -53,26 +88,60 @@ class Game(db.Model):
     def __repr__(self):
         return f'<Game {self.id}: {self.away_team.abbreviation} @ {self.home_team.abbreviation}>'
     
-    def to_dict(self):
-        """Convert Game object to dictionary"""
+    def _parsed_json(self, field: str) -> Dict[str, Any]:
+        """Parse a JSON text column once per instance (and again only if it changes)."""
+        raw = getattr(self, field)
+        cache = self.__dict__.setdefault('_json_cache', {})
+        cached = cache.get(field)
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        
+        value = {}
+        if raw:
+            try:
+                value = json.loads(raw)
+            except json.JSONDecodeError:
+                # If JSON is invalid, use empty dict
+                value = {}
+        cache[field] = (raw, value)
+        return value
+    
+    @property
+    def period_data_dict(self) -> Dict[str, Any]:
+        return self._parsed_json('period_data')
+    
+    @property
+    def home_stats_dict(self) -> Dict[str, Any]:
+        return self._parsed_json('home_stats')
+    
+    @property
+    def away_stats_dict(self) -> Dict[str, Any]:
+        return self._parsed_json('away_stats')
+    
+    def get_event_log(self):
+        """Return a lazily decoded EventLog for this game, or None if it has none."""
+        if not event_log_supported() or not self.event_log:
+            return None
+        from .game.event_log import EventLog
+        return EventLog(self.event_log)
+    
+    def get_events(self, period: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Decode the play-by-play events (optionally a single period)."""
+        log = self.get_event_log()
+        return log.events(period) if log else []
+    
+    def to_dict(self, include_details: bool = False, include_events: bool = False):
+        """
+        Convert Game object to dictionary.
         
-        # Parse JSON strings to dictionaries
-        period_data_dict = {}
-        home_stats_dict = {}
-        away_stats_dict = {}
+        The JSON columns and the event log are only loaded and decoded when
+        asked for, so listing games never pays the parse cost.
         
-        try:
-            if self.period_data:
-                period_data_dict = json.loads(self.period_data)
-            if self.home_stats:
-                home_stats_dict = json.loads(self.home_stats)
-            if self.away_stats:
-                away_stats_dict = json.loads(self.away_stats)
-        except json.JSONDecodeError:
-            # If JSON is invalid, use empty dict
-            pass
-            
-        return {
+        Args:
+            include_details: Include period data and team stats
+            include_events: Include the decoded play-by-play events
+        """
+        result = {
             'id': self.id,
             'home_team_id': self.home_team_id,
             'away_team_id': self.away_team_id,
@@ -84,14 +153,22 @@ class Game(db.Model):
             'end_time': self.end_time.isoformat() if self.end_time else None,
             'home_score': self.home_score,
             'away_score': self.away_score,
-            'period_data': period_data_dict,
-            'home_stats': home_stats_dict,
-            'away_stats': away_stats_dict,
             'arena': self.arena,
             'attendance': self.attendance,
             'season_id': self.season_id,
             'season_type': self.season_type
         }
+        
+        if include_details:
+            result['has_event_log'] = self.get_event_log() is not None
+            result['period_data'] = self.period_data_dict
+            result['home_stats'] = self.home_stats_dict
+            result['away_stats'] = self.away_stats_dict
+        
+        if include_events:
+            result['events'] = self.get_events()
+        
+        return result
     
     def set_period_data(self, period_data):
         """Set period data as JSON string"""
@@ -104,6 +181,13 @@ class Game(db.Model):
     def set_away_stats(self, stats):
         """Set away team stats as JSON string"""
         self.away_stats = json.dumps(stats)
+    
+    def set_events(self, events):
+        """Store play-by-play events in the binary event log (skipped without the column)"""
+        if not event_log_supported():
+            return
+        from .game.event_log import encode_events
+        self.event_log = encode_events(events)
 
 class GameSimulation:
     """
@@ -187,7 +271,8 @@ class GameSimulation:
         return None
     
     @staticmethod
-    def simulate_game(game_id: int, simulation_mode: str = 'fast_simulation') -> Dict[str, Any]:
+    def simulate_game(game_id: int, simulation_mode: str = 'fast_simulation', seed: Optional[int] = None,
+                      use_cache: bool = True) -> Dict[str, Any]:
         """
         Simulate a hockey game with different simulation modes.
         
@@ -199,6 +284,9 @@ class GameSimulation:
                 'fast_play_by_play': Fast play-by-play simulation with 3 min periods
                 'simulation': Simple simulation with UI updates (30 sec per period)
                 'fast_simulation': Instant simulation with no visual feedback
+            seed: RNG seed; a new one is drawn when omitted. The seed is
+                returned with the result so the game can be replayed.
+            use_cache: Serve and store results in the simulation cache
             
         Returns:
             Dictionary with game result
@@ -207,300 +295,281 @@ class GameSimulation:
         if not game:
             return {"error": f"Game with ID {game_id} not found"}
         
+        if seed is None:
+            seed = new_seed()
+        
+        # Every mode draws from the teams' rate tables, so results depend on the lineups
+        home_profile = GameSimulation.get_team_profile(game.get("home_team"))
+        away_profile = GameSimulation.get_team_profile(game.get("away_team"))
+        lineup = lineup_hash(home_profile, away_profile)
+        
+        cache_key = (game_id, simulation_mode, seed, lineup)
+        if use_cache:
+            cached = simulation_cache.get(cache_key)
+            if cached is not None:
+                game["home_score"] = cached["home_score"]
+                game["away_score"] = cached["away_score"]
+                game["status"] = "completed"
+                return cached
+        
         # Choose the appropriate simulation mode
         if simulation_mode == 'play_by_play':
-            return GameSimulation.simulate_play_by_play(game, full_length=True)
+            result = GameSimulation.simulate_play_by_play(game, full_length=True, seed=seed,
+                                                          home_profile=home_profile, away_profile=away_profile)
         elif simulation_mode == 'fast_play_by_play':
-            return GameSimulation.simulate_play_by_play(game, full_length=False)
+            result = GameSimulation.simulate_play_by_play(game, full_length=False, seed=seed,
+                                                          home_profile=home_profile, away_profile=away_profile)
         elif simulation_mode == 'simulation':
-            return GameSimulation.simulate_with_updates(game)
+            result = GameSimulation.simulate_with_updates(game, seed=seed,
+                                                          home_profile=home_profile, away_profile=away_profile)
         else:  # Default to fast simulation
-            # Simple simulation logic - would be much more complex in a real implementation
-            home_score = random.randint(0, 6)
-            away_score = random.randint(0, 5)
-            
-            # Update game with results
-            game["home_score"] = home_score
-            game["away_score"] = away_score
-            game["status"] = "completed"
-            
-            result = {
-                "game_id": game_id,
-                "home_team": game["home_team"],
-                "away_team": game["away_team"],
-                "home_score": home_score,
-                "away_score": away_score,
-                "winner": game["home_team"] if home_score > away_score else (
-                    game["away_team"] if away_score > home_score else "Tie"
-                ),
-                "periods": [
-                    {"home": random.randint(0, 3), "away": random.randint(0, 2)},
-                    {"home": random.randint(0, 2), "away": random.randint(0, 2)},
-                    {"home": random.randint(0, 2), "away": random.randint(0, 2)}
-                ],
-                "shots": {
-                    "home": random.randint(25, 40),
-                    "away": random.randint(20, 35)
-                },
-                "penalties": {
-                    "home": random.randint(2, 8),
-                    "away": random.randint(2, 8)
-                }
-            }
-            
-            return result
+            result = GameSimulation.simulate_fast(game, seed=seed,
+                                                  home_profile=home_profile, away_profile=away_profile)
+        
+        result["seed"] = seed
+        if use_cache:
+            simulation_cache.put(cache_key, result)
+        
+        return result
     
     @staticmethod
-    def simulate_play_by_play(game: Dict[str, Any], full_length: bool = False) -> Dict[str, Any]:
+    def simulate_fast(game: Dict[str, Any], seed: Optional[int] = None,
+                      home_profile=None, away_profile=None) -> Dict[str, Any]:
         """
-        Simulate a play-by-play hockey game.
+        Instant simulation with no visual feedback.
+        
+        Goals, shots and penalties of each period are drawn in one vectorized
+        Poisson draw from the expected counts of the game's rate table.
         
         Args:
             game: The game to simulate
-            full_length: Whether to simulate full 20-minute periods (True) or 3-minute periods (False)
+            seed: Optional RNG seed
+            home_profile: Optional pre-built home TeamProfile
+            away_profile: Optional pre-built away TeamProfile
             
         Returns:
-            Dictionary with game events and final result
+            Dictionary with game result
         """
-        # Initialize game state
-        period_length = 1200 if full_length else 180  # 20 minutes (1200 seconds) or 3 minutes (180 seconds)
-        periods = 3  # Standard hockey game has 3 periods
+        counts = GameSimulation._period_counts(game, np.random.default_rng(seed), home_profile, away_profile)
+        home_goals = counts[:, EVENT_INDEX[('goal', 'home')]]
+        away_goals = counts[:, EVENT_INDEX[('goal', 'away')]]
+        home_score = int(home_goals.sum())
+        away_score = int(away_goals.sum())
         
-        # Create team and player data structures
-        home_team = {
-            "id": game["home_team_id"],
-            "abbreviation": game["home_team"],
-            "score": 0,
-            "shots": 0,
-            "penalties": 0,
-            "players": [f"Player{i}" for i in range(1, 13)]  # 12 players including 2 goalies
-        }
+        # Update game with results
+        game["home_score"] = home_score
+        game["away_score"] = away_score
+        game["status"] = "completed"
         
-        away_team = {
-            "id": game["away_team_id"],
-            "abbreviation": game["away_team"],
-            "score": 0,
-            "shots": 0,
-            "penalties": 0,
-            "players": [f"Player{i}" for i in range(1, 13)]  # 12 players including 2 goalies
+        result = {
+            "game_id": game["id"],
+            "home_team": game["home_team"],
+            "away_team": game["away_team"],
+            "home_score": home_score,
+            "away_score": away_score,
+            "winner": game["home_team"] if home_score > away_score else (
+                game["away_team"] if away_score > home_score else "Tie"
+            ),
+            "periods": [
+                {"home": int(home), "away": int(away)} for home, away in zip(home_goals, away_goals)
+            ],
+            "shots": GameSimulation._count_totals(counts, 'shot', include_goals=True),
+            "penalties": GameSimulation._count_totals(counts, 'penalty')
         }
         
-        # Initialize game events
-        game_events = []
-        
-        # Initial positions (simplified)
-        initial_positions = {
-            "home": {
-                "Player1": {"x": 10, "y": 50, "role": "center"},
-                "Player2": {"x": 20, "y": 30, "role": "left_wing"},
-                "Player3": {"x": 20, "y": 70, "role": "right_wing"},
-                "Player4": {"x": 30, "y": 40, "role": "defense"},
-                "Player5": {"x": 30, "y": 60, "role": "defense"},
-                "Player6": {"x": 5, "y": 50, "role": "goalie"},
-                # Bench players
-                "Player7": {"x": -10, "y": 20, "role": "bench"},
-                "Player8": {"x": -10, "y": 25, "role": "bench"},
-                "Player9": {"x": -10, "y": 30, "role": "bench"},
-                "Player10": {"x": -10, "y": 35, "role": "bench"},
-                "Player11": {"x": -10, "y": 40, "role": "bench"},
-                "Player12": {"x": -10, "y": 45, "role": "backup_goalie"},
-            },
-            "away": {
-                "Player1": {"x": 90, "y": 50, "role": "center"},
-                "Player2": {"x": 80, "y": 30, "role": "left_wing"},
-                "Player3": {"x": 80, "y": 70, "role": "right_wing"},
-                "Player4": {"x": 70, "y": 40, "role": "defense"},
-                "Player5": {"x": 70, "y": 60, "role": "defense"},
-                "Player6": {"x": 95, "y": 50, "role": "goalie"},
-                # Bench players
-                "Player7": {"x": 110, "y": 20, "role": "bench"},
-                "Player8": {"x": 110, "y": 25, "role": "bench"},
-                "Player9": {"x": 110, "y": 30, "role": "bench"},
-                "Player10": {"x": 110, "y": 35, "role": "bench"},
-                "Player11": {"x": 110, "y": 40, "role": "bench"},
-                "Player12": {"x": 110, "y": 45, "role": "backup_goalie"},
-            },
-            "puck": {"x": 50, "y": 50, "possession": None}
-        }
+        return result
+    
+    @staticmethod
+    def _period_counts(game: Dict[str, Any], rng: np.random.Generator, home_profile=None, away_profile=None,
+                       periods: int = 3, period_length: int = 1200) -> np.ndarray:
+        """
+        Draw the number of each rate-table event in every period.
         
-        # Simulate each period
-        for period in range(1, periods + 1):
-            # Reset positions for face-off at the start of the period
-            positions = dict(initial_positions)
-            
-            # Initialize period state
-            period_time = 0
-            period_events = []
+        Returns:
+            Integer array of shape (periods, len(EVENTS)); 'shot' counts
+            exclude goals, as in the play-by-play engine
+        """
+        from .game import PlayByPlayEngine
+        
+        home_profile = home_profile or GameSimulation.get_team_profile(game.get("home_team"))
+        away_profile = away_profile or GameSimulation.get_team_profile(game.get("away_team"))
+        
+        rates = GameRates(home_profile.rate_table, away_profile.rate_table)
+        expected = rates.expected_counts(period_length, PlayByPlayEngine.MINOR_PENALTY_LENGTH)
+        return rng.poisson(np.broadcast_to(expected, (periods, len(expected))))
+    
+    @staticmethod
+    def _count_totals(counts: np.ndarray, event: str, include_goals: bool = False) -> Dict[str, int]:
+        """Game totals per team of one event type from _period_counts."""
+        totals = {}
+        for side in ("home", "away"):
+            total = counts[:, EVENT_INDEX[(event, side)]].sum()
+            if include_goals:
+                total += counts[:, EVENT_INDEX[('goal', side)]].sum()
+            totals[side] = int(total)
+        return totals
+    
+    @staticmethod
+    def get_team_profile(team_abbreviation: Optional[str], formations: Optional[Dict[str, Any]] = None):
+        """
+        Build the simulation profile of a team from its optimal lines, rating,
+        chemistry and coach strategy. The profile carries the team's rate
+        table, so callers simulating several games build it once per team.
+        
+        Args:
+            team_abbreviation: Team abbreviation (e.g. 'MTL')
+            formations: Optional dictionary that receives the team's
+                TeamFormation, keyed by abbreviation
             
-            # Simulate the period second by second (in a real implementation, this would use a smaller time step)
-            while period_time < period_length:
-                # Simulate game logic for this time step
-                # This is greatly simplified - a real implementation would have complex physics and AI
-                
-                # Random events based on probabilities
-                event_type = random.choices(
-                    ["shot", "goal", "penalty", "face_off", "none"],
-                    weights=[0.05, 0.01, 0.02, 0.02, 0.9],
-                    k=1
-                )[0]
-                
-                if event_type == "shot":
-                    # Determine which team takes the shot
-                    shooting_team = random.choice(["home", "away"])
-                    defending_team = "away" if shooting_team == "home" else "home"
-                    
-                    # Choose a random player to take the shot
-                    shooter = random.choice([p for p in (home_team if shooting_team == "home" else away_team)["players"] if not p.endswith("6") and not p.endswith("12")])
-                    
-                    # Increment shots
-                    if shooting_team == "home":
-                        home_team["shots"] += 1
-                    else:
-                        away_team["shots"] += 1
-                    
-                    # Add shot event
-                    period_events.append({
-                        "type": "shot",
-                        "time": period_time,
-                        "period": period,
-                        "team": shooting_team,
-                        "player": shooter,
-                        "x": random.randint(50, 95) if shooting_team == "home" else random.randint(5, 50),
-                        "y": random.randint(30, 70)
-                    })
-                    
-                    # Move puck position
-                    positions["puck"]["x"] = random.randint(50, 95) if shooting_team == "home" else random.randint(5, 50)
-                    positions["puck"]["y"] = random.randint(30, 70)
-                    positions["puck"]["possession"] = shooter
-                
-                elif event_type == "goal":
-                    # Determine which team scores
-                    scoring_team = random.choice(["home", "away"])
-                    defending_team = "away" if scoring_team == "home" else "home"
-                    
-                    # Choose a random player to score
-                    scorer = random.choice([p for p in (home_team if scoring_team == "home" else away_team)["players"] if not p.endswith("6") and not p.endswith("12")])
-                    
-                    # Choose a random player for the assist
-                    assist = random.choice([p for p in (home_team if scoring_team == "home" else away_team)["players"] if p != scorer and not p.endswith("6") and not p.endswith("12")])
-                    
-                    # Increment score and shots
-                    if scoring_team == "home":
-                        home_team["score"] += 1
-                        home_team["shots"] += 1
-                    else:
-                        away_team["score"] += 1
-                        away_team["shots"] += 1
-                    
-                    # Add goal event
-                    period_events.append({
-                        "type": "goal",
-                        "time": period_time,
-                        "period": period,
-                        "team": scoring_team,
-                        "scorer": scorer,
-                        "assist": assist,
-                        "x": 90 if scoring_team == "home" else 10,
-                        "y": random.randint(40, 60)
-                    })
-                    
-                    # Reset positions for face-off after goal
-                    positions = dict(initial_positions)
-                
-                elif event_type == "penalty":
-                    # Determine which team takes the penalty
-                    penalty_team = random.choice(["home", "away"])
-                    
-                    # Choose a random player for the penalty
-                    offender = random.choice([p for p in (home_team if penalty_team == "home" else away_team)["players"] if not p.endswith("6") and not p.endswith("12")])
-                    
-                    # Determine penalty type and duration
-                    penalty_types = ["tripping", "hooking", "interference", "slashing", "high-sticking"]
-                    penalty_type = random.choice(penalty_types)
-                    duration = 2  # 2-minute minor penalty
-                    
-                    # Increment penalties
-                    if penalty_team == "home":
-                        home_team["penalties"] += 1
-                    else:
-                        away_team["penalties"] += 1
-                    
-                    # Add penalty event
-                    period_events.append({
-                        "type": "penalty",
-                        "time": period_time,
-                        "period": period,
-                        "team": penalty_team,
-                        "player": offender,
-                        "penalty_type": penalty_type,
-                        "duration": duration
-                    })
-                    
-                    # Reset positions for face-off after penalty
-                    positions = dict(initial_positions)
-                
-                elif event_type == "face_off":
-                    # Add face-off event
-                    period_events.append({
-                        "type": "face_off",
-                        "time": period_time,
-                        "period": period,
-                        "x": 50,
-                        "y": 50
-                    })
-                    
-                    # Reset positions for face-off
-                    positions = dict(initial_positions)
-                
-                # Increment time
-                period_time += 1
+        Returns:
+            TeamProfile (league-average defaults if the team cannot be rated)
+        """
+        from .game import TeamProfile
+        
+        if not team_abbreviation:
+            return TeamProfile()
+        
+        try:
+            from .team_formation import TeamFormation
             
-            # Add all period events to game events
-            game_events.extend(period_events)
+            formation = TeamFormation(team_abbreviation)
+            if formation.initialize():
+                lines_data = formation.generate_optimal_lines_cached()
+                if formations is not None:
+                    formations[team_abbreviation] = formation
+                return TeamProfile(team_abbreviation, lines_data.get('team_rating'), lines_data.get('lines'),
+                                   chemistry=lines_data.get('chemistry'), coach_strategy=formation.coach_strategy)
+        except Exception as e:
+            print(f"GameSimulation: Could not rate team {team_abbreviation}, using default profile: {e}")
+        
+        return TeamProfile(team_abbreviation)
+    
+    @staticmethod
+    def _play_by_play_engine(game: Dict[str, Any], full_length: bool = False, seed: Optional[int] = None,
+                             home_profile=None, away_profile=None):
+        """Build the event-driven engine for a game, with an isolated RNG."""
+        from .game import PlayByPlayEngine
+        
+        period_length = 1200 if full_length else 180  # 20 minutes (1200 seconds) or 3 minutes (180 seconds)
+        periods = 3  # Standard hockey game has 3 periods
+        
+        home_profile = home_profile or GameSimulation.get_team_profile(game.get("home_team"))
+        away_profile = away_profile or GameSimulation.get_team_profile(game.get("away_team"))
+        
+        return PlayByPlayEngine(home_profile, away_profile, period_length=period_length, periods=periods,
+                                rng=random.Random(seed))
+    
+    @staticmethod
+    def _play_by_play_result(game: Dict[str, Any], outcome: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the final result from the engine totals and mark the game completed."""
+        home_score = outcome["home_score"]
+        away_score = outcome["away_score"]
         
         # Create final result
         result = {
             "game_id": game["id"],
             "home_team": game["home_team"],
             "away_team": game["away_team"],
-            "home_score": home_team["score"],
-            "away_score": away_team["score"],
-            "winner": game["home_team"] if home_team["score"] > away_team["score"] else (
-                game["away_team"] if away_team["score"] > home_team["score"] else "Tie"
+            "home_score": home_score,
+            "away_score": away_score,
+            "winner": game["home_team"] if home_score > away_score else (
+                game["away_team"] if away_score > home_score else "Tie"
             ),
-            "periods": [
-                # Simplified - in a real implementation, this would track period scores properly
-                {"home": 0, "away": 0},
-                {"home": 0, "away": 0},
-                {"home": 0, "away": 0}
-            ],
-            "shots": {
-                "home": home_team["shots"],
-                "away": away_team["shots"]
-            },
-            "penalties": {
-                "home": home_team["penalties"],
-                "away": away_team["penalties"]
-            },
-            "events": game_events,
-            "positions": positions  # Final positions at end of game
+            "periods": outcome["periods"],
+            "shots": outcome["shots"],
+            "penalties": outcome["penalties"],
+            "ice_time": outcome["ice_time"]
         }
+        if "events" in outcome:
+            result["events"] = outcome["events"]
+        result["positions"] = outcome["positions"]  # Final positions at end of game
         
         # Update game with results
-        game["home_score"] = home_team["score"]
-        game["away_score"] = away_team["score"]
+        game["home_score"] = home_score
+        game["away_score"] = away_score
         game["status"] = "completed"
         
         return result
     
     @staticmethod
-    def simulate_with_updates(game: Dict[str, Any]) -> Dict[str, Any]:
+    def simulate_play_by_play(game: Dict[str, Any], full_length: bool = False, seed: Optional[int] = None,
+                              home_profile=None, away_profile=None) -> Dict[str, Any]:
+        """
+        Simulate a play-by-play hockey game.
+        
+        Uses the event-driven engine: the time to the next shot, goal, penalty
+        or face-off is sampled from rates derived from both teams' ratings, so
+        full-length periods cost no more than short ones.
+        
+        Args:
+            game: The game to simulate
+            full_length: Whether to simulate full 20-minute periods (True) or 3-minute periods (False)
+            seed: Optional RNG seed
+            home_profile: Optional pre-built home TeamProfile
+            away_profile: Optional pre-built away TeamProfile
+            
+        Returns:
+            Dictionary with game events and final result
+        """
+        engine = GameSimulation._play_by_play_engine(game, full_length, seed, home_profile, away_profile)
+        return GameSimulation._play_by_play_result(game, engine.simulate())
+    
+    @staticmethod
+    def stream_play_by_play(game: Dict[str, Any], full_length: bool = False,
+                            seed: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Simulate a play-by-play game as a stream of events.
+        
+        Events are yielded as the engine produces them and are not kept, so
+        memory use does not grow with the length of the game.
+        
+        Args:
+            game: The game to simulate
+            full_length: Whether to simulate full 20-minute periods (True) or 3-minute periods (False)
+            seed: RNG seed; a new one is drawn when omitted
+            
+        Yields:
+            Event dictionaries, followed by one {"type": "final", ...} record
+            holding the same result as simulate_play_by_play without the events
+        """
+        if seed is None:
+            seed = new_seed()
+        
+        mode = 'play_by_play' if full_length else 'fast_play_by_play'
+        home_profile = GameSimulation.get_team_profile(game.get("home_team"))
+        away_profile = GameSimulation.get_team_profile(game.get("away_team"))
+        
+        # Replay a cached game instead of simulating it again
+        cached = simulation_cache.get((game.get("id"), mode, seed, lineup_hash(home_profile, away_profile)))
+        if cached is not None:
+            events = cached.pop("events", [])
+            yield from events
+            final = {"type": "final"}
+            final.update(cached)
+            yield final
+            return
+        
+        engine = GameSimulation._play_by_play_engine(game, full_length, seed, home_profile, away_profile)
+        
+        for event in engine.iter_events():
+            yield event
+        
+        final = {"type": "final"}
+        final.update(GameSimulation._play_by_play_result(game, engine.summary()))
+        final["seed"] = seed
+        yield final
+    
+    @staticmethod
+    def simulate_with_updates(game: Dict[str, Any], seed: Optional[int] = None,
+                              home_profile=None, away_profile=None) -> Dict[str, Any]:
         """
         Simulate a hockey game with periodic UI updates (simulation mode).
         
         Args:
             game: The game to simulate
+            seed: Optional RNG seed
+            home_profile: Optional pre-built home TeamProfile
+            away_profile: Optional pre-built away TeamProfile
             
         Returns:
             Dictionary with game result and update events
@@ -508,49 +577,37 @@ class GameSimulation:
         # This is a placeholder for the simulation with UI updates mode
         # In a real implementation, this would send periodic updates to the frontend
         
-        # Simple simulation logic similar to fast simulation but with update events
-        home_score = 0
-        away_score = 0
+        rng = np.random.default_rng(seed)
+        counts = GameSimulation._period_counts(game, rng, home_profile, away_profile)
         
         # Track events for UI updates
         events = []
+        periods = []
         
-        # Simulate 3 periods
-        for period in range(1, 4):
-            # Period events
+        # Goals of each period at random times, sorted into game order
+        for period, period_counts in enumerate(counts, start=1):
             period_events = []
-            
-            # Simulate goals in this period
-            home_period_goals = random.randint(0, 2)
-            away_period_goals = random.randint(0, 2)
-            
-            # Add home team goals
-            for _ in range(home_period_goals):
-                goal_time = random.randint(0, 1200)  # Random time in the period (in seconds)
-                period_events.append({
-                    "type": "goal",
-                    "team": "home",
-                    "time": goal_time,
-                    "period": period
-                })
-                home_score += 1
-            
-            # Add away team goals
-            for _ in range(away_period_goals):
-                goal_time = random.randint(0, 1200)  # Random time in the period (in seconds)
-                period_events.append({
-                    "type": "goal",
-                    "team": "away",
-                    "time": goal_time,
-                    "period": period
-                })
-                away_score += 1
+            for side in ("home", "away"):
+                goals = int(period_counts[EVENT_INDEX[('goal', side)]])
+                for goal_time in rng.integers(0, 1201, size=goals):  # Random time in the period (in seconds)
+                    period_events.append({
+                        "type": "goal",
+                        "team": side,
+                        "time": int(goal_time),
+                        "period": period
+                    })
             
             # Sort events by time
             period_events.sort(key=lambda e: e["time"])
             
-            # Add to overall events
             events.extend(period_events)
+            periods.append({
+                "home": int(period_counts[EVENT_INDEX[('goal', 'home')]]),
+                "away": int(period_counts[EVENT_INDEX[('goal', 'away')]])
+            })
+        
+        home_score = sum(p["home"] for p in periods)
+        away_score = sum(p["away"] for p in periods)
         
         # Update game with results
         game["home_score"] = home_score
@@ -567,26 +624,338 @@ class GameSimulation:
             "winner": game["home_team"] if home_score > away_score else (
                 game["away_team"] if away_score > home_score else "Tie"
             ),
-            "periods": [
-                {"home": sum(1 for e in events if e["type"] == "goal" and e["team"] == "home" and e["period"] == 1),
-                 "away": sum(1 for e in events if e["type"] == "goal" and e["team"] == "away" and e["period"] == 1)},
-                {"home": sum(1 for e in events if e["type"] == "goal" and e["team"] == "home" and e["period"] == 2),
-                 "away": sum(1 for e in events if e["type"] == "goal" and e["team"] == "away" and e["period"] == 2)},
-                {"home": sum(1 for e in events if e["type"] == "goal" and e["team"] == "home" and e["period"] == 3),
-                 "away": sum(1 for e in events if e["type"] == "goal" and e["team"] == "away" and e["period"] == 3)}
-            ],
-            "shots": {
-                "home": random.randint(25, 40),
-                "away": random.randint(20, 35)
-            },
-            "penalties": {
-                "home": random.randint(2, 8),
-                "away": random.randint(2, 8)
-            },
+            "periods": periods,
+            "shots": GameSimulation._count_totals(counts, 'shot', include_goals=True),
+            "penalties": GameSimulation._count_totals(counts, 'penalty'),
             "events": events
         }
         
         return result
+    
+    @staticmethod
+    def simulate_season(schedule: Optional[List[Any]] = None, season_id: Optional[int] = None,
+                        ratings: Optional[Dict[Any, Any]] = None, n_seasons: int = 10000,
+                        seed: Optional[int] = None, workers: int = 1,
+                        conferences: Optional[Dict[Any, Any]] = None, playoff_spots: int = 8,
+                        league: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run the Monte Carlo season simulator over a schedule.
+        
+        Args:
+            schedule: Games as (home, away) pairs or game dictionaries; loaded
+                from the games table for `season_id` when omitted
+            season_id: Season whose scheduled games to simulate
+            ratings: Mapping of team to rating dictionary or vector; current
+                team ratings are used when omitted
+            n_seasons: Number of seasons to simulate
+            seed: Seed for reproducible results
+            workers: Worker processes
+            conferences: Optional mapping of team to conference
+            playoff_spots: Playoff spots per conference (or league-wide)
+            league: League used when computing default ratings
+            
+        Returns:
+            Standings distribution dictionary, or a dictionary with an error
+        """
+        from .game.season_simulation import simulate_season
+        
+        if not schedule and season_id is not None:
+            try:
+                schedule = [game.to_dict() for game in Game.query.filter_by(season_id=season_id).all()]
+            except Exception as e:
+                print(f"GameSimulation: Error loading schedule for season {season_id}: {e}")
+                schedule = []
+        
+        if not schedule:
+            return {"error": "No games to simulate"}
+        
+        if not ratings:
+            ratings = {}
+            try:
+                from .team_rating_batch import rate_all_teams
+                for rating in rate_all_teams(league=league):
+                    ratings[rating.get('team')] = rating
+                    ratings[rating.get('team_id')] = rating
+            except Exception as e:
+                print(f"GameSimulation: Error rating teams, using default ratings: {e}")
+        
+        try:
+            return simulate_season(
+                schedule, ratings, n_seasons=n_seasons, seed=seed, workers=workers,
+                conferences=conferences, playoff_spots=playoff_spots
+            )
+        except ValueError as e:
+            return {"error": str(e)}
+    
+    @staticmethod
+    def get_games_for_date(date: str) -> List[Dict[str, Any]]:
+        """
+        Get every scheduled game on a date.
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+            
+        Returns:
+            List of games as dictionaries
+        """
+        try:
+            game_date = datetime.strptime(date, '%Y-%m-%d').date()
+            games = Game.query.filter(Game.date == game_date, Game.status == 'scheduled').order_by(Game.id).all()
+            return [game.to_dict() for game in games]
+        except Exception as e:
+            print(f"GameSimulation: Error loading games for {date} from the database: {e}")
+        
+        return [game for game in GameSimulation.get_all_games({'date': date}) if game.get('status') == 'scheduled']
+    
+    @staticmethod
+    def simulate_date(date: str, seed: Optional[int] = None, max_workers: Optional[int] = None,
+                      include_events: bool = False, save: bool = True) -> Dict[str, Any]:
+        """
+        Simulate every scheduled game on a date ("sim day").
+        
+        Team profiles (and their rate tables) are built once per team, then the games are fanned out
+        across a process pool. Each game is simulated with its own RNG seeded
+        from (date, game id, seed), so a rerun with the same seed reproduces
+        the same results regardless of worker count or scheduling order.
+        Results are written back to the games table in a single transaction.
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+            seed: Optional base seed mixed into every per-game seed
+            max_workers: Worker processes (defaults to SIM_DAY_MAX_WORKERS)
+            include_events: Include the play-by-play events of each game
+            save: Write the results back to the database
+            
+        Returns:
+            Dictionary with the date, per-game results and whether they were saved
+        """
+        games = GameSimulation.get_games_for_date(date)
+        if not games:
+            return {"date": date, "games": [], "saved": False}
+        
+        # Build each team's profile once, in this process (it needs the app context)
+        profiles = {}
+        formations = {}
+        for game in games:
+            for team in (game.get('home_team'), game.get('away_team')):
+                if team not in profiles:
+                    profiles[team] = GameSimulation.get_team_profile(team, formations)
+        
+        jobs = [
+            (game, profiles[game.get('home_team')], profiles[game.get('away_team')],
+             game_seed(date, game.get('id'), seed), include_events)
+            for game in games
+        ]
+        
+        results = None
+        workers = min(max_workers or SIM_DAY_MAX_WORKERS, len(jobs))
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    results = list(executor.map(_simulate_scheduled_game, jobs))
+            except Exception as pool_error:
+                print(f"GameSimulation: Process pool failed, simulating {date} serially: {pool_error}")
+                results = None
+        
+        if results is None:
+            results = [_simulate_scheduled_game(job) for job in jobs]
+        
+        saved = GameSimulation.save_game_results(results) if save else False
+        GameSimulation.apply_ice_time(results, formations)
+        
+        # The binary logs are stored with the games, not returned
+        for result in results:
+            result.pop("event_log", None)
+        
+        return {"date": date, "games": results, "saved": saved}
+    
+    @staticmethod
+    def apply_ice_time(results: List[Dict[str, Any]], formations: Dict[str, Any]) -> None:
+        """
+        Feed the line/pair/unit minutes of simulated games to each team's chemistry.
+        
+        Minutes are summed per team first, and the pairs of every team go
+        into the league-wide time played store in a single batch update.
+        
+        Args:
+            results: Game results including 'ice_time'
+            formations: TeamFormation per team abbreviation
+        """
+        minutes_by_team = {}
+        for result in results:
+            for side in ("home", "away"):
+                team = result.get(f"{side}_team")
+                minutes = (result.get("ice_time") or {}).get(side)
+                if team not in formations or not minutes:
+                    continue
+                totals = minutes_by_team.setdefault(team, {})
+                for key, value in minutes.items():
+                    totals[key] = totals.get(key, 0.0) + value
+        
+        from .time_played_store import get_time_played_store
+        
+        groups = []
+        for team, minutes in minutes_by_team.items():
+            try:
+                groups.extend(formations[team].time_played_groups(minutes))
+            except Exception as e:
+                print(f"GameSimulation: Error collecting time played for {team}: {e}")
+        
+        try:
+            get_time_played_store().add_groups(groups)
+        except Exception as e:
+            print(f"GameSimulation: Error updating time played: {e}")
+            traceback.print_exc()
+            return
+        
+        for team in minutes_by_team:
+            try:
+                formations[team].refresh_chemistry()
+            except Exception as e:
+                print(f"GameSimulation: Error refreshing chemistry for {team}: {e}")
+    
+    @staticmethod
+    def save_game_results(results: List[Dict[str, Any]]) -> bool:
+        """
+        Write simulated results back to the games table in one transaction.
+        
+        Args:
+            results: Game results as returned by simulate_date
+            
+        Returns:
+            True if the results were committed
+        """
+        try:
+            games = {game.id: game for game in Game.query.filter(Game.id.in_([r["game_id"] for r in results])).all()}
+            if not games:
+                return False
+            
+            save_event_logs = event_log_supported()
+            
+            for result in results:
+                game = games.get(result["game_id"])
+                if not game:
+                    continue
+                game.home_score = result["home_score"]
+                game.away_score = result["away_score"]
+                game.status = "completed"
+                game.set_period_data(result["periods"])
+                ice_time = result.get("ice_time") or {}
+                game.set_home_stats({"shots": result["shots"]["home"], "penalties": result["penalties"]["home"],
+                                     "ice_time": ice_time.get("home")})
+                game.set_away_stats({"shots": result["shots"]["away"], "penalties": result["penalties"]["away"],
+                                     "ice_time": ice_time.get("away")})
+                if save_event_logs and result.get("event_log"):
+                    game.event_log = result["event_log"]
+            
+            db.session.commit()
+            return True
+        except Exception as e:
+            print(f"GameSimulation: Error saving game results: {e}")
+            try:
+                db.session.rollback()
+            except Exception:
+                pass
+            return False
+
+
+# Modes simulated by the event-driven play-by-play engine
+PLAY_BY_PLAY_MODES = ('play_by_play', 'fast_play_by_play')
+
+
+def new_seed() -> int:
+    """Draw a fresh 63-bit seed for a simulation that was not given one."""
+    return random.SystemRandom().getrandbits(63)
+
+
+# Default number of worker processes for a sim day
+SIM_DAY_MAX_WORKERS = min(16, os.cpu_count() or 1)
+
+
+def game_seed(date: str, game_id: Any, seed: Optional[int] = None) -> int:
+    """
+    Derive a deterministic 64-bit RNG seed for one game.
+    
+    Args:
+        date: Game date
+        game_id: Game ID
+        seed: Optional base seed
+        
+    Returns:
+        Seed for random.Random
+    """
+    digest = hashlib.sha256(f"{date}:{game_id}:{seed}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+
+def _simulate_scheduled_game(job) -> Dict[str, Any]:
+    """
+    Process-pool worker: simulate one game of a sim day.
+    
+    Args:
+        job: Tuple of (game, home profile, away profile, seed, include_events)
+        
+    Returns:
+        Game result dictionary (without final positions), including the
+        encoded event log under 'event_log'
+    """
+    from .game import PlayByPlayEngine
+    from .game.event_log import encode_events
+    
+    game, home_profile, away_profile, seed, include_events = job
+    engine = PlayByPlayEngine(home_profile, away_profile, rng=random.Random(seed))
+    
+    events = list(engine.iter_events())
+    outcome = engine.summary()
+    home_score = outcome["home_score"]
+    away_score = outcome["away_score"]
+    
+    result = {
+        "game_id": game.get("id"),
+        "home_team": game.get("home_team"),
+        "away_team": game.get("away_team"),
+        "home_score": home_score,
+        "away_score": away_score,
+        "winner": game.get("home_team") if home_score > away_score else (
+            game.get("away_team") if away_score > home_score else "Tie"
+        ),
+        "periods": outcome["periods"],
+        "shots": outcome["shots"],
+        "penalties": outcome["penalties"],
+        "ice_time": outcome["ice_time"],
+        "seed": seed,
+        # Compact binary log, sent back to the parent process and stored with the game
+        "event_log": encode_events(events)
+    }
+    if include_events:
+        result["events"] = events
+    return result
+
+
+# Streaming formats for play-by-play and their content types
+STREAM_FORMATS = {
+    'sse': 'text/event-stream',
+    'ndjson': 'application/x-ndjson'
+}
+
+
+def format_event_stream(events: Iterable[Dict[str, Any]], stream_format: str) -> Iterator[str]:
+    """
+    Serialize simulation events for a streaming response.
+    
+    Args:
+        events: Iterable of event dictionaries
+        stream_format: 'sse' (Server-Sent Events) or 'ndjson' (one JSON object per line)
+        
+    Yields:
+        Encoded chunks, one per event
+    """
+    for event in events:
+        payload = json.dumps(event)
+        if stream_format == 'sse':
+            yield f"event: {event.get('type', 'message')}\ndata: {payload}\n\n"
+        else:
+            yield payload + "\n"
 
 
 # API endpoints that utilize the game service
@@ -643,10 +1012,109 @@ def simulate_game(game_id):
     if simulation_mode not in valid_modes:
         return jsonify({"error": f"Invalid simulation mode. Must be one of: {', '.join(valid_modes)}"}), 400
     
+    seed = request.args.get('seed', type=int)
+    use_cache = request.args.get('cache', 'true').lower() != 'false'
+    
+    # Stream play-by-play events as they are simulated
+    stream_format = request.args.get('stream')
+    if stream_format:
+        if stream_format not in STREAM_FORMATS:
+            return jsonify({"error": f"Invalid stream format. Must be one of: {', '.join(STREAM_FORMATS)}"}), 400
+        if simulation_mode not in ('play_by_play', 'fast_play_by_play'):
+            return jsonify({"error": "Streaming is only available for play_by_play and fast_play_by_play modes"}), 400
+        
+        game = GameSimulation.get_game_by_id(game_id)
+        if not game:
+            return jsonify({"error": f"Game with ID {game_id} not found"}), 404
+        
+        events = GameSimulation.stream_play_by_play(game, full_length=(simulation_mode == 'play_by_play'), seed=seed)
+        return Response(
+            stream_with_context(format_event_stream(events, stream_format)),
+            mimetype=STREAM_FORMATS[stream_format],
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
     # Simulate the game with the specified mode
-    result = GameSimulation.simulate_game(game_id, simulation_mode)
+    result = GameSimulation.simulate_game(game_id, simulation_mode, seed=seed, use_cache=use_cache)
     
     if "error" in result:
         return jsonify(result), 404
         
     return jsonify(result), 200
+
+
+@game_bp.route('/replay/<int:game_id>', methods=['GET'])
+def replay_game(game_id):
+    """Replay a previously simulated game from its mode and seed"""
+    simulation_mode = request.args.get('mode', 'play_by_play')
+    seed = request.args.get('seed', type=int)
+    
+    valid_modes = ['play_by_play', 'fast_play_by_play', 'simulation', 'fast_simulation']
+    if simulation_mode not in valid_modes:
+        return jsonify({"error": f"Invalid simulation mode. Must be one of: {', '.join(valid_modes)}"}), 400
+    if seed is None:
+        return jsonify({"error": "A seed is required to replay a game"}), 400
+    
+    # Served from the simulation cache when available; otherwise the seeded
+    # simulation reproduces the original result exactly
+    result = GameSimulation.simulate_game(game_id, simulation_mode, seed=seed)
+    
+    if "error" in result:
+        return jsonify(result), 404
+    
+    return jsonify(result), 200
+
+
+@game_bp.route('/simulate_season', methods=['POST'])
+def simulate_season():
+    """Monte Carlo simulation of a full season schedule"""
+    data = request.get_json(silent=True) or {}
+    
+    try:
+        n_seasons = int(data.get('seasons', request.args.get('seasons', 10000)))
+        workers = int(data.get('workers', request.args.get('workers', 1)))
+        playoff_spots = int(data.get('playoff_spots', 8))
+        seed = data.get('seed')
+        seed = int(seed) if seed is not None else None
+    except (TypeError, ValueError):
+        return jsonify({"error": "seasons, workers, playoff_spots and seed must be integers"}), 400
+    
+    if n_seasons < 1 or n_seasons > 100000:
+        return jsonify({"error": "seasons must be between 1 and 100000"}), 400
+    
+    from .game.season_simulation import DEFAULT_SEASON_WORKERS
+    if workers < 1 or workers > DEFAULT_SEASON_WORKERS:
+        return jsonify({"error": f"workers must be between 1 and {DEFAULT_SEASON_WORKERS}"}), 400
+    
+    result = GameSimulation.simulate_season(
+        schedule=data.get('schedule'),
+        season_id=data.get('season_id', request.args.get('season_id', type=int)),
+        ratings=data.get('ratings'),
+        n_seasons=n_seasons,
+        seed=seed,
+        workers=workers,
+        conferences=data.get('conferences'),
+        playoff_spots=playoff_spots,
+        league=data.get('league', request.args.get('league'))
+    )
+    
+    if "error" in result:
+        return jsonify(result), 400
+    
+    return jsonify(result), 200
+
+
+@game_bp.route('/simulate_date/<string:date>', methods=['POST'])
+def simulate_date(date):
+    """Simulate every scheduled game on a date"""
+    try:
+        datetime.strptime(date, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({"error": "Date must be in YYYY-MM-DD format"}), 400
+    
+    seed = request.args.get('seed', type=int)
+    workers = request.args.get('workers', type=int)
+    include_events = request.args.get('events', 'false').lower() == 'true'
+    
+    result = GameSimulation.simulate_date(date, seed=seed, max_workers=workers, include_events=include_events)
+    return jsonify(result), 200
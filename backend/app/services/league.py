@@ -128,7 +128,8 @@ class ConferenceService:
             List of conferences as dictionaries
         """
         import os
-        from supabase import create_client, Client
+        from supabase import Client
+        from ..supabase_client import get_pooled_client
         import logging
         
         # Configure logging
@@ -147,7 +148,7 @@ class ConferenceService:
                 return conferences
             
             # Initialize Supabase client
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase: Client = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
             # Query conferences table
             response = supabase.table("Conference").select("*").execute()
@@ -194,7 +195,8 @@ class ConferenceService:
             Conference as dictionary, or None if not found
         """
         import os
-        from supabase import create_client, Client
+        from supabase import Client
+        from ..supabase_client import get_pooled_client
         import logging
         
         # Configure logging
@@ -213,7 +215,7 @@ class ConferenceService:
                 return conference.to_dict() if conference else None
             
             # Initialize Supabase client
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase: Client = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
             # Query conference by ID
             response = supabase.table("Conference").select("*").eq("id", conference_id).execute()
@@ -327,7 +329,8 @@ class DivisionService:
             List of divisions as dictionaries
         """
         import os
-        from supabase import create_client, Client
+        from supabase import Client
+        from ..supabase_client import get_pooled_client
         import logging
         
         # Configure logging
@@ -346,7 +349,7 @@ class DivisionService:
                 return divisions
             
             # Initialize Supabase client
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase: Client = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
             # Query divisions table
             response = supabase.table("Division").select("*").execute()
@@ -394,7 +397,8 @@ class DivisionService:
             List of divisions as dictionaries
         """
         import os
-        from supabase import create_client, Client
+        from supabase import Client
+        from ..supabase_client import get_pooled_client
         import logging
         
         # Configure logging
@@ -413,7 +417,7 @@ class DivisionService:
                 return divisions
             
             # Initialize Supabase client
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase: Client = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
             # Query divisions by conference ID
             response = supabase.table("Division").select("*").eq("conference", conference_id).execute()
@@ -461,7 +465,8 @@ class DivisionService:
             Division as dictionary, or None if not found
         """
         import os
-        from supabase import create_client, Client
+        from supabase import Client
+        from ..supabase_client import get_pooled_client
         import logging
         
         # Configure logging
@@ -480,7 +485,7 @@ class DivisionService:
                 return division.to_dict() if division else None
             
             # Initialize Supabase client
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase: Client = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
             # Query division by ID
             response = supabase.table("Division").select("*").eq("id", division_id).execute()
@@ -596,7 +601,8 @@ class LeagueService:
             List of leagues as dictionaries
         """
         import os
-        from supabase import create_client, Client
+        from supabase import Client
+        from ..supabase_client import get_pooled_client
         import logging
         
         # Configure logging
@@ -615,7 +621,7 @@ class LeagueService:
                 return leagues
             
             # Initialize Supabase client
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase: Client = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
             # Query leagues table
             response = supabase.table("League").select("*").execute()
@@ -664,7 +670,8 @@ class LeagueService:
             List of leagues as dictionaries
         """
         import os
-        from supabase import create_client, Client
+        from supabase import Client
+        from ..supabase_client import get_pooled_client
         import logging
         
         # Configure logging
@@ -681,7 +688,7 @@ class LeagueService:
                 return []
             
             # Initialize Supabase client
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase: Client = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
             # Query leagues table with level filter
             response = supabase.table("League").select("*").eq("league_level", level).execute()
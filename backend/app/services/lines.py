@@ -1,6 +1,10 @@
 from typing import Dict, List, Any, Optional, Tuple
+import copy
 import os
-from supabase import create_client, Client
+import random
+import time
+from supabase import Client
+from ..supabase_client import get_pooled_client
 from flask import Blueprint, jsonify, request
 import traceback
 
@@ -37,7 +41,7 @@ class LineOptimizer:
             # Initialize Supabase client
             url = os.environ.get("SUPABASE_URL")
             key = os.environ.get("SUPABASE_KEY")
-            supabase: Client = create_client(url, key)
+            supabase: Client = get_pooled_client(url, key)
             
             # Fetch players for the team
             response = supabase.table('Player').select('*').eq('team', self.team_abbreviation).execute()
@@ -489,6 +493,229 @@ class LineOptimizer:
         }
 
 
+class LineSearch:
+    """
+    Searches forward-line and defense-pair assignments that maximize weighted
+    player rating plus chemistry.
+    
+    Every player stays at his primary position (LW/C/RW, LD/RD); the search
+    decides which line or pair each player is on, including moving players
+    between the lineup and the extras. Each unit is scored as
+    weight * average rating * (1 + chemistry / 100), the same way the team
+    rating applies chemistry, and the search is an iterated local search
+    (steepest-ascent swaps with random restarts) bounded by a time budget.
+    """
+    
+    # Same weights as TeamFormation._calculate_team_rating
+    FORWARD_LINE_WEIGHTS = [0.17, 0.11, 0.08, 0.04]
+    DEFENSE_PAIR_WEIGHTS = [0.11, 0.07, 0.05]
+    
+    FORWARD_POSITIONS = ['LW', 'C', 'RW']
+    DEFENSE_POSITIONS = ['LD', 'RD']
+    
+    def __init__(self, chemistry_calculator, rating_function, apply_chemistry: bool = True,
+                 time_budget_ms: float = 50, seed: int = 0):
+        """
+        Initialize the line search.
+        
+        Args:
+            chemistry_calculator: ChemistryCalculator with a roster matrix (see set_roster)
+            rating_function: Callable returning a player's overall rating
+            apply_chemistry: Whether chemistry contributes to the objective
+            time_budget_ms: Maximum search time in milliseconds for the whole lineup
+            seed: Seed for the restart perturbations (results are deterministic)
+        """
+        self.chemistry_calculator = chemistry_calculator
+        self.rating_function = rating_function
+        self.apply_chemistry = apply_chemistry
+        self.time_budget_ms = time_budget_ms
+        self.rng = random.Random(seed)
+        self.iterations = 0
+    
+    def optimize(self, lines: Dict[str, Any], forwards: List[Dict[str, Any]],
+                 defensemen: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Optimize forward lines and defense pairs.
+        
+        Args:
+            lines: Line combinations (forward_lines and defense_pairs are used as the starting point)
+            forwards: All forwards available to the team
+            defensemen: All defensemen available to the team
+            
+        Returns:
+            Copy of the lines with optimized forward_lines and defense_pairs
+        """
+        optimized = copy.deepcopy(lines)
+        
+        # Collect every candidate so they all have a matrix index
+        players = []
+        seen = set()
+        for unit in list(lines.get('forward_lines', [])) + list(lines.get('defense_pairs', [])):
+            for pos in self.FORWARD_POSITIONS + self.DEFENSE_POSITIONS:
+                if isinstance(unit, dict) and isinstance(unit.get(pos), dict):
+                    players.append(unit[pos])
+        players.extend(forwards or [])
+        players.extend(defensemen or [])
+        roster = []
+        for p in players:
+            key = p.get('id', id(p))
+            if key not in seen:
+                seen.add(key)
+                roster.append(p)
+        
+        matrix = self.chemistry_calculator.matrix
+        if matrix is None or matrix.indices(roster) is None:
+            matrix = self.chemistry_calculator.set_roster(roster)
+        
+        self._matrix = matrix
+        self._compat = matrix.compatibility.tolist()
+        self._ratings = [self.rating_function(p) for p in matrix.players]
+        self._unit_cache = {}
+        
+        deadline = time.perf_counter() + self.time_budget_ms / 1000.0
+        # Forwards get the larger share of the budget
+        forward_deadline = time.perf_counter() + self.time_budget_ms * 0.65 / 1000.0
+        
+        if optimized.get('forward_lines'):
+            optimized['forward_lines'] = self._optimize_group(
+                optimized['forward_lines'], forwards, self.FORWARD_POSITIONS,
+                self.FORWARD_LINE_WEIGHTS, self._forward_line_value, forward_deadline
+            )
+        if optimized.get('defense_pairs'):
+            optimized['defense_pairs'] = self._optimize_group(
+                optimized['defense_pairs'], defensemen, self.DEFENSE_POSITIONS,
+                self.DEFENSE_PAIR_WEIGHTS, self._defense_pair_value, deadline
+            )
+        
+        return optimized
+    
+    def _rating_average(self, indices: Tuple[int, ...]) -> float:
+        ratings = [self._ratings[i] for i in indices if i >= 0 and self._ratings[i] > 0]
+        return sum(ratings) / len(ratings) if ratings else 0.0
+    
+    def _chemistry(self, raw_score: float) -> float:
+        normalized = self.chemistry_calculator._normalize_chemistry_score(raw_score)
+        return round(normalized * 2) / 2
+    
+    def _forward_line_value(self, unit: Tuple[int, ...], weight: float) -> float:
+        key = ('F', unit, weight)
+        value = self._unit_cache.get(key)
+        if value is None:
+            lw, c, rw = unit
+            chemistry = 0
+            if self.apply_chemistry and lw >= 0 and c >= 0 and rw >= 0:
+                compat = self._compat
+                chemistry = self._chemistry((compat[lw][c] * 0.4) + (compat[c][rw] * 0.4) + (compat[lw][rw] * 0.2))
+            value = weight * self._rating_average(unit) * (1 + chemistry / 100)
+            self._unit_cache[key] = value
+        return value
+    
+    def _defense_pair_value(self, unit: Tuple[int, ...], weight: float) -> float:
+        key = ('D', unit, weight)
+        value = self._unit_cache.get(key)
+        if value is None:
+            ld, rd = unit
+            chemistry = 0
+            if self.apply_chemistry and ld >= 0 and rd >= 0:
+                chemistry = self._chemistry(self._compat[ld][rd])
+            value = weight * self._rating_average(unit) * (1 + chemistry / 100)
+            self._unit_cache[key] = value
+        return value
+    
+    def _optimize_group(self, units: List[Dict[str, Any]], pool: List[Dict[str, Any]], positions: List[str],
+                        weights: List[float], unit_value, deadline: float) -> List[Dict[str, Any]]:
+        """Search one group (forward lines or defense pairs) and rebuild its unit dictionaries."""
+        n_units = min(len(units), len(weights))
+        matrix = self._matrix
+        
+        # columns[p][k] is the matrix index at position p on unit k; slots past n_units are extras
+        columns = []
+        for pos in positions:
+            column = []
+            for k in range(n_units):
+                player = units[k].get(pos) if isinstance(units[k], dict) else None
+                i = matrix.index_of(player) if isinstance(player, dict) else None
+                column.append(-1 if i is None else i)
+            columns.append(column)
+        
+        # Add the extras at their primary position (players already in the lineup stay where they are)
+        used = {i for column in columns for i in column if i >= 0}
+        for p, pos in enumerate(positions):
+            for player in pool or []:
+                if player.get('position_primary') == pos:
+                    i = matrix.index_of(player)
+                    if i is not None and i not in used:
+                        columns[p].append(i)
+                        used.add(i)
+        
+        def unit_at(cols, k):
+            return tuple(col[k] for col in cols)
+        
+        def total(cols):
+            return sum(unit_value(unit_at(cols, k), weights[k]) for k in range(n_units))
+        
+        def climb(cols):
+            """Steepest-ascent over swaps within a position column."""
+            current = [list(col) for col in cols]
+            while True:
+                best_delta = 1e-9
+                best_move = None
+                for p, col in enumerate(current):
+                    for a in range(n_units):
+                        for b in range(a + 1, len(col)):
+                            if col[a] == col[b]:
+                                continue
+                            old = unit_value(unit_at(current, a), weights[a])
+                            col[a], col[b] = col[b], col[a]
+                            new = unit_value(unit_at(current, a), weights[a])
+                            if b < n_units:
+                                col[a], col[b] = col[b], col[a]
+                                old += unit_value(unit_at(current, b), weights[b])
+                                col[a], col[b] = col[b], col[a]
+                                new += unit_value(unit_at(current, b), weights[b])
+                            col[a], col[b] = col[b], col[a]
+                            self.iterations += 1
+                            if new - old > best_delta:
+                                best_delta = new - old
+                                best_move = (p, a, b)
+                if best_move is None:
+                    return current
+                p, a, b = best_move
+                current[p][a], current[p][b] = current[p][b], current[p][a]
+        
+        best = climb(columns)
+        best_value = total(best)
+        
+        # Random restarts around the best solution until the time budget runs out
+        swappable = [p for p, col in enumerate(best) if len(col) > 1]
+        stale = 0
+        while swappable and time.perf_counter() < deadline and stale < 50:
+            candidate = [list(col) for col in best]
+            for _ in range(2):
+                p = self.rng.choice(swappable)
+                a = self.rng.randrange(n_units)
+                b = self.rng.randrange(len(candidate[p]))
+                candidate[p][a], candidate[p][b] = candidate[p][b], candidate[p][a]
+            candidate = climb(candidate)
+            value = total(candidate)
+            if value > best_value + 1e-9:
+                best, best_value = candidate, value
+                stale = 0
+            else:
+                stale += 1
+        
+        # Rebuild the unit dictionaries in place of the originals
+        result = []
+        for k, unit in enumerate(units):
+            new_unit = dict(unit) if isinstance(unit, dict) else {}
+            if k < n_units:
+                for p, pos in enumerate(positions):
+                    i = best[p][k]
+                    new_unit[pos] = matrix.players[i] if i >= 0 else None
+            result.append(new_unit)
+        return result
+
+
 # API endpoints that utilize the line optimizer service
 
 @lines_bp.route("/formation/<team_abbreviation>", methods=['GET'])
@@ -516,7 +743,7 @@ def get_team_formation(team_abbreviation):
         # Generate optimal lines
         print(f"Generating optimal lines for {team_abbreviation}")
         try:
-            optimal_formation = formation.generate_optimal_lines()
+            optimal_formation = formation.generate_optimal_lines_cached()
             
             # Ensure all team rating fields are present and properly formatted
             if 'team_rating' in optimal_formation:
@@ -577,7 +804,7 @@ def get_team_chemistry(team_abbreviation):
             
         # Get chemistry without recalculating lines
         print(f"Getting chemistry for {team_abbreviation}")
-        chemistry = formation.get_optimal_lines().get('chemistry', {})
+        chemistry = formation.generate_optimal_lines_cached().get('chemistry', {})
         
         print(f"Successfully retrieved chemistry for {team_abbreviation}")
         return jsonify(chemistry), 200
@@ -243,6 +243,10 @@ class PlayerService:
         db.session.add(new_player)
         db.session.commit()
         
+        # A new player may belong to a cached draft class
+        from .draft.draft_ranking import invalidate_draft_boards
+        invalidate_draft_boards()
+        
         return new_player.to_dict()
     
     @staticmethod
@@ -261,6 +265,8 @@ class PlayerService:
         if not player:
             return None
             
+        previous_team_id = player.team_id
+        
         # Update player attributes
         for key, value in player_data.items():
             if hasattr(player, key):
@@ -268,6 +274,24 @@ class PlayerService:
         
         db.session.commit()
         
+        # Drop cached formations for the player's old and new team
+        from .formation_cache import invalidate_roster_change
+        invalidate_roster_change(player_id=player_id, team_id=previous_team_id)
+        invalidate_roster_change(team_id=player.team_id)
+        
+        # Ratings, age or team may have changed the player's trade value; the
+        # index groups teams by abbreviation (to_dict() has the team's name)
+        from .trade_value_index import refresh_trade_value
+        columns = Player.__table__.columns.keys()
+        changes = {key: getattr(player, key) for key in player_data if key in columns}
+        if 'team_id' in player_data:
+            changes['team'] = player.team.abbreviation if player.team else None
+        refresh_trade_value(player_id, changes)
+        
+        # Keep cached draft boards in sync with the changed fields
+        from .draft.draft_ranking import LOCAL_SOURCE, prospect_changed
+        prospect_changed(player_id, player_data, LOCAL_SOURCE)
+        
         return player.to_dict()
     
     @staticmethod
@@ -288,6 +312,9 @@ class PlayerService:
         db.session.delete(player)
         db.session.commit()
         
+        from .draft.draft_ranking import LOCAL_SOURCE, remove_prospects
+        remove_prospects([player_id], LOCAL_SOURCE)
+        
         return True
 
 
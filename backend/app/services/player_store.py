@@ -0,0 +1,422 @@
+from typing import Dict, List, Any, Optional, Iterable
+import threading
+import numpy as np
+
+# Field aliases, in order of preference, resolved once when a player is loaded
+OVERALL_FIELDS = ('overall_rating', 'overall', 'rating', 'card_overall', 'ovr')
+POSITION_FIELDS = ('position_primary', 'position')
+
+# Initial number of rows allocated for each column
+INITIAL_CAPACITY = 1024
+
+
+def normalize_overall(player: Dict[str, Any]) -> Optional[float]:
+    """
+    Resolve a player's overall rating from the known alias fields.
+
+    Args:
+        player: Player dictionary
+
+    Returns:
+        The first alias value that converts to a float, or None
+    """
+    for field in OVERALL_FIELDS:
+        value = player.get(field)
+        if value is None:
+            continue
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str) and value.strip():
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                continue
+    return None
+
+
+def normalize_position(player: Dict[str, Any]) -> str:
+    """Resolve a player's primary position from the known alias fields."""
+    for field in POSITION_FIELDS:
+        value = player.get(field)
+        if value:
+            return str(value)
+    return ''
+
+
+def _to_float(value: Any) -> float:
+    """Convert a value to float, using NaN for missing or invalid values."""
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+class PlayerRow:
+    """
+    Lightweight read-only view of one row of the PlayerStore.
+
+    Holds only the store and the row index; attribute values are read from
+    the underlying columns on access.
+    """
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'PlayerStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def id(self) -> Any:
+        return self._store._ids[self._index]
+
+    @property
+    def overall(self) -> Optional[float]:
+        value = self._store._numeric['overall'][self._index]
+        return None if np.isnan(value) else float(value)
+
+    @property
+    def age(self) -> Optional[float]:
+        value = self._store._numeric['age'][self._index]
+        return None if np.isnan(value) else float(value)
+
+    @property
+    def weight(self) -> Optional[float]:
+        value = self._store._numeric['weight'][self._index]
+        return None if np.isnan(value) else float(value)
+
+    @property
+    def position(self) -> str:
+        return self._store._category_value('position', self._index) or ''
+
+    def get(self, field: str, default: Any = None) -> Any:
+        """Dictionary-style access to any stored column."""
+        value = self._store._value(field, self._index)
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the normalized row as a dictionary."""
+        return {field: self.get(field) for field in self._store.fields()}
+
+    def __repr__(self) -> str:
+        return f"PlayerRow(id={self.id!r}, overall={self.overall}, position={self.position!r})"
+
+
+class PlayerStore:
+    """
+    Process-wide columnar store of normalized player attributes.
+
+    Player dictionaries coming from Supabase or SQLAlchemy use several names
+    for the same attribute (overall_rating/overall/rating/..., position_primary/
+    position). The store resolves those aliases once when a player is loaded
+    and keeps the values in NumPy arrays (struct-of-arrays) indexed by player
+    id. Numeric attributes are float64 columns with NaN for missing values;
+    string attributes are dictionary-encoded into int32 code columns.
+    """
+
+    # Numeric columns and the dictionary field(s) each one is loaded from
+    NUMERIC_COLUMNS = {
+        'overall': None,  # Resolved through OVERALL_FIELDS
+        'age': ('age',),
+        'weight': ('weight',),
+    }
+
+    # Dictionary-encoded string columns and their source fields
+    CATEGORY_COLUMNS = {
+        'position': None,  # Resolved through POSITION_FIELDS
+        'player_type': ('player_type',),
+        'team': ('team',),
+        'nationality': ('nationality',),
+        'league': ('league',),
+        'height': ('height',),
+        'potential': ('potential',),
+        'potential_precision': ('potential_precision',),
+        'potential_volatility': ('potential_volatility',),
+    }
+
+    # Plain object columns
+    OBJECT_COLUMNS = ('first_name', 'last_name', 'team_id')
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self._lock = threading.RLock()
+        self._capacity = 0
+        self._size = 0
+        self._index = {}
+        self._ids = np.empty(0, dtype=object)
+        self._valid = np.zeros(0, dtype=bool)
+        self._numeric = {name: np.empty(0, dtype=np.float64) for name in self.NUMERIC_COLUMNS}
+        self._codes = {name: np.empty(0, dtype=np.int32) for name in self.CATEGORY_COLUMNS}
+        self._objects = {name: np.empty(0, dtype=object) for name in self.OBJECT_COLUMNS}
+        self._categories = {name: [] for name in self.CATEGORY_COLUMNS}
+        self._category_index = {name: {} for name in self.CATEGORY_COLUMNS}
+        self.version = 0
+        self._grow(capacity)
+
+    # ------------------------------------------------------------------
+    # Storage management
+    # ------------------------------------------------------------------
+
+    def _grow(self, minimum: int) -> None:
+        """Grow every column to hold at least `minimum` rows."""
+        if minimum <= self._capacity:
+            return
+        capacity = max(minimum, self._capacity * 2, 1)
+
+        def extend(array, fill, dtype):
+            grown = np.full(capacity, fill, dtype=dtype)
+            grown[:self._size] = array[:self._size]
+            return grown
+
+        self._ids = extend(self._ids, None, object)
+        self._valid = extend(self._valid, False, bool)
+        for name in self._numeric:
+            self._numeric[name] = extend(self._numeric[name], np.nan, np.float64)
+        for name in self._codes:
+            self._codes[name] = extend(self._codes[name], -1, np.int32)
+        for name in self._objects:
+            self._objects[name] = extend(self._objects[name], None, object)
+        self._capacity = capacity
+
+    def _encode(self, column: str, value: Any) -> int:
+        """Return the dictionary code for a string value, adding it if new."""
+        if value is None or value == '':
+            return -1
+        value = str(value)
+        index = self._category_index[column]
+        code = index.get(value)
+        if code is None:
+            code = len(self._categories[column])
+            self._categories[column].append(value)
+            index[value] = code
+        return code
+
+    def _category_value(self, column: str, row: int) -> Optional[str]:
+        code = self._codes[column][row]
+        return self._categories[column][code] if code >= 0 else None
+
+    def _value(self, field: str, row: int) -> Any:
+        if field == 'id':
+            return self._ids[row]
+        if field in self._numeric:
+            value = self._numeric[field][row]
+            return None if np.isnan(value) else float(value)
+        if field in self._codes:
+            return self._category_value(field, row)
+        if field in self._objects:
+            return self._objects[field][row]
+        return None
+
+    def _write_row(self, row: int, player: Dict[str, Any]) -> None:
+        """Normalize one player dictionary into row `row`."""
+        self._numeric['overall'][row] = _to_float(normalize_overall(player))
+        for name, fields in self.NUMERIC_COLUMNS.items():
+            if fields:
+                self._numeric[name][row] = _to_float(player.get(fields[0]))
+
+        self._codes['position'][row] = self._encode('position', normalize_position(player))
+        for name, fields in self.CATEGORY_COLUMNS.items():
+            if fields:
+                self._codes[name][row] = self._encode(name, player.get(fields[0]))
+
+        for name in self.OBJECT_COLUMNS:
+            self._objects[name][row] = player.get(name)
+
+        self._valid[row] = True
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def upsert(self, player: Dict[str, Any]) -> Optional[int]:
+        """
+        Insert or refresh a single player.
+
+        Args:
+            player: Player dictionary (must have an 'id')
+
+        Returns:
+            Row index of the player, or None if the player has no id
+        """
+        if not isinstance(player, dict) or player.get('id') is None:
+            return None
+
+        player_id = player['id']
+        with self._lock:
+            row = self._index.get(player_id)
+            if row is None:
+                self._grow(self._size + 1)
+                row = self._size
+                self._size += 1
+                self._ids[row] = player_id
+                self._index[player_id] = row
+            self._write_row(row, player)
+            self.version += 1
+        return row
+
+    def load(self, players: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or refresh many players.
+
+        Args:
+            players: Iterable of player dictionaries
+
+        Returns:
+            Number of players loaded
+        """
+        players = [p for p in (players or []) if isinstance(p, dict) and p.get('id') is not None]
+        with self._lock:
+            self._grow(self._size + len(players))
+            for player in players:
+                self.upsert(player)
+        return len(players)
+
+    def remove(self, player_id: Any) -> bool:
+        """Remove a player from the store. Returns True if it was present."""
+        with self._lock:
+            row = self._index.pop(player_id, None)
+            if row is None:
+                return False
+            self._valid[row] = False
+            self.version += 1
+        return True
+
+    def clear(self) -> None:
+        """Remove every player."""
+        with self._lock:
+            self.__init__(self._capacity or INITIAL_CAPACITY)
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, player_id: Any) -> bool:
+        return player_id in self._index
+
+    def fields(self) -> List[str]:
+        """Names of every stored column."""
+        return ['id'] + list(self.NUMERIC_COLUMNS) + list(self.CATEGORY_COLUMNS) + list(self.OBJECT_COLUMNS)
+
+    def index_of(self, player_id: Any) -> Optional[int]:
+        """Return the row index of a player id, or None."""
+        return self._index.get(player_id)
+
+    def row(self, player_id: Any) -> Optional[PlayerRow]:
+        """Return a row view for a player id, or None if it is not stored."""
+        row = self._index.get(player_id)
+        return PlayerRow(self, row) if row is not None else None
+
+    def rows(self, player_ids: Iterable[Any]) -> np.ndarray:
+        """
+        Return row indices for a list of player ids.
+
+        Unknown ids map to -1.
+        """
+        index = self._index
+        return np.array([index.get(player_id, -1) for player_id in player_ids], dtype=np.intp)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Return a read-only view of a column over every allocated row.
+
+        Numeric columns are float64 (NaN for missing), category columns are
+        int32 codes (-1 for missing) and object columns hold raw values.
+        Removed rows are still present; use `valid_mask()` to filter them.
+        """
+        if name in self._numeric:
+            array = self._numeric[name]
+        elif name in self._codes:
+            array = self._codes[name]
+        elif name in self._objects:
+            array = self._objects[name]
+        elif name == 'id':
+            array = self._ids
+        else:
+            raise KeyError(f"Unknown player store column: {name}")
+        view = array[:self._size]
+        view.flags.writeable = False
+        return view
+
+    def valid_mask(self) -> np.ndarray:
+        """Boolean mask of rows that are currently stored."""
+        return self._valid[:self._size].copy()
+
+    def categories(self, name: str) -> List[str]:
+        """Return the value list for a dictionary-encoded column (code -> value)."""
+        return list(self._categories[name])
+
+    def gather(self, name: str, player_ids: Iterable[Any], default: Any = np.nan) -> np.ndarray:
+        """
+        Gather one column for a list of player ids.
+
+        Numeric columns return float64 values, category columns return the
+        decoded strings (as an object array). Unknown ids and missing values
+        return `default`.
+        """
+        rows = self.rows(player_ids)
+        known = rows >= 0
+
+        if name in self._numeric:
+            values = np.full(len(rows), np.nan, dtype=np.float64)
+            values[known] = self._numeric[name][rows[known]]
+            if not (isinstance(default, float) and np.isnan(default)):
+                values = np.where(np.isnan(values), default, values)
+            return values
+
+        values = np.full(len(rows), default, dtype=object)
+        for i in np.flatnonzero(known):
+            value = self._value(name, rows[i])
+            if value is not None:
+                values[i] = value
+        return values
+
+    def overall_of(self, player: Any, default: Optional[float] = None) -> Optional[float]:
+        """
+        Return a player's overall rating.
+
+        The dictionary's own fields win, so a freshly fetched row is never
+        scored on a stale stored rating; the store only fills in a rating
+        the dictionary does not have.
+        """
+        if not isinstance(player, dict):
+            return default
+        value = normalize_overall(player)
+        if value is not None:
+            return value
+        row = self._index.get(player.get('id'))
+        if row is not None:
+            value = self._numeric['overall'][row]
+            if not np.isnan(value):
+                return float(value)
+        return default
+
+    def position_of(self, player: Any, default: str = '') -> str:
+        """Return a player's primary position, from the store when the dictionary has none."""
+        if not isinstance(player, dict):
+            return default
+        value = normalize_position(player)
+        if value:
+            return value
+        row = self._index.get(player.get('id'))
+        if row is not None:
+            value = self._category_value('position', row)
+            if value:
+                return value
+        return default
+
+    def stats(self) -> Dict[str, int]:
+        """Return store size information."""
+        with self._lock:
+            return {'players': len(self._index), 'rows': self._size, 'capacity': self._capacity, 'version': self.version}
+
+
+# Process-wide store instance
+_player_store = PlayerStore()
+
+
+def get_player_store() -> PlayerStore:
+    """Return the process-wide PlayerStore."""
+    return _player_store
@@ -1,16 +1,18 @@
 from typing import Dict, List, Any, Tuple, Optional
 import copy
 import os
-from supabase import create_client, Client
+import time
+from supabase import Client
 from flask import Blueprint, jsonify, request
 import traceback
 from ..services.player import Player
 from ..services.team_service import Team
 from ..extensions import db
-from ..supabase_client import get_supabase_client
+from ..supabase_client import get_supabase_client, get_pooled_client
 from .chemistry import ChemistryCalculator
 from .coach import CoachStrategy
-from .lines import LineOptimizer
+from .lines import LineOptimizer, LineSearch
+from .player_store import get_player_store
 from collections import namedtuple
 
 # Create a blueprint for team rating endpoints
@@ -29,6 +31,32 @@ class TeamFormation:
     APPLY_CHEMISTRY_EFFECTS = True  # Set to False to disable all chemistry effects on ratings
     APPLY_COACH_EFFECTS = True      # Set to False to disable all coach effects on ratings
     
+    # Weight of each component in the overall team rating
+    COMPONENT_WEIGHTS = {
+        'line_1': 0.17,
+        'line_2': 0.11,
+        'line_3': 0.08,
+        'line_4': 0.04,
+        'pair_1': 0.11,
+        'pair_2': 0.07,
+        'pair_3': 0.05,
+        'power_play_1': 0.08,
+        'power_play_2': 0.03,
+        'penalty_kill_1': 0.08,
+        'penalty_kill_2': 0.03,
+        'other_special_teams': 0.02,
+        'shootout': 0.03,
+        'goaltending': 0.10
+    }
+    
+    # Components that make up each category rating
+    OFFENSE_COMPONENTS = {'line_1', 'line_2', 'line_3', 'line_4'}
+    DEFENSE_COMPONENTS = {'pair_1', 'pair_2', 'pair_3'}
+    SPECIAL_TEAMS_COMPONENTS = {'power_play_1', 'power_play_2', 'penalty_kill_1', 'penalty_kill_2', 'other_special_teams'}
+    
+    # Time budget for the line/pair search in _optimize_lines_by_chemistry
+    LINE_SEARCH_TIME_BUDGET_MS = float(os.environ.get("LINE_SEARCH_TIME_BUDGET_MS", 50))
+    
     def __init__(self, team_abbreviation: str, supabase_client=None, debug=False):
         """
         Initialize the team formation service.
@@ -64,6 +92,15 @@ class TeamFormation:
         # Database connection
         self.players = []
         self.team = None
+        self.coach = None
+        
+        # Last generate_optimal_lines() output (see generate_optimal_lines_cached)
+        self.lines = None
+        
+        # Per-component state of the last full rating, used by update_current_lines
+        self._rating_state = None
+        self._last_base_components = None
+        self._last_goalie_rating = 0
     
     def initialize(self) -> bool:
         """
@@ -83,10 +120,10 @@ class TeamFormation:
                 print(f"TeamFormation: Missing Supabase credentials - URL: {bool(url)}, Key: {bool(key)}")
                 # Continue without Supabase, using fallback methods
             else:                
-                print(f"TeamFormation: Creating Supabase client")
+                print(f"TeamFormation: Getting pooled Supabase client")
                 try:
-                    self.supabase_client = create_client(url, key)
-                    print("TeamFormation: Supabase client created successfully")
+                    self.supabase_client = get_pooled_client(url, key)
+                    print("TeamFormation: Supabase client ready")
                 except Exception as supabase_error:
                     print(f"TeamFormation: Error creating Supabase client: {supabase_error}")
                     # Continue without Supabase client
@@ -125,37 +162,7 @@ class TeamFormation:
                 print(f"TeamFormation: Found {len(self.players)} players")
                 
             # Initialize line optimizer with players
-            print("TeamFormation: Initializing line optimizer with players")
-            self.line_optimizer.players = self.players
-            
-            try:
-                # Try to categorize players by position
-                forwards = [p for p in self.players if p.get('position_primary') in ['LW', 'C', 'RW']]
-                forwards_count = len(forwards)
-                self.line_optimizer.forwards = forwards
-                
-                defensemen = [p for p in self.players if p.get('position_primary') in ['LD', 'RD']]
-                defensemen_count = len(defensemen)
-                self.line_optimizer.defensemen = defensemen
-                
-                goalies = [p for p in self.players if p.get('position_primary') in ['G', 'Goalie']]
-                goalies_count = len(goalies)
-                self.line_optimizer.goalies = goalies
-                
-                print(f"TeamFormation: Categorized players - {forwards_count} forwards, {defensemen_count} defensemen, {goalies_count} goalies")
-                
-                # Sort by overall rating
-                print("TeamFormation: Sorting players by overall rating")
-                self.line_optimizer.forwards.sort(key=lambda p: p.get('overall_rating', 0), reverse=True)
-                self.line_optimizer.defensemen.sort(key=lambda p: p.get('overall_rating', 0), reverse=True)
-                self.line_optimizer.goalies.sort(key=lambda p: p.get('overall_rating', 0), reverse=True)
-            except Exception as position_error:
-                print(f"TeamFormation: Error categorizing players by position: {position_error}")
-                traceback.print_exc()
-                # Create empty lists if categorization fails
-                self.line_optimizer.forwards = []
-                self.line_optimizer.defensemen = []
-                self.line_optimizer.goalies = []
+            self.load_roster(self.players)
             
             # Fetch coach data
             print(f"TeamFormation: Fetching coach data for coach ID: {self.team.get('coach_id')}")
@@ -185,6 +192,69 @@ class TeamFormation:
             traceback.print_exc()
             return False
 
+    def load_roster(self, players: List[Dict[str, Any]], team: Optional[Dict[str, Any]] = None,
+                    coach: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Load an already-fetched roster into the formation without any database access.
+        
+        Used by initialize() and by the batch rating engine, which fetches every
+        roster in one query and builds formations from the grouped players.
+        
+        Args:
+            players: List of player dictionaries for this team
+            team: Optional team dictionary (sets self.team when provided)
+            coach: Optional coach dictionary used to build the coach strategy
+        """
+        self.players = players or []
+        if team is not None:
+            self.team = team
+        if coach is not None:
+            self.coach = coach
+            self.coach_strategy = CoachStrategy(coach)
+        
+        # Normalize the roster into the shared player store
+        store = get_player_store()
+        store.load(self.players)
+        
+        print("TeamFormation: Initializing line optimizer with players")
+        self.line_optimizer.players = self.players
+        
+        try:
+            # Try to categorize players by position
+            forwards = [p for p in self.players if p.get('position_primary') in ['LW', 'C', 'RW']]
+            forwards_count = len(forwards)
+            self.line_optimizer.forwards = forwards
+            
+            defensemen = [p for p in self.players if p.get('position_primary') in ['LD', 'RD']]
+            defensemen_count = len(defensemen)
+            self.line_optimizer.defensemen = defensemen
+            
+            goalies = [p for p in self.players if p.get('position_primary') in ['G', 'Goalie']]
+            goalies_count = len(goalies)
+            self.line_optimizer.goalies = goalies
+            
+            print(f"TeamFormation: Categorized players - {forwards_count} forwards, {defensemen_count} defensemen, {goalies_count} goalies")
+            
+            # Sort by overall rating
+            print("TeamFormation: Sorting players by overall rating")
+            self.line_optimizer.forwards.sort(key=lambda p: store.overall_of(p, 0), reverse=True)
+            self.line_optimizer.defensemen.sort(key=lambda p: store.overall_of(p, 0), reverse=True)
+            self.line_optimizer.goalies.sort(key=lambda p: store.overall_of(p, 0), reverse=True)
+        except Exception as position_error:
+            print(f"TeamFormation: Error categorizing players by position: {position_error}")
+            traceback.print_exc()
+            # Create empty lists if categorization fails
+            self.line_optimizer.forwards = []
+            self.line_optimizer.defensemen = []
+            self.line_optimizer.goalies = []
+        
+        # Precompute pairwise chemistry for the roster
+        try:
+            self.chemistry_calculator.set_roster(self.players)
+        except Exception as matrix_error:
+            print(f"TeamFormation: Error building chemistry matrix: {matrix_error}")
+            self.chemistry_calculator.matrix = None
+
     def _get_team_by_abbreviation(self, abbreviation: str) -> Optional[Dict[str, Any]]:
         """Get team info by abbreviation."""
         try:
@@ -391,8 +461,17 @@ class TeamFormation:
                 traceback.print_exc()
                 optimized_lines = adjusted_lines
             
-            # Step 6: Calculate final team ratings
+            # Chemistry has to describe the final lines
+            if optimized_lines is not adjusted_lines:
+                try:
+                    line_chemistry = self._calculate_all_chemistry(optimized_lines)
+                except Exception as chemistry_error:
+                    print(f"TeamFormation: Error recalculating chemistry: {chemistry_error}")
+                    traceback.print_exc()
+            
+            # Step 6: Calculate final team ratings (chemistry modifiers come from the cache)
             print("TeamFormation: Calculating team ratings")
+            self.chemistry_cache = line_chemistry
             try:
                 self.team_rating = self._calculate_team_rating(optimized_lines)
             except Exception as rating_error:
@@ -411,6 +490,7 @@ class TeamFormation:
             
             # Store the resulting optimized lines
             self.optimal_lines = optimized_lines
+            self._rating_state = self._build_rating_state(optimized_lines)
             
             print(f"TeamFormation: Successfully generated optimal lines for {self.team_abbreviation}")
             
@@ -463,6 +543,44 @@ class TeamFormation:
                 }
             }
     
+    def generate_optimal_lines_cached(self) -> Dict[str, Any]:
+        """
+        Same as generate_optimal_lines(), served from the formation cache when
+        the roster and coach have not changed since the last run.
+        
+        Returns:
+            Dictionary with optimized line combinations
+        """
+        from .formation_cache import formation_cache, roster_key
+        from .time_played_store import get_time_played_store, player_key
+        
+        # Chemistry depends on the time the players have played together
+        time_played_version = get_time_played_store().roster_version(player_key(p) for p in self.players)
+        key = roster_key(self.players, self.coach, time_played_version)
+        cached = formation_cache.get(self.team_abbreviation, key)
+        
+        if cached is not None:
+            print(f"TeamFormation: Using cached formation for {self.team_abbreviation}")
+            self.optimal_lines = cached.get('lines', {})
+            self.team_rating = cached.get('team_rating', {})
+            self.lines = cached
+            return cached
+        
+        result = self.generate_optimal_lines()
+        
+        # Only cache successful runs (optimal_lines is left empty on error)
+        if self.optimal_lines:
+            formation_cache.put(
+                self.team_abbreviation,
+                key,
+                result,
+                team_id=(self.team or {}).get('id'),
+                player_ids=[p.get('id') for p in self.players]
+            )
+        
+        self.lines = result
+        return result
+    
     def _refine_special_teams(self, lines: Dict[str, Any]) -> Dict[str, Any]:
         """
         Refine special teams based on realistic NHL deployment patterns.
@@ -898,84 +1016,104 @@ class TeamFormation:
         }
         
         # Calculate forward line chemistry
-        forward_chemistry_sum = 0
         for i, line in enumerate(lines.get('forward_lines', [])):
-            # Skip empty lines
-            if 'Empty' in [line.get('LW'), line.get('C'), line.get('RW')]:
-                chemistry['forward_lines'].append(0)
-                continue
-                
-            # Get player list in consistent format for calculator
-            players = [line.get('LW'), line.get('C'), line.get('RW')]
-            
-            # Calculate chemistry
-            line_chem, factors = self.chemistry_calculator.calculate_forward_line_chemistry(players)
-            
-            # Store with line number
-            chemistry['forward_lines'].append({
-                'line': i + 1,
-                'chemistry': line_chem,
-                'factors': factors
-            })
-            
-            forward_chemistry_sum += line_chem
+            chemistry['forward_lines'].append(self._forward_line_chemistry_entry(i, line))
         
         # Calculate defense pair chemistry
-        defense_chemistry_sum = 0
         for i, pair in enumerate(lines.get('defense_pairs', [])):
-            # Skip empty pairs
-            if 'Empty' in [pair.get('LD'), pair.get('RD')]:
-                chemistry['defense_pairs'].append(0)
-                continue
-                
-            # Get player list in consistent format for calculator
-            players = [pair.get('LD'), pair.get('RD')]
-            
-            # Calculate chemistry
-            pair_chem, factors = self.chemistry_calculator.calculate_defense_pair_chemistry(players)
-            
-            # Store with pair number
-            chemistry['defense_pairs'].append({
-                'pair': i + 1,
-                'chemistry': pair_chem,
-                'factors': factors
-            })
-            
-            defense_chemistry_sum += pair_chem
+            chemistry['defense_pairs'].append(self._defense_pair_chemistry_entry(i, pair))
             
         # Calculate power play unit chemistry
-        pp_chemistry_sum = 0
         for i, unit_name in enumerate(['power_play_1', 'power_play_2']):
-            unit = lines.get(unit_name, {})
-            
-            # Calculate chemistry
-            unit_chem, factors = self.chemistry_calculator.calculate_pp_unit_chemistry(unit)
-            
-            # Store with unit number
-            chemistry['power_play'].append({
-                'unit': i + 1,
-                'chemistry': unit_chem,
-                'factors': factors
-            })
-            
-            pp_chemistry_sum += unit_chem
+            chemistry['power_play'].append(self._special_teams_chemistry_entry(i, lines.get(unit_name, {}), 'power_play'))
             
         # Calculate penalty kill unit chemistry
-        pk_chemistry_sum = 0
         for i, unit_name in enumerate(['penalty_kill_1', 'penalty_kill_2']):
-            unit = lines.get(unit_name, {})
+            chemistry['penalty_kill'].append(self._special_teams_chemistry_entry(i, lines.get(unit_name, {}), 'penalty_kill'))
             
-            # Calculate chemistry
-            unit_chem, factors = self.chemistry_calculator.calculate_pk_unit_chemistry(unit)
+        chemistry['overall'] = self._calculate_overall_chemistry(chemistry)
+        
+        return chemistry
+    
+    def _forward_line_chemistry_entry(self, i: int, line: Dict[str, Any]) -> Any:
+        """Chemistry entry for forward line i (0 for lines with an empty slot)."""
+        # Skip empty lines
+        if 'Empty' in [line.get('LW'), line.get('C'), line.get('RW')]:
+            return 0
             
-            # Store with unit number
-            chemistry['penalty_kill'].append({
-                'unit': i + 1,
-                'chemistry': unit_chem,
-                'factors': factors
-            })
+        # Get player list in consistent format for calculator
+        players = [line.get('LW'), line.get('C'), line.get('RW')]
+        
+        # Calculate chemistry
+        line_chem, factors = self.chemistry_calculator.calculate_forward_line_chemistry(players)
+        
+        # Store with line number
+        return {
+            'line': i + 1,
+            'chemistry': line_chem,
+            'factors': factors
+        }
+    
+    def _defense_pair_chemistry_entry(self, i: int, pair: Dict[str, Any]) -> Any:
+        """Chemistry entry for defense pair i (0 for pairs with an empty slot)."""
+        # Skip empty pairs
+        if 'Empty' in [pair.get('LD'), pair.get('RD')]:
+            return 0
+            
+        # Get player list in consistent format for calculator
+        players = [pair.get('LD'), pair.get('RD')]
+        
+        # Calculate chemistry
+        pair_chem, factors = self.chemistry_calculator.calculate_defense_pair_chemistry(players)
+        
+        # Store with pair number
+        return {
+            'pair': i + 1,
+            'chemistry': pair_chem,
+            'factors': factors
+        }
+    
+    def _special_teams_chemistry_entry(self, i: int, unit: Dict[str, Any], unit_type: str) -> Dict[str, Any]:
+        """Chemistry entry for power play or penalty kill unit i."""
+        if unit_type == 'power_play':
+            unit_chem, factors = self.chemistry_calculator.calculate_pp_unit_chemistry(unit)
+        else:
+            unit_chem, factors = self.chemistry_calculator.calculate_pk_unit_chemistry(unit)
+        
+        # Store with unit number
+        return {
+            'unit': i + 1,
+            'chemistry': unit_chem,
+            'factors': factors
+        }
+    
+    def _calculate_overall_chemistry(self, chemistry: Dict[str, Any]) -> float:
+        """
+        Overall team chemistry as a weighted average of the line, pair and unit chemistry.
+        
+        Args:
+            chemistry: Dictionary with forward_lines, defense_pairs, power_play and penalty_kill entries
             
-            pk_chemistry_sum += unit_chem
+        Returns:
+            Overall chemistry value (0.0 if there is nothing to average)
+        """
+        forward_chemistry_sum = 0
+        for entry in chemistry['forward_lines']:
+            if isinstance(entry, dict):
+                forward_chemistry_sum += entry['chemistry']
+        
+        defense_chemistry_sum = 0
+        for entry in chemistry['defense_pairs']:
+            if isinstance(entry, dict):
+                defense_chemistry_sum += entry['chemistry']
+        
+        pp_chemistry_sum = 0
+        for entry in chemistry['power_play']:
+            pp_chemistry_sum += entry['chemistry']
+        
+        pk_chemistry_sum = 0
+        for entry in chemistry['penalty_kill']:
+            pk_chemistry_sum += entry['chemistry']
             
         # Calculate overall team chemistry (weighted average)
         num_forward_lines = len([l for l in chemistry['forward_lines'] if l != 0])
@@ -1011,14 +1149,18 @@ class TeamFormation:
             
         # Calculate overall chemistry if we have any components
         if total_weight > 0:
-            chemistry['overall'] = weighted_sum / total_weight
+            return weighted_sum / total_weight
         
-        return chemistry
+        return 0.0
     
     def _optimize_lines_by_chemistry(self, lines: Dict[str, Any], chemistry: Dict[str, Any]) -> Dict[str, Any]:
         """
         Optimize line combinations based on chemistry values.
-        This may rearrange players to maximize chemistry.
+        
+        Searches forward-line and defense-pair assignments (players stay at their
+        primary position) for the best weighted rating plus chemistry, within
+        LINE_SEARCH_TIME_BUDGET_MS. The search starts from the current lines and
+        only keeps changes that improve the objective.
         
         Args:
             lines: Current line combinations
@@ -1027,30 +1169,18 @@ class TeamFormation:
         Returns:
             Optimized line combinations
         """
-        # For the initial implementation, we'll make minor adjustments
-        # In a more advanced version, this could use combinatorial optimization
+        search = LineSearch(
+            self.chemistry_calculator,
+            self.get_player_rating,
+            apply_chemistry=self.APPLY_CHEMISTRY_EFFECTS,
+            time_budget_ms=self.LINE_SEARCH_TIME_BUDGET_MS
+        )
         
-        # Create a copy to avoid modifying the original
-        optimized = copy.deepcopy(lines)
+        started = time.perf_counter()
+        optimized = search.optimize(lines, self.line_optimizer.forwards, self.line_optimizer.defensemen)
+        elapsed_ms = (time.perf_counter() - started) * 1000
         
-        # Example: If a forward line has negative chemistry, try swapping wingers
-        for i, line_chem in enumerate(chemistry.get('forward_lines', [])):
-            # Skip empty lines or lines with good chemistry
-            if isinstance(line_chem, int) or line_chem.get('chemistry', 0) >= 0:
-                continue
-                
-            # Try swapping wingers to improve chemistry
-            if i < len(optimized['forward_lines']):
-                line = optimized['forward_lines'][i]
-                # Swap LW and RW
-                line['LW'], line['RW'] = line['RW'], line['LW']
-                
-                # Check if chemistry improved (would require recalculation)
-                # For simplicity, we'll just assume it might help
-                
-        # More advanced optimization would go here
-        # This could involve trying different player combinations
-        # and keeping the ones with the best chemistry
+        print(f"TeamFormation: Line search evaluated {search.iterations} moves in {elapsed_ms:.1f} ms")
         
         return optimized
     
@@ -1066,26 +1196,14 @@ class TeamFormation:
         """
         print("\n=== CALCULATING TEAM RATINGS ===")
         
-        # Define weights for each component
-        weights = {
-            'line_1': 0.17,
-            'line_2': 0.11,
-            'line_3': 0.08,
-            'line_4': 0.04,
-            'pair_1': 0.11,
-            'pair_2': 0.07,
-            'pair_3': 0.05,
-            'power_play_1': 0.08,
-            'power_play_2': 0.03,
-            'penalty_kill_1': 0.08,
-            'penalty_kill_2': 0.03,
-            'other_special_teams': 0.02,
-            'shootout': 0.03,
-            'goaltending': 0.10
-        }
+        # Weights for each component
+        weights = self.COMPONENT_WEIGHTS
         
         # Initialize component ratings
         component_ratings = {}
+        rated_from_lines = False
+        self._last_base_components = None
+        goalie_rating = 0
         
         # If we have no valid line data but have valid player data, calculate from players directly
         if (not lines or not lines.get('forward_lines') or not lines.get('defense_pairs')) and self.players:
@@ -1156,6 +1274,7 @@ class TeamFormation:
         # Otherwise, calculate ratings from provided lines if available
         # (Keep the existing calculation from lines logic...)
         elif lines:
+            rated_from_lines = True
             print("\n--- FORWARD LINES ---")
             if 'forward_lines' in lines:
                 print(f"Number of forward lines: {len(lines['forward_lines'])}")
@@ -1366,79 +1485,21 @@ class TeamFormation:
             print("\n--- GOALTENDING ---")
             goalie_rating = 0
             if 'goalies' in lines:
-                goalies = lines['goalies']
-                
-                valid_goalies = [g for g in goalies if g and g != 'Empty']
-                if valid_goalies and len(valid_goalies) > 0:
-                    # For goaltending, prioritize the starter (weighted)
-                    starter_weight = 0.7
-                    backup_weight = 0.3
-                    
-                    # Identify starter and backup(s)
-                    starter = None
-                    backups = []
-                    
-                    for g in valid_goalies:
-                        g_type = g.get('G') if isinstance(g, dict) and 'G' in g else g
-                        if not g_type or g_type == 'Empty':
-                            continue
-                        
-                        if g.get('is_starter', False):
-                            starter = g_type
-                        else:
-                            backups.append(g_type)
-                    
-                    # If no explicit starter, use the first goalie
-                    if not starter and valid_goalies:
-                        starter = valid_goalies[0].get('G') if isinstance(valid_goalies[0], dict) and 'G' in valid_goalies[0] else valid_goalies[0]
-                        backups = [g.get('G') if isinstance(g, dict) and 'G' in g else g for g in valid_goalies[1:]]
-                    
-                    # Calculate weighted average
-                    weighted_sum = 0
-                    total_weight = 0
-                    
-                    if starter or backups:
-                        starter_rating = self.get_player_rating(starter)
-                        weighted_sum += starter_rating * starter_weight
-                        total_weight += starter_weight
-                        print(f"  Starter goalie rating: {starter_rating}")
-                    
-                    if backups:
-                        backup_ratings = []
-                        for backup in backups:
-                            backup_rating = self.get_player_rating(backup)
-                            backup_ratings.append(backup_rating)
-                        
-                        if backup_ratings:
-                            avg_backup = sum(backup_ratings) / len(backup_ratings)
-                            weighted_sum += avg_backup * backup_weight
-                            total_weight += backup_weight
-                            print(f"  Backup goalie rating: {avg_backup} (average of {backup_ratings})")
-                    
-                    if total_weight > 0:
-                        goalie_rating = weighted_sum / total_weight
-                        component_ratings['goaltending'] = round(goalie_rating, 1)
-                        print(f"  Weighted goaltending rating: {goalie_rating:.1f}")
-                    else:
-                        component_ratings['goaltending'] = 0
-                        print(f"  Goaltending Rating: 0 (could not calculate weighted rating)")
-                else:
-                    # This branch handles when there are no valid goalies at all (neither starter nor backups)
-                    component_ratings['goaltending'] = 0
-                    print(f"  Goaltending Rating: 0 (no valid goalies)")
+                goalie_rating = self._calculate_goaltending_rating(lines['goalies'])
+                component_ratings['goaltending'] = round(goalie_rating, 1)
+        
+        # Keep the pre-chemistry components so line edits can be re-rated incrementally
+        self._last_base_components = dict(component_ratings) if rated_from_lines else None
+        self._last_goalie_rating = goalie_rating
         
         # Apply chemistry effects to component ratings
         print("\n--- APPLYING CHEMISTRY EFFECTS ---")
         component_ratings = self._apply_chemistry_to_components(component_ratings)
         
         # Calculate main category ratings (offense, defense, special teams)
-        offense_components = {'line_1', 'line_2', 'line_3', 'line_4'}
-        defense_components = {'pair_1', 'pair_2', 'pair_3'}
-        special_teams_components = {'power_play_1', 'power_play_2', 'penalty_kill_1', 'penalty_kill_2', 'other_special_teams'}
-        
-        offense_rating = self._calculate_category_rating(component_ratings, weights, offense_components)
-        defense_rating = self._calculate_category_rating(component_ratings, weights, defense_components)
-        special_teams_rating = self._calculate_category_rating(component_ratings, weights, special_teams_components)
+        offense_rating = self._calculate_category_rating(component_ratings, weights, self.OFFENSE_COMPONENTS)
+        defense_rating = self._calculate_category_rating(component_ratings, weights, self.DEFENSE_COMPONENTS)
+        special_teams_rating = self._calculate_category_rating(component_ratings, weights, self.SPECIAL_TEAMS_COMPONENTS)
         
         # Calculate overall rating as weighted average of all components
         overall_rating = 0
@@ -1484,6 +1545,81 @@ class TeamFormation:
             'component_ratings': component_ratings
         }
     
+    def _calculate_goaltending_rating(self, goalies: List[Any], verbose: bool = True) -> float:
+        """
+        Goaltending rating weighted 70% starter / 30% average backup.
+        
+        Args:
+            goalies: Goalie entries from the lines (player dicts or {'G': player} entries)
+            verbose: Whether to print the calculation
+            
+        Returns:
+            Unrounded goaltending rating (0 if there are no valid goalies)
+        """
+        valid_goalies = [g for g in goalies if g and g != 'Empty']
+        if not valid_goalies:
+            # This branch handles when there are no valid goalies at all (neither starter nor backups)
+            if verbose:
+                print(f"  Goaltending Rating: 0 (no valid goalies)")
+            return 0
+        
+        # For goaltending, prioritize the starter (weighted)
+        starter_weight = 0.7
+        backup_weight = 0.3
+        
+        # Identify starter and backup(s)
+        starter = None
+        backups = []
+        
+        for g in valid_goalies:
+            g_type = g.get('G') if isinstance(g, dict) and 'G' in g else g
+            if not g_type or g_type == 'Empty':
+                continue
+            
+            if g.get('is_starter', False):
+                starter = g_type
+            else:
+                backups.append(g_type)
+        
+        # If no explicit starter, use the first goalie
+        if not starter and valid_goalies:
+            starter = valid_goalies[0].get('G') if isinstance(valid_goalies[0], dict) and 'G' in valid_goalies[0] else valid_goalies[0]
+            backups = [g.get('G') if isinstance(g, dict) and 'G' in g else g for g in valid_goalies[1:]]
+        
+        # Calculate weighted average
+        weighted_sum = 0
+        total_weight = 0
+        
+        if starter or backups:
+            starter_rating = self.get_player_rating(starter)
+            weighted_sum += starter_rating * starter_weight
+            total_weight += starter_weight
+            if verbose:
+                print(f"  Starter goalie rating: {starter_rating}")
+        
+        if backups:
+            backup_ratings = []
+            for backup in backups:
+                backup_rating = self.get_player_rating(backup)
+                backup_ratings.append(backup_rating)
+            
+            if backup_ratings:
+                avg_backup = sum(backup_ratings) / len(backup_ratings)
+                weighted_sum += avg_backup * backup_weight
+                total_weight += backup_weight
+                if verbose:
+                    print(f"  Backup goalie rating: {avg_backup} (average of {backup_ratings})")
+        
+        if total_weight > 0:
+            goalie_rating = weighted_sum / total_weight
+            if verbose:
+                print(f"  Weighted goaltending rating: {goalie_rating:.1f}")
+            return goalie_rating
+        
+        if verbose:
+            print(f"  Goaltending Rating: 0 (could not calculate weighted rating)")
+        return 0
+    
     def _apply_chemistry_to_components(self, component_ratings: Dict[str, float]) -> Dict[str, float]:
         """
         Apply chemistry bonuses/penalties to individual component ratings.
@@ -1630,6 +1766,9 @@ class TeamFormation:
     
     def get_optimal_lines(self) -> Dict[str, Any]:
         """Get the current optimal lines with all adjustments and calculations."""
+        if not self.lines and self.players:
+            self.generate_optimal_lines_cached()
+        
         if not self.lines:
             # Return an empty structure if no lines are available
             return {
@@ -1656,12 +1795,25 @@ class TeamFormation:
         """
         Update the current line combinations with user changes.
         
+        Only the lines, pairs and special teams units that changed since the
+        last rating are re-rated (see evaluate_line_changes); the full
+        calculation runs when there is no previous rating to patch.
+        
         Args:
             lines: New line combinations
             
         Returns:
             Updated line data with chemistry calculations
         """
+        if self._rating_state is not None:
+            try:
+                result = self.evaluate_line_changes(lines)
+                if result is not None:
+                    return result
+            except Exception as delta_error:
+                print(f"TeamFormation: Error in incremental re-rating, recalculating: {delta_error}")
+                traceback.print_exc()
+        
         # Store the new lines
         self.current_lines = lines
         
@@ -1671,13 +1823,277 @@ class TeamFormation:
         
         # Calculate team rating with the new lines
         self.team_rating = self._calculate_team_rating(lines)
+        self._rating_state = self._build_rating_state(lines)
         
         return {
             'lines': self.current_lines,
             'chemistry': line_chemistry,
-            'team_rating': self.team_rating
+            'team_rating': self.team_rating,
+            'changed_components': list(self.COMPONENT_WEIGHTS.keys())
         }
     
+    def evaluate_line_changes(self, lines: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Re-rate only the components whose players changed since the last rating.
+        
+        Compares per-component player signatures with the cached state, recomputes
+        rating and chemistry for the changed lines, pairs and units, and patches the
+        affected category ratings and the overall rating. Results are identical to
+        a full _calculate_team_rating run on the same lines.
+        
+        Args:
+            lines: New line combinations
+            
+        Returns:
+            Same structure as update_current_lines, or None if the lines can't be
+            patched (no cached state, or lines without forward lines/defense pairs)
+        """
+        state = self._rating_state
+        if state is None or not lines or not lines.get('forward_lines') or not lines.get('defense_pairs'):
+            return None
+        
+        # Which rating components and chemistry entries changed
+        signatures = self._component_signatures(lines)
+        changed = {
+            component for component in set(signatures) | set(state['signatures'])
+            if signatures.get(component) != state['signatures'].get(component)
+        }
+        
+        chemistry = {
+            'forward_lines': list(self.chemistry_cache.get('forward_lines', [])),
+            'defense_pairs': list(self.chemistry_cache.get('defense_pairs', [])),
+            'power_play': list(self.chemistry_cache.get('power_play', [])),
+            'penalty_kill': list(self.chemistry_cache.get('penalty_kill', [])),
+            'overall': self.chemistry_cache.get('overall', 0.0)
+        }
+        chemistry_signatures = self._chemistry_signatures(lines)
+        
+        for group, component_prefix in (('forward_lines', 'line'), ('defense_pairs', 'pair')):
+            units = lines.get(group, [])
+            new_signatures = chemistry_signatures[group]
+            old_signatures = state['chemistry_signatures'][group]
+            if len(chemistry[group]) != len(units):
+                chemistry[group] = [None] * len(units)
+                old_signatures = [None] * len(units)
+            for i, unit in enumerate(units):
+                if i >= len(old_signatures) or new_signatures[i] != old_signatures[i]:
+                    if group == 'forward_lines':
+                        chemistry[group][i] = self._forward_line_chemistry_entry(i, unit)
+                    else:
+                        chemistry[group][i] = self._defense_pair_chemistry_entry(i, unit)
+                    changed.add(f'{component_prefix}_{i + 1}')
+        
+        for group in ('power_play', 'penalty_kill'):
+            for i in range(2):
+                if chemistry_signatures[group][i] != state['chemistry_signatures'][group][i] or len(chemistry[group]) != 2:
+                    if len(chemistry[group]) != 2:
+                        chemistry[group] = [self._special_teams_chemistry_entry(k, lines.get(f'{group}_{k + 1}', {}), group) for k in range(2)]
+                    else:
+                        chemistry[group][i] = self._special_teams_chemistry_entry(i, lines.get(f'{group}_{i + 1}', {}), group)
+                    changed.add(f'{group}_{i + 1}')
+        
+        chemistry['overall'] = self._calculate_overall_chemistry(chemistry)
+        self.chemistry_cache = chemistry
+        
+        # Recompute the changed components (before and after chemistry)
+        base = dict(state['base'])
+        goalie_rating = state['goalie_rating']
+        for component in changed:
+            if component not in signatures:
+                base.pop(component, None)
+            elif component == 'goaltending':
+                goalie_rating = self._calculate_goaltending_rating(lines['goalies'], verbose=False)
+                base[component] = round(goalie_rating, 1)
+            else:
+                base[component] = self._average_player_rating(self._component_players(lines, component))
+        if 'goaltending' not in signatures:
+            goalie_rating = 0
+        
+        chemistry_by_component = self._chemistry_by_component(chemistry)
+        components = dict(state['components'])
+        for component in changed:
+            if component not in base:
+                components.pop(component, None)
+                continue
+            rating = base[component]
+            chemistry_value = chemistry_by_component.get(component)
+            if chemistry_value is not None:
+                rating = rating * (1.0 + (chemistry_value / 100))
+            components[component] = round(rating, 1)
+        
+        # Keep the component order used by the full calculation
+        order = list(self.COMPONENT_WEIGHTS.keys())
+        components = {k: components[k] for k in sorted(components, key=lambda k: order.index(k) if k in order else len(order))}
+        
+        # Patch only the categories that contain a changed component
+        categories = dict(state['categories'])
+        for category, category_components in (('offense', self.OFFENSE_COMPONENTS),
+                                              ('defense', self.DEFENSE_COMPONENTS),
+                                              ('special_teams', self.SPECIAL_TEAMS_COMPONENTS)):
+            if changed & category_components:
+                categories[category] = self._calculate_category_rating(components, self.COMPONENT_WEIGHTS, category_components)
+        
+        overall_rating = 0
+        total_weight = 0
+        for component, rating in components.items():
+            if component in self.COMPONENT_WEIGHTS and rating > 0:
+                overall_rating += rating * self.COMPONENT_WEIGHTS[component]
+                total_weight += self.COMPONENT_WEIGHTS[component]
+        overall_rating = overall_rating / total_weight if total_weight > 0 else 0
+        overall_rating = overall_rating * state['coach_multiplier']
+        
+        self.team_rating = {
+            'overall': min(99, max(0, round(overall_rating, 1))),
+            'offense': min(99, max(0, round(categories['offense'], 1))),
+            'defense': min(99, max(0, round(categories['defense'], 1))),
+            'special_teams': min(99, max(0, round(categories['special_teams'], 1))),
+            'goaltending': min(99, max(0, round(goalie_rating, 1))),
+            'component_ratings': components
+        }
+        
+        self.current_lines = lines
+        self._rating_state = {
+            'signatures': signatures,
+            'chemistry_signatures': chemistry_signatures,
+            'base': base,
+            'components': components,
+            'categories': categories,
+            'goalie_rating': goalie_rating,
+            'coach_multiplier': state['coach_multiplier']
+        }
+        
+        return {
+            'lines': self.current_lines,
+            'chemistry': chemistry,
+            'team_rating': self.team_rating,
+            'changed_components': [k for k in order if k in changed]
+        }
+    
+    def _build_rating_state(self, lines: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Snapshot the last full rating of these lines for incremental updates."""
+        if not self._last_base_components or not self.team_rating or 'component_ratings' not in self.team_rating:
+            return None
+        
+        components = self.team_rating['component_ratings']
+        return {
+            'signatures': self._component_signatures(lines),
+            'chemistry_signatures': self._chemistry_signatures(lines),
+            'base': dict(self._last_base_components),
+            'components': dict(components),
+            'categories': {
+                'offense': self._calculate_category_rating(components, self.COMPONENT_WEIGHTS, self.OFFENSE_COMPONENTS),
+                'defense': self._calculate_category_rating(components, self.COMPONENT_WEIGHTS, self.DEFENSE_COMPONENTS),
+                'special_teams': self._calculate_category_rating(components, self.COMPONENT_WEIGHTS, self.SPECIAL_TEAMS_COMPONENTS)
+            },
+            'goalie_rating': self._last_goalie_rating,
+            # The coach bonus is a multiplier that doesn't depend on the lines
+            'coach_multiplier': self._apply_coach_overall_bonus(1.0)
+        }
+    
+    def _player_signature(self, player: Any) -> Any:
+        """Identity and rating of a player as used for change detection."""
+        if not player or player == 'Empty':
+            return None
+        player_id = player.get('id') if isinstance(player, dict) else getattr(player, 'id', None)
+        return (player_id if player_id is not None else id(player), self.get_player_rating(player))
+    
+    def _component_players(self, lines: Dict[str, Any], component: str) -> List[Any]:
+        """Players that make up a rating component, in the order the full calculation uses."""
+        if component.startswith('line_'):
+            line = lines['forward_lines'][int(component[5:]) - 1]
+            return [line.get('LW'), line.get('C'), line.get('RW')]
+        if component.startswith('pair_'):
+            pair = lines['defense_pairs'][int(component[5:]) - 1]
+            return [pair.get('LD'), pair.get('RD')]
+        if component.startswith('power_play_') or component.startswith('penalty_kill_'):
+            unit = lines[component]
+            return unit.get('forwards', []) + unit.get('defense', [])
+        
+        other_situations = lines.get('other_situations', {})
+        if component == 'shootout':
+            return other_situations['shootout'].get('players', [])
+        if component == 'other_special_teams':
+            players = []
+            if 'overtime' in other_situations:
+                players.extend(other_situations['overtime'].get('forwards', []))
+                players.extend(other_situations['overtime'].get('defensemen', []))
+            if 'shootout' in other_situations:
+                players.extend(other_situations['shootout'].get('players', []))
+            return players
+        return []
+    
+    def _component_signatures(self, lines: Dict[str, Any]) -> Dict[str, Any]:
+        """Player signature of every rating component present in the lines."""
+        signatures = {}
+        
+        for i, line in enumerate(lines.get('forward_lines', [])[:4]):
+            signatures[f'line_{i + 1}'] = None
+        for i, pair in enumerate(lines.get('defense_pairs', [])[:3]):
+            signatures[f'pair_{i + 1}'] = None
+        for unit_name in ['power_play_1', 'power_play_2', 'penalty_kill_1', 'penalty_kill_2']:
+            if unit_name in lines:
+                signatures[unit_name] = None
+        if 'other_situations' in lines:
+            signatures['other_special_teams'] = None
+            if 'shootout' in lines['other_situations']:
+                signatures['shootout'] = None
+        
+        for component in signatures:
+            signatures[component] = tuple(self._player_signature(p) for p in self._component_players(lines, component))
+        
+        if 'goalies' in lines:
+            signatures['goaltending'] = tuple(
+                (self._player_signature(g.get('G') if isinstance(g, dict) and 'G' in g else g),
+                 g.get('is_starter', False) if isinstance(g, dict) else None)
+                for g in lines['goalies']
+            )
+        
+        return signatures
+    
+    def _chemistry_signatures(self, lines: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """Player identities behind every chemistry entry (chemistry doesn't depend on ratings)."""
+        def identity(player):
+            if player == 'Empty':
+                return 'Empty'
+            signature = self._player_signature(player)
+            return signature[0] if signature else None
+        
+        def unit_identity(unit):
+            return (tuple(identity(p) for p in unit.get('forwards', [])),
+                    tuple(identity(p) for p in unit.get('defense', [])))
+        
+        return {
+            'forward_lines': [tuple(identity(line.get(pos)) for pos in ('LW', 'C', 'RW')) for line in lines.get('forward_lines', [])],
+            'defense_pairs': [tuple(identity(pair.get(pos)) for pos in ('LD', 'RD')) for pair in lines.get('defense_pairs', [])],
+            'power_play': [unit_identity(lines.get(f'power_play_{i + 1}', {})) for i in range(2)],
+            'penalty_kill': [unit_identity(lines.get(f'penalty_kill_{i + 1}', {})) for i in range(2)]
+        }
+    
+    def _chemistry_by_component(self, chemistry: Dict[str, Any]) -> Dict[str, float]:
+        """Map chemistry entries to the rating components they modify (last entry wins, as in _apply_chemistry_to_components)."""
+        result = {}
+        for entry in chemistry.get('forward_lines', []):
+            if isinstance(entry, dict) and entry.get('line'):
+                result[f"line_{entry['line']}"] = entry.get('chemistry', 0)
+        for entry in chemistry.get('defense_pairs', []):
+            if isinstance(entry, dict) and entry.get('pair'):
+                result[f"pair_{entry['pair']}"] = entry.get('chemistry', 0)
+        for entry in chemistry.get('power_play', []):
+            if isinstance(entry, dict) and entry.get('unit'):
+                result[f"power_play_{entry['unit']}"] = entry.get('chemistry', 0)
+        for entry in chemistry.get('penalty_kill', []):
+            if isinstance(entry, dict) and entry.get('unit'):
+                result[f"penalty_kill_{entry['unit']}"] = entry.get('chemistry', 0)
+        return result
+    
+    def _average_player_rating(self, players: List[Any]) -> float:
+        """Average of the valid player ratings, rounded to 1 decimal (0 if none)."""
+        valid_players = [p for p in players if p and p != 'Empty']
+        valid_ratings = [r for r in (self.get_player_rating(p) for p in valid_players) if r > 0]
+        if valid_ratings:
+            return round(sum(valid_ratings) / len(valid_ratings), 1)
+        return 0
+    
     def simulate_game_effects(self, minutes_played: Dict[str, float]) -> None:
         """
         Simulate the effects of playing a game on chemistry.
@@ -1685,45 +2101,58 @@ class TeamFormation:
         
         Args:
             minutes_played: Dictionary with minutes played for each line/pair
+                (line1..line4, pair1..pair3, pp1, pp2, pk1, pk2), e.g. the
+                ice_time of a simulated game
         """
-        # Update time played for forward lines
-        for i, line in enumerate(self.current_lines.get('forward_lines', [])):
+        # One batch update (and one matrix refresh) for the whole game
+        self.chemistry_calculator.update_time_played_batch(self.time_played_groups(minutes_played))
+        
+        # Recalculate chemistry after updating time played
+        self.refresh_chemistry()
+        
+    def time_played_groups(self, minutes_played: Dict[str, float]) -> List[Tuple[List[Dict[str, Any]], float]]:
+        """
+        Player groups of the current lines with the minutes each one played.
+        
+        Args:
+            minutes_played: Dictionary with minutes played for each line/pair
+                (line1..line4, pair1..pair3, pp1, pp2, pk1, pk2)
+            
+        Returns:
+            List of (players, minutes) tuples for the time played store
+        """
+        lines = self.current_lines or self.optimal_lines or {}
+        groups = []
+        
+        # Time played for forward lines
+        for i, line in enumerate(lines.get('forward_lines', [])):
             line_key = f'line{i+1}'
             if line_key in minutes_played:
                 players = [line.get('LW'), line.get('C'), line.get('RW')]
-                self.chemistry_calculator.update_time_played(players, minutes_played[line_key])
+                groups.append((players, minutes_played[line_key]))
                 
-        # Update time played for defense pairs
-        for i, pair in enumerate(self.current_lines.get('defense_pairs', [])):
+        # Time played for defense pairs
+        for i, pair in enumerate(lines.get('defense_pairs', [])):
             pair_key = f'pair{i+1}'
             if pair_key in minutes_played:
                 players = [pair.get('LD'), pair.get('RD')]
-                self.chemistry_calculator.update_time_played(players, minutes_played[pair_key])
+                groups.append((players, minutes_played[pair_key]))
                 
-        # Update special teams units
-        for unit_key in ['pp1', 'pp2', 'pk1', 'pk2']:
+        # Special teams units
+        for unit_key, unit_name in (('pp1', 'power_play_1'), ('pp2', 'power_play_2'),
+                                    ('pk1', 'penalty_kill_1'), ('pk2', 'penalty_kill_2')):
             if unit_key in minutes_played:
-                if unit_key.startswith('pp'):
-                    unit_idx = int(unit_key[-1]) - 1
-                    if unit_idx < 2:
-                        unit_name = f'power_play_{unit_idx+1}'
-                        unit = self.current_lines.get(unit_name, {})
-                        forwards = unit.get('forwards', [])
-                        defense = unit.get('defense', [])
-                        self.chemistry_calculator.update_time_played(forwards, minutes_played[unit_key])
-                        self.chemistry_calculator.update_time_played(defense, minutes_played[unit_key])
-                elif unit_key.startswith('pk'):
-                    unit_idx = int(unit_key[-1]) - 1
-                    if unit_idx < 2:
-                        unit_name = f'penalty_kill_{unit_idx+1}'
-                        unit = self.current_lines.get(unit_name, {})
-                        forwards = unit.get('forwards', [])
-                        defense = unit.get('defense', [])
-                        self.chemistry_calculator.update_time_played(forwards, minutes_played[unit_key])
-                        self.chemistry_calculator.update_time_played(defense, minutes_played[unit_key])
-                        
-        # Recalculate chemistry after updating time played
-        self.chemistry_cache = self._calculate_all_chemistry(self.current_lines)
+                unit = lines.get(unit_name, {})
+                groups.append((unit.get('forwards', []), minutes_played[unit_key]))
+                groups.append((unit.get('defense', []), minutes_played[unit_key]))
+        
+        return groups
+        
+    def refresh_chemistry(self) -> None:
+        """Recalculate chemistry of the current lines after time played changed."""
+        if self.chemistry_calculator.matrix is not None:
+            self.chemistry_calculator.matrix.refresh_time_played()
+        self.chemistry_cache = self._calculate_all_chemistry(self.current_lines or self.optimal_lines or {})
         
     def get_line_deployment(self, situation: str, opponent_coach=None) -> Dict[str, float]:
         """
@@ -1795,7 +2224,8 @@ class TeamFormation:
         Get line matchup recommendations against an opponent's lines.
         
         Args:
-            opponent_lines: The opponent's line combinations
+            opponent_lines: The opponent's line combinations (or their full
+                generate_optimal_lines result, to use their cached ratings and chemistry)
             is_home_team: Whether this team is the home team (for last change advantage)
             
         Returns:
@@ -1808,11 +2238,13 @@ class TeamFormation:
                 'defense_matchups': {}
             }
             
-        # Get matchup recommendations from coach strategy
+        # Get matchup recommendations from coach strategy, rated with our cached ratings and chemistry
         return self.coach_strategy.optimize_matchups(
             self.current_lines or self.optimal_lines,
             opponent_lines,
-            is_home_team
+            is_home_team,
+            team_rating=self.team_rating,
+            chemistry=self.chemistry_cache
         )
     
     def save_line_preset(self, preset_name: str = "Default") -> bool:
@@ -1899,6 +2331,11 @@ class TeamFormation:
             
             # If it's a dictionary, try to get the rating directly
             if isinstance(player, dict):
+                # Normalized rating (the store only fills in a missing one)
+                stored = get_player_store().overall_of(player)
+                if stored is not None:
+                    return stored
+                
                 # Check known field names
                 for field in ['overall_rating', 'overall', 'rating', 'card_overall', 'ovr']:
                     if field in player and player[field] is not None:
@@ -2034,7 +2471,7 @@ def calculate_team_rating(team_abbreviation):
             
         # Generate optimal lines to get team rating
         print(f"Generating optimal lines to get team rating for {team_abbreviation}")
-        lines_data = formation.generate_optimal_lines()
+        lines_data = formation.generate_optimal_lines_cached()
         
         # Get team ratings without saving to database
         ratings = formation.save_team_overall_to_database()
@@ -2053,44 +2490,17 @@ def calculate_team_rating(team_abbreviation):
 
 @team_rating_bp.route("/all", methods=['GET'])
 def get_all_team_ratings():
-    """Get all team ratings."""
+    """
+    Get ratings for every team in the Team table (NHL, AHL, junior, ...).
+    
+    Query params:
+        league: Optional league abbreviation to restrict the results (e.g. NHL)
+    """
     try:
-        # Get all team abbreviations
-        # This is a placeholder - in reality, you would fetch these from the database
-        team_abbreviations = [
-            "ANA", "ARI", "BOS", "BUF", "CGY", "CAR", "CHI", "COL", 
-            "CBJ", "DAL", "DET", "EDM", "FLA", "LAK", "MIN", "MTL", 
-            "NSH", "NJD", "NYI", "NYR", "OTT", "PHI", "PIT", "SJS", 
-            "SEA", "STL", "TBL", "TOR", "VAN", "VGK", "WSH", "WPG"
-        ]
+        from .team_rating_batch import rate_all_teams
         
-        team_ratings = []
-        
-        # For each team, initialize and calculate ratings
-        for abbr in team_abbreviations:
-            try:
-                formation = TeamFormation(abbr)
-                init_success = formation.initialize()
-                
-                if init_success:
-                    # Get team rating
-                    lines_data = formation.generate_optimal_lines()
-                    rating = lines_data.get('team_rating', {})
-                    
-                    # Add team info
-                    rating['team'] = abbr
-                    
-                    # Just get ratings without saving to database
-                    formation.save_team_overall_to_database()
-                    
-                    # Add to results
-                    team_ratings.append(rating)
-            except Exception as team_error:
-                print(f"Error processing team {abbr}: {str(team_error)}")
-                # Continue processing other teams
-                
-        # Sort by overall rating
-        team_ratings.sort(key=lambda x: x.get('overall', 0), reverse=True)
+        league = request.args.get('league')
+        team_ratings = rate_all_teams(league=league)
         
         return jsonify(team_ratings), 200
     except Exception as e:
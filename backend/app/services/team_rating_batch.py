@@ -0,0 +1,208 @@
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import os
+import traceback
+from ..supabase_client import get_supabase_client
+
+# Supabase/PostgREST caps a single select at 1000 rows
+PAGE_SIZE = 1000
+
+# Default number of worker processes used to rate teams
+DEFAULT_MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def fetch_paged(client, table: str, columns: str = '*', rostered_only: bool = False,
+                page_size: int = PAGE_SIZE) -> List[Dict[str, Any]]:
+    """
+    Fetch every row of a Supabase table using range pagination.
+
+    Args:
+        client: Supabase client
+        table: Table name (e.g. 'Player')
+        columns: Columns to select
+        rostered_only: Only return rows with a non-null 'team' column
+        page_size: Rows requested per round trip
+
+    Returns:
+        List of row dictionaries
+    """
+    rows = []
+    start = 0
+
+    while True:
+        query = client.table(table).select(columns)
+        if rostered_only:
+            query = query.not_.is_('team', 'null')
+        response = query.order('id').range(start, start + page_size - 1).execute()
+
+        page = response.data if hasattr(response, 'data') and isinstance(response.data, list) else []
+        rows.extend(page)
+
+        if len(page) < page_size:
+            break
+        start += page_size
+
+    return rows
+
+
+def fetch_all_teams(client) -> List[Dict[str, Any]]:
+    """Get every team in the Team table (all leagues), falling back to SQLAlchemy."""
+    try:
+        teams = fetch_paged(client, 'Team')
+        if teams:
+            return teams
+    except Exception as e:
+        print(f"TeamRatingBatch: Error fetching teams from Supabase: {e}")
+
+    try:
+        from .team_service import Team
+        return [team.to_dict() for team in Team.query.all()]
+    except Exception as e:
+        print(f"TeamRatingBatch: Error fetching teams with SQLAlchemy: {e}")
+        return []
+
+
+def fetch_all_rostered_players(client) -> List[Dict[str, Any]]:
+    """Get every player assigned to a team in one paged query, falling back to SQLAlchemy."""
+    try:
+        players = fetch_paged(client, 'Player', rostered_only=True)
+        if players:
+            return players
+    except Exception as e:
+        print(f"TeamRatingBatch: Error fetching players from Supabase: {e}")
+
+    try:
+        from .player import Player
+        return [player.to_dict() for player in Player.query.filter(Player.team_id.isnot(None)).all()]
+    except Exception as e:
+        print(f"TeamRatingBatch: Error fetching players with SQLAlchemy: {e}")
+        return []
+
+
+def fetch_all_coaches(client) -> Dict[Any, Dict[str, Any]]:
+    """Get every coach keyed by id."""
+    try:
+        return {coach.get('id'): coach for coach in fetch_paged(client, 'Coach') if coach.get('id') is not None}
+    except Exception as e:
+        print(f"TeamRatingBatch: Error fetching coaches: {e}")
+        return {}
+
+
+def group_players_by_team(teams: List[Dict[str, Any]], players: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Group players by team abbreviation.
+
+    Supabase players reference their team by abbreviation ('team'), SQLAlchemy
+    players by 'team_id'; both are resolved here.
+
+    Args:
+        teams: List of team dictionaries
+        players: List of player dictionaries
+
+    Returns:
+        Dictionary mapping team abbreviation to its roster
+    """
+    abbreviation_by_id = {team.get('id'): team.get('abbreviation') for team in teams}
+    rosters = {team.get('abbreviation'): [] for team in teams if team.get('abbreviation')}
+
+    for player in players:
+        abbr = player.get('team')
+        if abbr not in rosters:
+            abbr = abbreviation_by_id.get(player.get('team_id'))
+        if abbr in rosters:
+            rosters[abbr].append(player)
+
+    return rosters
+
+
+def rate_team(job: Tuple[Dict[str, Any], List[Dict[str, Any]], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    """
+    Generate lines and the team rating for one pre-fetched roster.
+
+    Runs in a worker process, so it only touches the data it is given.
+
+    Args:
+        job: Tuple of (team, players, coach)
+
+    Returns:
+        Team rating dictionary with team info, or None if it could not be rated
+    """
+    from .team_formation import TeamFormation
+
+    team, players, coach = job
+    abbr = team.get('abbreviation')
+
+    try:
+        formation = TeamFormation(abbr)
+        formation.load_roster(players, team=team, coach=coach)
+
+        lines_data = formation.generate_optimal_lines()
+        rating = dict(lines_data.get('team_rating', {}))
+
+        # Add team info
+        rating['team'] = abbr
+        rating['team_id'] = team.get('id')
+        rating['league'] = team.get('league')
+        return rating
+    except Exception as team_error:
+        print(f"Error processing team {abbr}: {str(team_error)}")
+        traceback.print_exc()
+        return None
+
+
+def rate_all_teams(league: Optional[str] = None, max_workers: Optional[int] = None,
+                   use_processes: bool = True) -> List[Dict[str, Any]]:
+    """
+    Calculate ratings for every team in the league database.
+
+    Teams, rostered players and coaches are each fetched once, rosters are
+    grouped in memory and the line/rating pipeline is fanned out over a
+    process pool.
+
+    Args:
+        league: Optional league abbreviation to restrict the teams (e.g. 'NHL')
+        max_workers: Worker processes to use (defaults to DEFAULT_MAX_WORKERS)
+        use_processes: Set to False to rate teams serially in this process
+
+    Returns:
+        List of team ratings sorted by overall rating
+    """
+    client = get_supabase_client()
+
+    teams = fetch_all_teams(client)
+    if league:
+        teams = [team for team in teams if str(team.get('league', '')).upper() == league.upper()]
+    if not teams:
+        print("TeamRatingBatch: No teams found")
+        return []
+
+    players = fetch_all_rostered_players(client)
+    coaches = fetch_all_coaches(client)
+    rosters = group_players_by_team(teams, players)
+    print(f"TeamRatingBatch: Rating {len(rosters)} teams from {len(players)} rostered players")
+
+    jobs = [
+        (team, rosters[team.get('abbreviation')], coaches.get(team.get('coach_id')))
+        for team in teams
+        if team.get('abbreviation') in rosters and rosters[team.get('abbreviation')]
+    ]
+
+    results = None
+    workers = max_workers or DEFAULT_MAX_WORKERS
+    if use_processes and workers > 1 and len(jobs) > 1:
+        try:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(rate_team, jobs, chunksize=chunksize))
+        except Exception as pool_error:
+            print(f"TeamRatingBatch: Process pool failed, rating teams serially: {pool_error}")
+            results = None
+
+    if results is None:
+        results = [rate_team(job) for job in jobs]
+
+    team_ratings = [rating for rating in results if rating]
+
+    # Sort by overall rating
+    team_ratings.sort(key=lambda x: x.get('overall', 0), reverse=True)
+    return team_ratings
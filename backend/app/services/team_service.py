@@ -5,7 +5,8 @@ from ..services.league import Division, League
 from ..extensions import db
 from datetime import datetime
 import os
-from supabase import create_client, Client
+from supabase import Client
+from ..supabase_client import get_pooled_client
 import logging
 
 # Configure logging
@@ -26,7 +27,7 @@ def get_supabase_client():
         return None
     
     try:
-        return create_client(SUPABASE_URL, SUPABASE_KEY)
+        return get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
     except Exception as e:
         logger.error(f"Error connecting to Supabase: {e}")
         return None
@@ -119,7 +120,7 @@ class TeamService:
             to match what the frontend expects.
         """
         import os
-        from supabase import create_client, Client
+        from supabase import Client
         import logging
         
         # Configure logging
@@ -136,8 +137,8 @@ class TeamService:
         
         try:
             # Initialize Supabase client
-            logger.info("Initializing Supabase client for team service")
-            supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+            logger.info("Using pooled Supabase client for team service")
+            supabase: Client = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
             # STEP 1: Get all leagues with their abbreviations and league_level 
             logger.info("Fetching leagues with their abbreviations and league types")
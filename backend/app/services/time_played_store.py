@@ -0,0 +1,269 @@
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+import threading
+import numpy as np
+
+# Player codes fit in 32 bits; a pair key is (low code << 32) | high code
+CODE_BITS = 32
+CODE_MASK = (1 << CODE_BITS) - 1
+
+
+def player_key(player: Any) -> Any:
+    """
+    Identifier a player's time played is recorded under.
+
+    Args:
+        player: Player dictionary
+
+    Returns:
+        The player's id, falling back to the name (None for empty slots)
+    """
+    if not isinstance(player, dict):
+        return None
+    return player.get('id', player.get('name', ''))
+
+
+def pack_pairs(codes_a: np.ndarray, codes_b: np.ndarray) -> np.ndarray:
+    """Pack two arrays of player codes into order-independent int64 pair keys."""
+    low = np.minimum(codes_a, codes_b).astype(np.int64)
+    high = np.maximum(codes_a, codes_b).astype(np.int64)
+    return (low << CODE_BITS) | high
+
+
+class TimePlayedStore:
+    """
+    Process-wide sparse store of the minutes each pair of players has played together.
+
+    Player ids are interned into dense integer codes and every pair is a
+    single int64 key (both codes packed, lower code first). Keys are kept
+    sorted next to a float64 minutes column, so lookups are a binary search
+    and a batch update is one merge, whatever its size. A roster slice
+    (the N x N minutes of one team) is a vectorized search over the
+    roster's N(N-1)/2 keys.
+
+    Each player also carries an update counter, so callers can tell
+    whether a roster's time played changed since they last looked
+    (see roster_version). Clearing the store starts a new generation
+    instead of resetting the counters, so a roster version is never
+    handed out twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = 0
+        self.generation = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drop all players and pairs (version and generation are kept)."""
+        self._codes = {}
+        self._keys = np.empty(0, dtype=np.int64)
+        self._minutes = np.empty(0, dtype=np.float64)
+        self._updates = np.zeros(0, dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Player codes
+    # ------------------------------------------------------------------
+
+    def _code(self, player_id: Any) -> int:
+        """Return the code of a player id, adding it if new."""
+        code = self._codes.get(player_id)
+        if code is None:
+            code = len(self._codes)
+            if code > CODE_MASK:
+                raise ValueError("Time played store is full")
+            self._codes[player_id] = code
+        return code
+
+    def _lookup_codes(self, player_ids: Iterable[Any]) -> np.ndarray:
+        """Codes of a list of player ids (-1 for unknown players)."""
+        codes = self._codes
+        return np.array([codes.get(player_id, -1) for player_id in player_ids], dtype=np.int64)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add_groups(self, groups: Iterable[Tuple[List[Any], float]]) -> int:
+        """
+        Add minutes played together for many groups of players in one merge.
+
+        Every pair within a group gets the group's minutes. Typically the
+        groups are all lines, pairs and special teams units of every team
+        that played on a simulated day.
+
+        Args:
+            groups: Iterable of (players, minutes) tuples; players are player
+                dictionaries (None and 'Empty' slots are skipped)
+
+        Returns:
+            Number of distinct pairs updated
+        """
+        with self._lock:
+            first = []
+            second = []
+            minutes = []
+            for players, group_minutes in groups:
+                if not group_minutes:
+                    continue
+                codes = [self._code(key) for key in (player_key(p) for p in players or []) if key is not None]
+                for i in range(len(codes)):
+                    for j in range(i + 1, len(codes)):
+                        # A player listed twice in a group is not a pair
+                        if codes[i] != codes[j]:
+                            first.append(codes[i])
+                            second.append(codes[j])
+                            minutes.append(group_minutes)
+
+            if not first:
+                return 0
+
+            keys = pack_pairs(np.array(first, dtype=np.int64), np.array(second, dtype=np.int64))
+            keys, inverse = np.unique(keys, return_inverse=True)
+            added = np.bincount(inverse, weights=np.array(minutes, dtype=np.float64), minlength=len(keys))
+            self._merge(keys, added)
+
+            self._touch(np.concatenate([keys >> CODE_BITS, keys & CODE_MASK]))
+            return len(keys)
+
+    def _touch(self, codes: np.ndarray) -> None:
+        """Bump the update counters of player codes and the store version."""
+        if len(self._updates) < len(self._codes):
+            grown = np.zeros(max(len(self._codes), 2 * len(self._updates)), dtype=np.int64)
+            grown[:len(self._updates)] = self._updates
+            self._updates = grown
+        np.add.at(self._updates, codes, 1)
+        self.version += 1
+
+    def _merge(self, keys: np.ndarray, minutes: np.ndarray) -> None:
+        """Merge sorted unique keys and their minutes into the store."""
+        positions = np.searchsorted(self._keys, keys)
+        in_range = positions < len(self._keys)
+        existing = np.zeros(len(keys), dtype=bool)
+        existing[in_range] = self._keys[positions[in_range]] == keys[in_range]
+
+        self._minutes[positions[existing]] += minutes[existing]
+        new = ~existing
+        if new.any():
+            self._keys = np.insert(self._keys, positions[new], keys[new])
+            self._minutes = np.insert(self._minutes, positions[new], minutes[new])
+
+    def clear(self) -> None:
+        """Remove all time played, of every player in the store."""
+        with self._lock:
+            self._reset()
+            self.generation += 1
+            self.version += 1
+
+    def clear_players(self, player_ids: Iterable[Any]) -> int:
+        """
+        Remove the time played of every pair involving any of these players.
+
+        Args:
+            player_ids: Player ids (see player_key)
+
+        Returns:
+            Number of pairs removed
+        """
+        with self._lock:
+            codes = self._lookup_codes(player_ids)
+            codes = codes[codes >= 0]
+            if not len(codes) or not len(self._keys):
+                return 0
+
+            involved = np.isin(self._keys >> CODE_BITS, codes) | np.isin(self._keys & CODE_MASK, codes)
+            removed = int(involved.sum())
+            if removed:
+                self._keys = self._keys[~involved]
+                self._minutes = self._minutes[~involved]
+                self._touch(codes)
+            return removed
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def get(self, player1: Any, player2: Any) -> float:
+        """
+        Minutes two players have played together.
+
+        Args:
+            player1: First player dictionary
+            player2: Second player dictionary
+        """
+        code1 = self._codes.get(player_key(player1))
+        code2 = self._codes.get(player_key(player2))
+        if code1 is None or code2 is None or code1 == code2:
+            return 0.0
+        key = (min(code1, code2) << CODE_BITS) | max(code1, code2)
+        position = int(np.searchsorted(self._keys, key))
+        if position < len(self._keys) and self._keys[position] == key:
+            return float(self._minutes[position])
+        return 0.0
+
+    def roster_minutes(self, players: List[Any]) -> np.ndarray:
+        """
+        Slice the minutes played together among a roster.
+
+        Args:
+            players: List of player dictionaries
+
+        Returns:
+            Symmetric N x N float64 matrix of minutes (zero diagonal)
+        """
+        size = len(players)
+        minutes = np.zeros((size, size), dtype=np.float64)
+        if size < 2 or not len(self._keys):
+            return minutes
+
+        with self._lock:
+            codes = self._lookup_codes(player_key(p) for p in players)
+            i, j = np.triu_indices(size, k=1)
+            known = (codes[i] >= 0) & (codes[j] >= 0) & (codes[i] != codes[j])
+            i, j = i[known], j[known]
+            if not len(i):
+                return minutes
+
+            keys = pack_pairs(codes[i], codes[j])
+            positions = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+            found = self._keys[positions] == keys
+            values = np.where(found, self._minutes[positions], 0.0)
+
+        minutes[i, j] = values
+        minutes[j, i] = values
+        return minutes
+
+    def roster_version(self, player_ids: Iterable[Any]) -> Tuple[int, int]:
+        """
+        Store generation and number of updates that touched any of these players.
+
+        The update count only grows within a generation and clear() starts
+        a new one, so the version changes exactly when the roster's time
+        played together changed.
+        """
+        with self._lock:
+            codes = self._lookup_codes(player_ids)
+            codes = codes[(codes >= 0) & (codes < len(self._updates))]
+            return self.generation, int(self._updates[codes].sum())
+
+    def stats(self) -> Dict[str, int]:
+        """Return store size information."""
+        with self._lock:
+            return {
+                'players': len(self._codes),
+                'pairs': len(self._keys),
+                'bytes': int(self._keys.nbytes + self._minutes.nbytes + self._updates.nbytes),
+                'version': self.version,
+                'generation': self.generation
+            }
+
+
+# Process-wide store instance
+_time_played_store = TimePlayedStore()
+
+
+def get_time_played_store() -> TimePlayedStore:
+    """Return the process-wide TimePlayedStore."""
+    return _time_played_store
@@ -0,0 +1,410 @@
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import heapq
+import os
+import threading
+import time
+from .value_trade import (
+    apply_quality_adjustment,
+    calculate_draft_pick_value,
+    evaluate_trade,
+    player_asset_values,
+    quality_tier_multiplier,
+    quantity_discount,
+    roster_spot_penalty
+)
+
+# Worker processes used to search several partners at once (one pool
+# shared by every search in the process)
+TRADE_FINDER_MAX_WORKERS = int(os.environ.get("TRADE_FINDER_MAX_WORKERS", os.cpu_count() or 1))
+
+# Default search limits
+DEFAULT_TOP_K = 10
+DEFAULT_MAX_ASSETS = 4
+DEFAULT_TIME_BUDGET = 2.0  # seconds
+
+# Largest search limits a client may ask for
+MAX_TOP_K = 50
+MAX_ASSETS_LIMIT = 6
+MAX_TIME_BUDGET = 10.0  # seconds
+
+# Search nodes between two checks of the time budget
+DEADLINE_CHECK_INTERVAL = 512
+
+
+def check_search_limits(top_k: int, max_assets: int, time_budget: float) -> None:
+    """
+    Validate client-supplied search limits.
+
+    Raises:
+        ValueError: If a limit is out of range
+    """
+    if not 1 <= top_k <= MAX_TOP_K:
+        raise ValueError(f"top_k must be between 1 and {MAX_TOP_K}")
+    if not 1 <= max_assets <= MAX_ASSETS_LIMIT:
+        raise ValueError(f"max_assets must be between 1 and {MAX_ASSETS_LIMIT}")
+    if not 0 < time_budget <= MAX_TIME_BUDGET:
+        raise ValueError(f"time_budget must be more than 0 and at most {MAX_TIME_BUDGET} seconds")
+
+
+def pick_asset_value(pick: Dict[str, Any], draft_context: str = "no_context") -> float:
+    """Trade value of a draft pick asset, as evaluate_trade computes it."""
+    return calculate_draft_pick_value(
+        round_num=pick.get('round', 1),
+        pick_num=pick.get('pick_num'),
+        projected_position=pick.get('projected_position'),
+        draft_strength=pick.get('draft_strength', 'average'),
+        context=draft_context,
+        team_id=pick.get('team_id'),
+        year=pick.get('year')
+    )
+
+
+def build_assets(players: Optional[List[Dict[str, Any]]] = None, picks: Optional[List[Dict[str, Any]]] = None,
+                 draft_context: str = "no_context", exclude_ids: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Value a team's tradeable players and picks.
+
+    Args:
+        players: Player dictionaries (trade payload format)
+        picks: Draft pick dictionaries
+        draft_context: Context for draft pick valuation
+        exclude_ids: Player or pick IDs that are not available
+
+    Returns:
+        Assets ({'type', 'id', 'name', 'value', 'asset'}), most valuable first
+    """
+    excluded = set(exclude_ids or [])
+    players = [p for p in players or [] if p.get('id') not in excluded or p.get('id') is None]
+    picks = [p for p in picks or [] if p.get('id') not in excluded or p.get('id') is None]
+
+    assets = []
+    if players:
+        for player, value in zip(players, player_asset_values(players).tolist()):
+            assets.append({'type': 'player', 'id': player.get('id'), 'name': player.get('name', 'Unknown'),
+                           'value': value, 'asset': player})
+    for pick in picks:
+        name = f"{pick.get('year', 'Unknown')} Round {pick.get('round', 'Unknown')} Pick"
+        assets.append({'type': 'pick', 'id': pick.get('id'), 'name': name,
+                       'value': pick_asset_value(pick, draft_context), 'asset': pick})
+
+    assets.sort(key=lambda a: a['value'], reverse=True)
+    return assets
+
+
+def adjusted_package_value(values: List[float]) -> float:
+    """Quality-adjusted value of one side of a trade (see apply_quality_adjustment)."""
+    adjusted, _ = apply_quality_adjustment([{'value': v} for v in values], [])
+    return adjusted
+
+
+class PackageSearch:
+    """
+    Branch-and-bound search for the asset packages of one team whose
+    quality-adjusted value is closest to a target.
+
+    Assets are taken in descending value order, so the asset added at depth
+    i is exactly the i-th most valuable of its package and its contribution
+    (value x quality tier x (1 - quantity discount)) is final when it is
+    added. A branch is pruned when, even with the best or worst possible
+    completion, its adjusted value cannot get closer to the target than the
+    current k-th best package:
+
+    - upper bound: current contributions plus the largest remaining ones,
+      minus the roster spot penalty already incurred
+    - lower bound: current contributions minus the largest roster spot
+      penalty any completion could incur
+    """
+
+    def __init__(self, assets: List[Dict[str, Any]], target: float, top_k: int = DEFAULT_TOP_K,
+                 max_assets: int = DEFAULT_MAX_ASSETS, min_assets: int = 1,
+                 tolerance: Optional[float] = None, deadline: Optional[float] = None):
+        """
+        Args:
+            assets: Assets from build_assets(), most valuable first
+            target: Quality-adjusted value to match
+            top_k: Number of packages to keep
+            max_assets: Largest package size
+            min_assets: Smallest package size
+            tolerance: Largest accepted difference to the target (None for any)
+            deadline: time.time() after which the search stops
+        """
+        self.assets = assets
+        self.values = [a['value'] for a in assets]
+        self.target = target
+        self.top_k = max(1, top_k)
+        self.max_assets = max(1, min(max_assets, len(assets)))
+        self.min_assets = max(1, min_assets)
+        self.tolerance = tolerance
+        self.deadline = deadline
+
+        self.discounts = [1 - quantity_discount(i) for i in range(self.max_assets)]
+        self.weighted = [v * quality_tier_multiplier(v) for v in self.values]
+
+        # best_extra[s][n]: largest contributions of assets s.. when n are already taken
+        m = len(assets)
+        self.best_extra = [[0.0] * (self.max_assets + 1) for _ in range(m + 1)]
+        # best_raw[s][n]: largest raw value the remaining slots can add from assets s..
+        self.best_raw = [[0.0] * (self.max_assets + 1) for _ in range(m + 1)]
+        for s in range(m - 1, -1, -1):
+            for n in range(self.max_assets - 1, -1, -1):
+                self.best_extra[s][n] = self.weighted[s] * self.discounts[n] + self.best_extra[s + 1][n + 1]
+                self.best_raw[s][n] = self.values[s] + self.best_raw[s + 1][n + 1]
+
+        # Max-heap (by difference) of the best packages found so far
+        self._heap = []
+        self._counter = 0
+        self.nodes = 0
+        self.complete = True
+
+    def _bound(self) -> float:
+        """Difference a package has to beat to enter the top k."""
+        limit = self.tolerance if self.tolerance is not None else float('inf')
+        if len(self._heap) >= self.top_k:
+            limit = min(limit, -self._heap[0][0])
+        return limit
+
+    def _record(self, difference: float, package: Tuple[int, ...]) -> None:
+        entry = (-difference, -self._counter, package)
+        self._counter += 1
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heappushpop(self._heap, entry)
+
+    def _search(self, start: int, taken: List[int], adjusted_sum: float, raw_sum: float) -> None:
+        n = len(taken)
+        for j in range(start, len(self.values)):
+            self.nodes += 1
+            if self.deadline is not None and self.nodes % DEADLINE_CHECK_INTERVAL == 0 and time.time() > self.deadline:
+                self.complete = False
+            if not self.complete:
+                return
+
+            new_sum = adjusted_sum + self.weighted[j] * self.discounts[n]
+            new_raw = raw_sum + self.values[j]
+            penalty = roster_spot_penalty(n + 1, new_raw)
+            taken.append(j)
+
+            bound = self._bound()
+            if n + 1 >= self.min_assets:
+                difference = abs(new_sum - penalty - self.target)
+                if difference <= bound:
+                    self._record(difference, tuple(taken))
+                    bound = self._bound()
+
+            if n + 1 < self.max_assets and j + 1 < len(self.values):
+                upper = new_sum + self.best_extra[j + 1][n + 1] - penalty
+                lower = new_sum - roster_spot_penalty(self.max_assets, new_raw + self.best_raw[j + 1][n + 1])
+                if upper >= self.target - bound and lower <= self.target + bound:
+                    self._search(j + 1, taken, new_sum, new_raw)
+
+            taken.pop()
+
+    def run(self) -> List[Tuple[int, ...]]:
+        """
+        Run the search.
+
+        Returns:
+            Packages as tuples of asset indices, closest to the target first
+        """
+        if self.values:
+            self._search(0, [], 0, 0)
+        return [package for _, _, package in sorted(self._heap, reverse=True)]
+
+
+def _package_result(package: List[Dict[str, Any]], target_assets: Optional[List[Dict[str, Any]]],
+                    target_value: float, draft_context: str) -> Dict[str, Any]:
+    """Describe a package, with the exact evaluate_trade assessment when the target is a set of assets."""
+    values = [a['value'] for a in package]
+    result = {
+        'assets': [{'type': a['type'], 'id': a['id'], 'name': a['name'], 'value': a['value']} for a in package],
+        'raw_value': round(sum(values), 1)
+    }
+
+    if target_assets:
+        target_side, package_side = apply_quality_adjustment(
+            [{'value': a['value']} for a in target_assets], [{'value': v} for v in values]
+        )
+        evaluation = evaluate_trade(
+            [a['asset'] for a in target_assets if a['type'] == 'player'],
+            [a['asset'] for a in package if a['type'] == 'player'],
+            team1_picks=[a['asset'] for a in target_assets if a['type'] == 'pick'],
+            team2_picks=[a['asset'] for a in package if a['type'] == 'pick'],
+            draft_context=draft_context
+        )
+        result['trade_assessment'] = evaluation['trade_assessment']
+    else:
+        target_side, package_side = target_value, adjusted_package_value(values)
+
+    result['adjusted_value'] = round(package_side, 1)
+    result['difference'] = round(abs(package_side - target_side), 1)
+    return result
+
+
+def find_packages(partner_players: Optional[List[Dict[str, Any]]] = None,
+                  partner_picks: Optional[List[Dict[str, Any]]] = None,
+                  target_players: Optional[List[Dict[str, Any]]] = None,
+                  target_picks: Optional[List[Dict[str, Any]]] = None,
+                  target_value: Optional[float] = None,
+                  top_k: int = DEFAULT_TOP_K,
+                  max_assets: int = DEFAULT_MAX_ASSETS,
+                  min_assets: int = 1,
+                  tolerance: Optional[float] = None,
+                  time_budget: float = DEFAULT_TIME_BUDGET,
+                  deadline: Optional[float] = None,
+                  exclude_ids: Optional[List[Any]] = None,
+                  draft_context: str = "no_context") -> Dict[str, Any]:
+    """
+    Find the partner's asset packages that best balance a target.
+
+    The target is either a set of assets (players/picks the partner would
+    receive) or a quality-adjusted value. Packages are scored under
+    apply_quality_adjustment and the best ones are re-evaluated with
+    evaluate_trade.
+
+    Args:
+        partner_players: Counterparty's tradeable players
+        partner_picks: Counterparty's tradeable draft picks
+        target_players: Players offered to the counterparty
+        target_picks: Draft picks offered to the counterparty
+        target_value: Quality-adjusted value to match when no target assets are given
+        top_k: Number of packages returned
+        max_assets: Largest package size
+        min_assets: Smallest package size
+        tolerance: Largest accepted adjusted value difference
+        time_budget: Seconds the search may take
+        deadline: Absolute time.time() deadline (overrides time_budget)
+        exclude_ids: Partner assets that cannot be included
+        draft_context: Context for draft pick valuation
+
+    Returns:
+        Dictionary with the target's adjusted value, the packages (closest
+        first) and whether the search finished within the time budget
+    """
+    target_assets = build_assets(target_players, target_picks, draft_context) if (target_players or target_picks) else None
+    if target_assets:
+        target = adjusted_package_value([a['value'] for a in target_assets])
+    elif target_value is not None:
+        target = float(target_value)
+    else:
+        raise ValueError("A target player, pick or value is required")
+
+    # Worthless assets only take roster spots
+    assets = [a for a in build_assets(partner_players, partner_picks, draft_context, exclude_ids) if a['value'] > 0]
+    search = PackageSearch(assets, target, top_k=top_k, max_assets=max_assets, min_assets=min_assets,
+                           tolerance=tolerance, deadline=deadline if deadline is not None else time.time() + time_budget)
+    packages = search.run()
+
+    results = [_package_result([assets[i] for i in package], target_assets, target, draft_context) for package in packages]
+    results.sort(key=lambda r: r['difference'])
+    return {
+        'target_value': round(target, 1),
+        'packages': results,
+        'complete': search.complete,
+        'nodes': search.nodes
+    }
+
+
+def _search_partner(job: Tuple[Any, Dict[str, Any]]) -> Tuple[Any, Dict[str, Any]]:
+    """Worker entry point: search one partner (module level so it can be pickled)."""
+    partner, options = job
+    try:
+        return partner, find_packages(**options)
+    except Exception as e:
+        print(f"TradeFinder: Error searching {partner}: {e}")
+        return partner, {'packages': [], 'complete': False, 'error': str(e)}
+
+
+# Process pool shared by league searches, created on first use
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    """Return the shared search pool (TRADE_FINDER_MAX_WORKERS processes)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=TRADE_FINDER_MAX_WORKERS)
+        return _pool
+
+
+def _reset_pool() -> None:
+    """Drop a broken shared pool; the next search creates a new one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def find_packages_league(partners: Dict[Any, Dict[str, Any]],
+                         target_players: Optional[List[Dict[str, Any]]] = None,
+                         target_picks: Optional[List[Dict[str, Any]]] = None,
+                         target_value: Optional[float] = None,
+                         top_k: int = DEFAULT_TOP_K,
+                         time_budget: float = DEFAULT_TIME_BUDGET,
+                         max_workers: Optional[int] = None,
+                         **options: Any) -> Dict[str, Any]:
+    """
+    Search every partner for packages balancing a target, in parallel.
+
+    All partners share one wall-clock deadline, so the whole search takes
+    about `time_budget` however many partners there are. Each partner's
+    search is independent and runs in the process pool shared by every
+    search, so concurrent requests queue for TRADE_FINDER_MAX_WORKERS
+    processes instead of starting their own. If the pool cannot be used,
+    partners are searched serially.
+
+    Args:
+        partners: Partner (team) -> {'players': [...], 'picks': [...]}
+        target_players: Players offered
+        target_picks: Draft picks offered
+        target_value: Quality-adjusted value to match when no target assets are given
+        top_k: Number of packages returned overall and per partner
+        time_budget: Seconds the whole search may take
+        max_workers: Partners searched at once; 1 searches serially in this
+            process (defaults to TRADE_FINDER_MAX_WORKERS)
+        **options: Other find_packages options (max_assets, tolerance, ...)
+
+    Returns:
+        Dictionary with the best packages overall (each with its partner),
+        the results per partner and whether every search finished
+    """
+    deadline = time.time() + time_budget
+    jobs = [
+        (partner, dict(options, partner_players=assets.get('players'), partner_picks=assets.get('picks'),
+                       target_players=target_players, target_picks=target_picks, target_value=target_value,
+                       top_k=top_k, deadline=deadline))
+        for partner, assets in partners.items()
+    ]
+    if not jobs:
+        return {'packages': [], 'partners': {}, 'complete': True}
+
+    results = None
+    workers = min(max_workers or TRADE_FINDER_MAX_WORKERS, len(jobs))
+    if workers > 1:
+        try:
+            results = list(_get_pool().map(_search_partner, jobs))
+        except Exception as pool_error:
+            print(f"TradeFinder: Process pool failed, searching partners serially: {pool_error}")
+            if isinstance(pool_error, BrokenProcessPool):
+                _reset_pool()
+            results = None
+
+    if results is None:
+        results = [_search_partner(job) for job in jobs]
+
+    by_partner = dict(results)
+    best = heapq.nsmallest(
+        top_k,
+        (dict(package, partner=partner) for partner, result in results for package in result.get('packages', [])),
+        key=lambda p: p['difference']
+    )
+    return {
+        'packages': best,
+        'partners': by_partner,
+        'complete': all(result.get('complete') for result in by_partner.values())
+    }
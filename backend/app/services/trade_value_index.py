@@ -0,0 +1,446 @@
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+from bisect import bisect_left, bisect_right, insort
+import heapq
+import math
+import os
+import threading
+import numpy as np
+from .player_store import get_player_store, normalize_overall, normalize_position
+from .value_trade import PROBABILITY_WORDS, player_asset_value, player_asset_values
+
+# League salary cap in millions, used for "teams under the cap" queries
+SALARY_CAP = float(os.environ.get("SALARY_CAP_MILLIONS", 88.0))
+
+# Player fields that feed calculate_player_trade_value
+VALUATION_FIELDS = (
+    'overall', 'age', 'position', 'contract_type', 'term_years', 'aav_millions', 'potential',
+    'potential_certainty', 'potential_volatility', 'is_captain', 'is_alternate', 'stanley_cups',
+    'has_major_awards'
+)
+
+# Valuation fields _payload converts from their database form
+CONVERTED_FIELDS = ('potential', 'potential_certainty', 'potential_volatility')
+
+# Potential tiers of calculate_potential_modifier
+POTENTIAL_TIERS = ('ahl', '4th', 'bottom6', 'top9', 'top6', 'elite', 'franchise', 'generational')
+
+# Potential labels stored on players (see DraftRankingService.POTENTIAL_VALUES)
+# and their trade value tier, matched on the label in this order
+POTENTIAL_LABELS = (
+    ('generational', 'generational'),
+    ('franchise', 'franchise'),
+    ('game breaker', 'elite'),
+    ('elite', 'elite'),
+    ('top line', 'top6'),
+    ('top pair', 'top6'),
+    ('lead starter', 'top6'),
+    ('top 6 f', 'top6'),
+    ('top 3', 'top6'),
+    ('middle 6', 'top9'),
+    ('top 4', 'top9'),
+    ('occasional starter', 'bottom6'),
+    ('starter', 'top9'),
+    ('bottom 6', 'bottom6'),
+    ('top 6', 'bottom6'),
+    ('backup', 'bottom6'),
+    ('fringe', '4th'),
+)
+
+# Precision/volatility words not in PROBABILITY_WORDS
+PROBABILITY_ALIASES = {'minimal': 0.05, 'mature': 1.0}
+
+
+def position_group(position: Any) -> str:
+    """
+    Position partition of a player: 'C', 'W', 'D' or 'G'.
+
+    Uses the same rules as calculate_position_modifier.
+    """
+    position = str(position or '').lower()
+    if "center" in position or position == "c":
+        return 'C'
+    elif "defense" in position or position in ["d", "ld", "rd"]:
+        return 'D'
+    elif "goalie" in position or "goaltender" in position or position == "g":
+        return 'G'
+    return 'W'
+
+
+def trade_potential(potential: Any) -> Optional[str]:
+    """
+    Trade value potential tier of a player's potential label.
+
+    Args:
+        potential: Tier name ('top6', 'elite', ...) or stored label ('Top 6 F',
+            'Elite Def', ...)
+
+    Returns:
+        The tier, or None when the potential is missing or unknown
+    """
+    label = str(potential or '').strip().lower()
+    if label in POTENTIAL_TIERS:
+        return label
+    for key, tier in POTENTIAL_LABELS:
+        if key in label:
+            return tier
+    return None
+
+
+def _probability(value: Any) -> Optional[float]:
+    """Potential certainty/volatility on a 0-1 scale (stored as 0-100 or as words)."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        word = value.strip().lower()
+        if word in PROBABILITY_WORDS:
+            return PROBABILITY_WORDS[word]
+        if word in PROBABILITY_ALIASES:
+            return PROBABILITY_ALIASES[word]
+        try:
+            value = float(word)
+        except ValueError:
+            return None
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return value / 100 if value > 1 else value
+
+
+def _team_of(player: Dict[str, Any]) -> Any:
+    team = player.get('team')
+    if isinstance(team, dict):
+        team = team.get('abbreviation') or team.get('id')
+    return team if team is not None else player.get('team_id')
+
+
+class TradeValueIndex:
+    """
+    Maintained index of every player's current trade value.
+
+    Players are kept in sorted (value, code) lists: one for the whole league
+    and one per team, per position group and per team and position group.
+    A value range query bisects the most specific partitions and reads only
+    the matching entries, in O(log n + k) per partition. Team cap hits are
+    summed as players are indexed, so "teams under the cap" is a filter on
+    teams rather than a scan of players.
+
+    Updates are incremental: refreshing a player recomputes its value only
+    when one of its valuation fields or its team changed, and moves just
+    that entry in the partitions it belongs to.
+
+    Cap hits need contract terms; has_contracts tells whether any indexed
+    player has them, i.e. whether under_cap queries mean anything.
+    """
+
+    def __init__(self, salary_cap: float = SALARY_CAP):
+        self._lock = threading.RLock()
+        self.salary_cap = salary_cap
+        # Player id <-> integer code used as tie-breaker in the sorted keys
+        self._codes = {}
+        self._ids = []
+        # Per player code: valuation payload, value, team, position group
+        self._entries = {}
+        # Partition key -> sorted list of (value, code)
+        self._partitions = {}
+        self._cap_hits = {}
+        self.has_contracts = False
+        self.version = 0
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _code(self, player_id: Any) -> int:
+        code = self._codes.get(player_id)
+        if code is None:
+            code = len(self._ids)
+            self._codes[player_id] = code
+            self._ids.append(player_id)
+        return code
+
+    @staticmethod
+    def _partition_keys(team: Any, group: str) -> List[Any]:
+        return [None, ('team', team), ('position', group), ('team', team, group)]
+
+    @staticmethod
+    def _payload(player: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Valuation fields of a player dictionary, on top of the previous ones.
+
+        Database rows and trade payloads give the same payload: stored potential
+        labels become trade value tiers, potential precision stands in for
+        certainty and 0-100 certainty/volatility are scaled to 0-1.
+        """
+        payload = dict(previous or {})
+        overall = normalize_overall(player)
+        if overall is not None:
+            payload['overall'] = overall
+        position = normalize_position(player)
+        if position:
+            payload['position'] = position
+        for field in VALUATION_FIELDS:
+            if field not in ('overall', 'position') + CONVERTED_FIELDS and player.get(field) is not None:
+                payload[field] = player[field]
+        potential = trade_potential(player.get('potential'))
+        if potential:
+            payload['potential'] = potential
+        certainty = player.get('potential_certainty')
+        for field, raw in (('potential_certainty', player.get('potential_precision') if certainty is None else certainty),
+                           ('potential_volatility', player.get('potential_volatility'))):
+            value = _probability(raw)
+            if value is not None:
+                payload[field] = value
+        team = _team_of(player)
+        if team is not None:
+            payload['team'] = team
+        return payload
+
+    def _insert(self, code: int, payload: Dict[str, Any], value: float) -> None:
+        team = payload.get('team')
+        group = position_group(payload.get('position'))
+        entry = (value, code)
+        for key in self._partition_keys(team, group):
+            insort(self._partitions.setdefault(key, []), entry)
+        self._entries[code] = {'payload': payload, 'value': value, 'team': team, 'group': group}
+        self._cap_hits[team] = self._cap_hits.get(team, 0.0) + float(payload.get('aav_millions') or 0)
+        self.has_contracts = self.has_contracts or payload.get('aav_millions') is not None
+
+    def _remove(self, code: int) -> Optional[Dict[str, Any]]:
+        entry = self._entries.pop(code, None)
+        if entry is None:
+            return None
+        key = (entry['value'], code)
+        for partition_key in self._partition_keys(entry['team'], entry['group']):
+            partition = self._partitions[partition_key]
+            del partition[bisect_left(partition, key)]
+            if not partition:
+                del self._partitions[partition_key]
+        self._cap_hits[entry['team']] -= float(entry['payload'].get('aav_millions') or 0)
+        return entry
+
+    def load(self, players: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace the index with a set of players, valued in one batch.
+
+        Args:
+            players: Player dictionaries (database rows or trade payloads,
+                with 'id' and optionally team and contract fields)
+
+        Returns:
+            Number of players indexed
+        """
+        # Last occurrence of a player wins
+        players = list({p['id']: p for p in players or [] if isinstance(p, dict) and p.get('id') is not None}.values())
+        payloads = [self._payload(p) for p in players]
+        values = player_asset_values(payloads).tolist() if payloads else []
+        with self._lock:
+            self.__init__(self.salary_cap)
+            self._bulk_insert([p['id'] for p in players], payloads, values)
+        return len(players)
+
+    def load_from_store(self, contracts: Optional[Dict[Any, Dict[str, Any]]] = None) -> int:
+        """
+        Replace the index with every player in the shared player store.
+
+        The store has no contract columns, so contract terms come from the
+        contracts table (ContractManager.get_contract_terms) unless given.
+
+        Args:
+            contracts: Contract terms ('term_years', 'aav_millions', ...) by player id
+
+        Returns:
+            Number of players indexed
+        """
+        if contracts is None:
+            contracts = load_contract_terms()
+
+        store = get_player_store()
+        rows = np.flatnonzero(store.valid_mask())
+        player_ids = store.column('id')[rows].tolist()
+        fields = {name: store.column(name)[rows] for name in ('overall', 'age')}
+        strings = {name: store.gather(name, player_ids, default=None)
+                   for name in ('position', 'team', 'potential', 'potential_precision', 'potential_volatility')}
+
+        payloads = []
+        for i, player_id in enumerate(player_ids):
+            player = dict(contracts.get(player_id) or {})
+            for name, column in strings.items():
+                player[name] = column[i]
+            for name, column in fields.items():
+                if not math.isnan(column[i]):
+                    player[name] = float(column[i])
+            payloads.append(self._payload(player))
+        values = player_asset_values(payloads).tolist() if payloads else []
+
+        with self._lock:
+            self.__init__(self.salary_cap)
+            self._bulk_insert(player_ids, payloads, values)
+        return len(player_ids)
+
+    def _bulk_insert(self, player_ids: List[Any], payloads: List[Dict[str, Any]], values: List[float]) -> None:
+        """Fill an empty index, sorting each partition once."""
+        for player_id, payload, value in zip(player_ids, payloads, values):
+            code = self._code(player_id)
+            team = payload.get('team')
+            group = position_group(payload.get('position'))
+            for key in self._partition_keys(team, group):
+                self._partitions.setdefault(key, []).append((value, code))
+            self._entries[code] = {'payload': payload, 'value': value, 'team': team, 'group': group}
+            self._cap_hits[team] = self._cap_hits.get(team, 0.0) + float(payload.get('aav_millions') or 0)
+            self.has_contracts = self.has_contracts or payload.get('aav_millions') is not None
+        for partition in self._partitions.values():
+            partition.sort()
+        self.version += 1
+
+    def refresh(self, player_id: Any, changes: Optional[Dict[str, Any]] = None, add: bool = False) -> bool:
+        """
+        Update one player after its ratings, age, contract or team changed.
+
+        Args:
+            player_id: Player ID
+            changes: Changed player fields (database or payload names); only
+                these are applied on top of what the index already has
+            add: Index the player if it is not indexed yet
+
+        Returns:
+            True if the player's entry changed
+        """
+        with self._lock:
+            code = self._codes.get(player_id)
+            entry = self._entries.get(code) if code is not None else None
+            if entry is None and not add:
+                return False
+
+            previous = entry['payload'] if entry else None
+            payload = self._payload(dict(changes or {}, id=player_id), previous)
+            if entry is not None and payload == previous:
+                return False
+
+            value = player_asset_value(dict(payload, id=player_id))
+            if code is not None:
+                self._remove(code)
+            self._insert(self._code(player_id), payload, value)
+            self.version += 1
+            return True
+
+    def remove(self, player_id: Any) -> bool:
+        """Remove a player from the index. Returns True if it was indexed."""
+        with self._lock:
+            code = self._codes.get(player_id)
+            if code is None or self._remove(code) is None:
+                return False
+            self.version += 1
+            return True
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def value_of(self, player_id: Any) -> Optional[float]:
+        """Current indexed trade value of a player, or None."""
+        code = self._codes.get(player_id)
+        entry = self._entries.get(code) if code is not None else None
+        return entry['value'] if entry else None
+
+    def team_cap_hit(self, team: Any) -> float:
+        """Sum of the AAV (millions) of a team's indexed players."""
+        return self._cap_hits.get(team, 0.0)
+
+    def teams_under_cap(self, cap_space: float = 0.0) -> List[Any]:
+        """Teams whose indexed cap hit leaves at least `cap_space` million under the cap."""
+        return [team for team, cap_hit in self._cap_hits.items()
+                if team is not None and cap_hit + cap_space <= self.salary_cap]
+
+    def range(self, min_value: float = 0.0, max_value: float = 100.0, team: Any = None,
+              position: Optional[str] = None, teams: Optional[Iterable[Any]] = None,
+              under_cap: bool = False, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Players with a trade value between min_value and max_value (inclusive).
+
+        Args:
+            min_value: Lowest value
+            max_value: Highest value
+            team: Only this team
+            position: Only this position (any name calculate_position_modifier
+                understands, e.g. 'C', 'LW', 'Defense')
+            teams: Only these teams
+            under_cap: Only teams under the salary cap
+            limit: Maximum number of players returned
+
+        Returns:
+            Player entries ({'id', 'value', 'team', 'position'}), highest value first
+        """
+        group = position_group(position) if position else None
+        with self._lock:
+            if team is not None or teams is not None or under_cap:
+                selected = set(self._cap_hits) if teams is None else set(teams)
+                if team is not None:
+                    selected &= {team}
+                if under_cap:
+                    selected &= set(self.teams_under_cap())
+                keys = [('team', t, group) if group else ('team', t) for t in selected]
+            else:
+                keys = [('position', group) if group else None]
+
+            low = (min_value, -1)
+            high = (max_value, math.inf)
+            slices = []
+            for key in keys:
+                partition = self._partitions.get(key)
+                if partition:
+                    start = bisect_left(partition, low)
+                    end = bisect_right(partition, high)
+                    slices.append(reversed(partition[start:end]))
+
+            result = []
+            for value, code in heapq.merge(*slices, reverse=True):
+                if limit is not None and len(result) >= limit:
+                    break
+                entry = self._entries[code]
+                result.append({
+                    'id': self._ids[code],
+                    'value': value,
+                    'team': entry['team'],
+                    'position': entry['payload'].get('position')
+                })
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index size information."""
+        with self._lock:
+            return {
+                'players': len(self._entries),
+                'partitions': len(self._partitions),
+                'has_contracts': self.has_contracts,
+                'version': self.version
+            }
+
+
+# Process-wide index instance
+_trade_value_index = TradeValueIndex()
+
+
+def get_trade_value_index() -> TradeValueIndex:
+    """Return the process-wide TradeValueIndex."""
+    return _trade_value_index
+
+
+def load_contract_terms() -> Dict[Any, Dict[str, Any]]:
+    """Contract terms by player id from the contracts table (empty if it cannot be read)."""
+    try:
+        from .contract_manager import ContractManager
+        return ContractManager.get_contract_terms()
+    except Exception as e:
+        print(f"Error loading contract terms for the trade value index: {e}")
+        return {}
+
+
+def refresh_trade_value(player_id: Any, changes: Optional[Dict[str, Any]] = None) -> None:
+    """Refresh an indexed player's trade value after an update (no-op if not indexed)."""
+    try:
+        get_trade_value_index().refresh(player_id, changes)
+    except Exception as e:
+        print(f"Error refreshing trade value index: {e}")
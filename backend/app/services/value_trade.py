@@ -1,5 +1,7 @@
 from typing import List, Dict, Any, Tuple, Optional
 import math
+import numpy as np
+from .player_store import get_player_store
 
 
 def calculate_age_modifier(age: int) -> float:
@@ -91,21 +93,7 @@ def calculate_contract_modifier(
         Contract modifier value
     """
     # Base modifier based on contract type
-    contract_type_mod = 0.0
-    
-    contract_type = contract_type.lower()
-    if contract_type == "unsigned":
-        # Unsigned prospects have higher value
-        contract_type_mod = 0.3
-    elif "2way" in contract_type:
-        # Two-way contracts are more flexible
-        contract_type_mod = 0.2
-    elif "rfa" in contract_type:
-        # RFA contracts provide more team control
-        contract_type_mod = 0.1
-    elif "ufa" in contract_type:
-        # UFA contracts have least team control
-        contract_type_mod = 0.0
+    contract_type_mod = _contract_type_modifier(contract_type)
     
     # Term modifier considering player age
     term_modifier = 0.0
@@ -177,6 +165,24 @@ def calculate_contract_modifier(
     return 0.4 * contract_type_mod + 0.3 * term_modifier + 0.3 * aav_modifier
 
 
+def _contract_type_modifier(contract_type: str) -> float:
+    """Contract type part of the contract modifier."""
+    contract_type = contract_type.lower()
+    if contract_type == "unsigned":
+        # Unsigned prospects have higher value
+        return 0.3
+    elif "2way" in contract_type:
+        # Two-way contracts are more flexible
+        return 0.2
+    elif "rfa" in contract_type:
+        # RFA contracts provide more team control
+        return 0.1
+    elif "ufa" in contract_type:
+        # UFA contracts have least team control
+        return 0.0
+    return 0.0
+
+
 def calculate_position_modifier(position: str) -> float:
     """Calculate the position modifier for trade value calculation."""
     position = position.lower()
@@ -275,6 +281,35 @@ def calculate_exponential_overall_value(overall: float) -> float:
             return base_value + (excess / 100) * 0.5 * exponential_factor
 
 
+def _overall_scale(overall: float) -> float:
+    """Trade value scale for an overall rating, with tier jumps for star players."""
+    # Adding tier-based jumps at key overall thresholds
+    base_scale = 60  # Base scale for average players
+    
+    # Apply key tier jumps with more dramatic scaling at thresholds
+    if overall >= 95:  # Generational tier (McDavid, etc.)
+        tier_jump = 20  # Major jump at 95+ threshold
+        star_bonus = tier_jump + (overall - 95) ** 2.5 * 5.0  # Significantly increased exponent and multiplier
+        base_scale += star_bonus
+    elif overall >= 93:  # Elite superstar tier
+        tier_jump = 15  # Major jump at 93+ threshold
+        star_bonus = tier_jump + (overall - 93) ** 2.5 * 4.0  # Increased from original
+        base_scale += star_bonus
+    elif overall >= 90:  # Superstar tier
+        tier_jump = 8  # Significant jump at 90+ threshold
+        star_bonus = tier_jump + (overall - 90) ** 2.2 * 3.0
+        base_scale += star_bonus
+    elif overall >= 87:  # Star tier
+        tier_jump = 4  # Moderate jump at 87+ threshold
+        star_bonus = tier_jump + (overall - 87) ** 1.8 * 1.5
+        base_scale += star_bonus
+    elif overall >= 85:  # Above-average tier
+        star_bonus = (overall - 85) ** 1.5 * 0.8
+        base_scale += star_bonus
+    
+    return base_scale
+
+
 def calculate_player_trade_value(
     overall: float,
     age: int,
@@ -436,29 +471,7 @@ def calculate_player_trade_value(
                  0.05 * intangibles_mod)
     
     # Calculate final value with enhanced scaling for star players
-    # Adding tier-based jumps at key overall thresholds
-    base_scale = 60  # Base scale for average players
-    
-    # Apply key tier jumps with more dramatic scaling at thresholds
-    if overall >= 95:  # Generational tier (McDavid, etc.)
-        tier_jump = 20  # Major jump at 95+ threshold
-        star_bonus = tier_jump + (overall - 95) ** 2.5 * 5.0  # Significantly increased exponent and multiplier
-        base_scale += star_bonus
-    elif overall >= 93:  # Elite superstar tier
-        tier_jump = 15  # Major jump at 93+ threshold
-        star_bonus = tier_jump + (overall - 93) ** 2.5 * 4.0  # Increased from original
-        base_scale += star_bonus
-    elif overall >= 90:  # Superstar tier
-        tier_jump = 8  # Significant jump at 90+ threshold
-        star_bonus = tier_jump + (overall - 90) ** 2.2 * 3.0
-        base_scale += star_bonus
-    elif overall >= 87:  # Star tier
-        tier_jump = 4  # Moderate jump at 87+ threshold
-        star_bonus = tier_jump + (overall - 87) ** 1.8 * 1.5
-        base_scale += star_bonus
-    elif overall >= 85:  # Above-average tier
-        star_bonus = (overall - 85) ** 1.5 * 0.8
-        base_scale += star_bonus
+    base_scale = _overall_scale(overall)
     
     trade_value = base_scale * base_value * multiplier
     
@@ -637,6 +650,400 @@ def calculate_draft_pick_value(
     return min(round(pick_value, 1), 99)
 
 
+def player_asset_value(player: Dict[str, Any]) -> float:
+    """
+    Calculate the trade value of a player asset from a trade payload.
+    
+    Overall, age and position fall back to the shared player store when the
+    payload does not include them.
+    
+    Parameters:
+    -----------
+    player : Dict
+        Player dictionary from the trade payload
+    
+    Returns:
+    --------
+    float
+        Trade value on a 0-100 scale
+    """
+    overall = player.get('overall')
+    age = player.get('age')
+    position = player.get('position')
+    
+    if overall is None or age is None or position is None:
+        row = get_player_store().row(player.get('id'))
+        if row is not None:
+            overall = overall if overall is not None else row.overall
+            age = age if age is not None else row.age
+            position = position if position is not None else row.position
+    
+    return calculate_player_trade_value(
+        overall=overall if overall is not None else 0,
+        age=age if age is not None else 0,
+        position=position if position is not None else '',
+        contract_type=player.get('contract_type', 'UFA'),
+        term_years=player.get('term_years', 0),
+        aav_millions=player.get('aav_millions', 0),
+        potential=player.get('potential', 'bottom6'),
+        potential_certainty=player.get('potential_certainty', 0.5),
+        potential_volatility=player.get('potential_volatility', 0.5),
+        is_captain=player.get('is_captain', False),
+        is_alternate=player.get('is_alternate', False),
+        stanley_cups=player.get('stanley_cups', 0),
+        has_major_awards=player.get('has_major_awards', False)
+    )
+
+
+# Probability words accepted for potential certainty and volatility
+PROBABILITY_WORDS = {
+    'low': 0.25,
+    'medium': 0.5,
+    'high': 0.75,
+    'very low': 0.1,
+    'very high': 0.9
+}
+
+
+# Brackets of calculate_contract_modifier: contract term (years) and AAV
+# (millions) limits, and the modifier of each bracket, per age group
+# (under 27, 27-32, over 32)
+CONTRACT_TERM_BRACKETS = np.array([2, 4, 6])
+CONTRACT_TERM_MODIFIERS = np.array([
+    [0.0, 0.1, 0.2, 0.3],
+    [-0.1, 0.1, 0.2, 0.0],
+    [0.1, -0.1, -0.3, -0.3]
+])
+CONTRACT_AAV_BRACKETS = np.array([
+    [4.0, 7.0, 10.0],
+    [6.0, 9.0, 12.0],
+    [4.0, 7.0, 10.0]
+])
+CONTRACT_AAV_MODIFIERS = np.array([
+    [0.3, 0.2, 0.1, 0.0],
+    [0.3, 0.2, 0.0, -0.1],
+    [0.2, 0.0, -0.2, -0.3]
+])
+
+# Age brackets of the potential weight in calculate_player_trade_value, and
+# the factor of each bracket for normal (row 0) and 88+ overall (row 1) players
+POTENTIAL_AGE_BRACKETS = np.array([20, 22, 24, 26, 28, 30])
+POTENTIAL_AGE_FACTORS = np.array([
+    [0.25, 0.2, 0.15, 0.1, 0.05, 0.0, 0.0],
+    [0.25, 0.22, 0.18, 0.15, 0.1, 0.05, 0.0]
+])
+
+# Prospect boost per year under 22 for these potential levels
+PROSPECT_BOOSTS = {
+    'elite': 8,
+    'franchise': 12,
+    'generational': 18,
+    'top6': 4
+}
+
+
+def _column(values: Any, size: int, dtype: Any = None) -> np.ndarray:
+    """Broadcast a scalar or sequence argument of the batch valuation to a column."""
+    if isinstance(values, (str, bytes)) or np.ndim(values) == 0:
+        return np.full(size, values, dtype=dtype if dtype is not None else object)
+    column = np.asarray(values, dtype=dtype if dtype is not None else object)
+    if len(column) != size:
+        raise ValueError(f"Expected {size} values, got {len(column)}")
+    return column
+
+
+def _encode(values: Any, size: int) -> Tuple[List[Any], np.ndarray]:
+    """
+    Dictionary-encode a batch valuation argument.
+    
+    Values that are already encoded can be passed as a (distinct values,
+    codes) tuple, like the PlayerStore keeps its string columns.
+    
+    Returns:
+        Tuple of (distinct values, index of each player's value in them)
+    """
+    if isinstance(values, tuple):
+        unique, inverse = values
+        inverse = np.asarray(inverse, dtype=np.intp)
+        if len(inverse) != size:
+            raise ValueError(f"Expected {size} values, got {len(inverse)}")
+        return list(unique), inverse
+    if isinstance(values, (str, bytes)) or np.ndim(values) == 0:
+        return [values], np.zeros(size, dtype=np.intp)
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'iuf' and len(values):
+        low, high = values.min(), values.max()
+        if high - low < 1024 and (values.dtype.kind != 'f' or np.array_equal(values, np.floor(values))):
+            # Whole numbers in a small range (ages, ratings): offset from the minimum
+            inverse = (values - low).astype(np.intp)
+            unique = (np.arange(int(high - low) + 1) + low).astype(values.dtype).tolist()
+            return unique, inverse
+    if isinstance(values, np.ndarray) and values.dtype != object:
+        unique, inverse = np.unique(values, return_inverse=True)
+        unique = unique.tolist()
+    else:
+        if isinstance(values, np.ndarray):
+            values = values.tolist()
+        index = {}
+        inverse = np.array([index.setdefault(v, len(index)) for v in values], dtype=np.intp)
+        unique = list(index)
+    if len(inverse) != size:
+        raise ValueError(f"Expected {size} values, got {len(inverse)}")
+    return unique, inverse
+
+
+def _map_unique(values: Any, size: int, function) -> np.ndarray:
+    """Apply a scalar function once per distinct value and scatter the results."""
+    unique, inverse = _encode(values, size)
+    return np.array([function(v) for v in unique], dtype=np.float64)[inverse]
+
+
+def _probability(value: Any) -> float:
+    """Certainty/volatility value: words are mapped, numbers clamped to 0-1."""
+    if isinstance(value, str):
+        return PROBABILITY_WORDS.get(value.lower(), 0.5)
+    return max(0.0, min(1.0, float(value)))
+
+
+def _probability_column(values: Any, size: int) -> np.ndarray:
+    """Certainty/volatility column, as converted by calculate_player_trade_value."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'fiub':
+        numbers = values.astype(np.float64)
+        if len(numbers) != size:
+            raise ValueError(f"Expected {size} values, got {len(numbers)}")
+        # Same result as max(0.0, min(1.0, value)), including NaN -> 1.0
+        return np.where(np.isnan(numbers), 1.0, np.clip(numbers, 0.0, 1.0))
+    return _map_unique(values, size, _probability)
+
+
+def _round_tenths(values: np.ndarray) -> np.ndarray:
+    """round(value, 1) on an array, matching Python's correctly rounded result."""
+    rounded = np.round(values, 1)
+    # np.round scales by 10 first, which can land on the wrong side of a
+    # tie; those few values are rounded with Python instead
+    scaled = values * 10
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        rounded[i] = round(float(values[i]), 1)
+    return rounded
+
+
+def calculate_player_trade_values(
+    overall: Any,
+    age: Any,
+    position: Any,
+    contract_type: Any = "UFA",
+    term_years: Any = 0,
+    aav_millions: Any = 0,
+    potential: Any = "bottom6",
+    potential_certainty: Any = 0.5,
+    potential_volatility: Any = 0.5,
+    is_captain: Any = False,
+    is_alternate: Any = False,
+    stanley_cups: Any = 0,
+    has_major_awards: Any = False
+) -> np.ndarray:
+    """
+    Calculate the trade value of many players at once on a 0-100 scale.
+    
+    Takes the same parameters as calculate_player_trade_value, each either a
+    sequence with one value per player or a single value shared by all, and
+    returns exactly the values the scalar function would. String parameters
+    (position, contract_type, potential) can also be passed dictionary-encoded
+    as a (distinct values, codes) tuple, which skips encoding them. Terms that only
+    depend on one attribute (overall, age, position, contract type,
+    potential) are computed once per distinct value with the scalar
+    helpers; everything else is evaluated with NumPy in the same order of
+    operations as the scalar function.
+    
+    Parameters:
+    -----------
+    overall : array-like
+        Players' Overall ratings (0-100)
+    age : array-like
+        Players' ages in years
+    position : array-like or str
+        Player positions
+    (remaining parameters as in calculate_player_trade_value)
+    
+    Returns:
+    --------
+    np.ndarray
+        Trade values on a 0-100 scale
+    """
+    overall = np.asarray(overall, dtype=np.float64).reshape(-1)
+    size = len(overall)
+    if size == 0:
+        return np.empty(0, dtype=np.float64)
+    
+    # Type conversion as in the scalar function (int() truncates)
+    age = np.trunc(_column(age, size, np.float64)).astype(np.int64)
+    term_years = np.trunc(_column(term_years, size, np.float64)).astype(np.int64)
+    aav_millions = _column(aav_millions, size, np.float64)
+    stanley_cups = np.trunc(_column(stanley_cups, size, np.float64)).astype(np.int64)
+    is_captain = _column(is_captain, size, bool)
+    is_alternate = _column(is_alternate, size, bool)
+    has_major_awards = _column(has_major_awards, size, bool)
+    certainty = _probability_column(potential_certainty, size)
+    volatility = _probability_column(potential_volatility, size)
+    potential_levels, potential = _encode(potential, size)
+    potential_levels = [str(p).lower() for p in potential_levels]
+    
+    star = overall >= 88
+    # High overall players have proven their value, so volatility matters less
+    adjusted_volatility = np.where(star, volatility * 0.7, volatility)
+    
+    # Modifiers
+    age_mod = _map_unique(age, size, calculate_age_modifier)
+    position_mod = _map_unique(position, size, calculate_position_modifier)
+    
+    # Term and AAV modifiers: age group (young, prime, older) x bracket
+    age_group = (age >= 27).astype(np.intp) + (age > 32)
+    term_bracket = np.searchsorted(CONTRACT_TERM_BRACKETS, term_years, side='right')
+    term_mod = CONTRACT_TERM_MODIFIERS[age_group, term_bracket]
+    aav_limits = CONTRACT_AAV_BRACKETS[age_group]
+    aav_bracket = ((aav_millions >= aav_limits[:, 0]).astype(np.intp) + (aav_millions >= aav_limits[:, 1]) +
+                   (aav_millions >= aav_limits[:, 2]))
+    aav_mod = CONTRACT_AAV_MODIFIERS[age_group, aav_bracket]
+    contract_type_mod = _map_unique(contract_type, size, _contract_type_modifier)
+    contract_mod = 0.4 * contract_type_mod + 0.3 * term_mod + 0.3 * aav_mod
+    
+    base_potential = np.array([calculate_potential_modifier(p, 1.0, 0.0) for p in potential_levels])[potential]
+    potential_mod = base_potential * certainty * (1.0 - adjusted_volatility * 0.45)
+    
+    base_leadership = np.where(is_captain, 0.2, np.where(is_alternate, 0.1, 0.0))
+    leadership_mod = base_leadership + np.minimum(stanley_cups * 0.05, 0.2) * (1 + base_leadership * 0.5)
+    intangibles_mod = np.where(has_major_awards, 0.1, 0.0)
+    
+    ratings, rating_index = _encode(overall, size)
+    base_value = np.array([calculate_exponential_overall_value(o) for o in ratings])[rating_index]
+    
+    # Age-based weight of potential, with less drop-off for high overall players
+    age_bracket = np.searchsorted(POTENTIAL_AGE_BRACKETS, age, side='right')
+    age_potential_factor = POTENTIAL_AGE_FACTORS[star.astype(np.intp), age_bracket]
+    age_weight = np.where(age > 32, 0.25, 0.15)
+    potential_weight = 0.2 + age_potential_factor
+    
+    multiplier = (1 +
+                  age_weight * age_mod +
+                  0.15 * contract_mod +
+                  0.2 * position_mod +
+                  potential_weight * potential_mod +
+                  0.05 * leadership_mod +
+                  0.05 * intangibles_mod)
+    
+    trade_value = np.array([_overall_scale(o) for o in ratings])[rating_index] * base_value * multiplier
+    
+    # Prospect boost by potential level (other levels scale with the potential modifier)
+    level_boost = np.array([PROSPECT_BOOSTS.get(p, np.nan) for p in potential_levels])[potential]
+    age_factor = (22 - age) / 3
+    potential_boost = np.where(np.isnan(level_boost), np.maximum(0, potential_mod * 8), level_boost) * age_factor
+    potential_boost = potential_boost * (certainty * (1 - 0.65 * adjusted_volatility))
+    trade_value = np.where(age < 22, trade_value + potential_boost, trade_value)
+    
+    # Award, cup and aging contract adjustments
+    award_boost = np.where(overall >= 92, 7, np.where(overall >= 88, 4, 2))
+    trade_value = np.where(has_major_awards, trade_value + award_boost, trade_value)
+    trade_value = np.where(stanley_cups > 0, trade_value + np.minimum(stanley_cups * 3, 12), trade_value)
+    aging_penalty = np.minimum((age - 32) * (term_years - 2) * 2.5, 25)
+    trade_value = np.where((age > 32) & (term_years > 2), trade_value - aging_penalty, trade_value)
+    
+    # Cap at 99 and ensure non-negative value
+    trade_value = np.maximum(np.minimum(trade_value, 99), 0)
+    
+    return _round_tenths(trade_value)
+
+
+def player_asset_values(players: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Batch version of player_asset_value.
+    
+    Parameters:
+    -----------
+    players : List[Dict]
+        Player dictionaries from a trade payload (or whole rosters)
+    
+    Returns:
+    --------
+    np.ndarray
+        Trade values on a 0-100 scale, in the order of the players
+    """
+    store = get_player_store()
+    overall, age, position = [], [], []
+    for player in players:
+        o, a, p = player.get('overall'), player.get('age'), player.get('position')
+        if o is None or a is None or p is None:
+            row = store.row(player.get('id'))
+            if row is not None:
+                o = o if o is not None else row.overall
+                a = a if a is not None else row.age
+                p = p if p is not None else row.position
+        overall.append(o if o is not None else 0)
+        age.append(a if a is not None else 0)
+        position.append(p if p is not None else '')
+    
+    def field(name: str, default: Any) -> List[Any]:
+        return [player.get(name, default) for player in players]
+    
+    return calculate_player_trade_values(
+        overall=np.asarray(overall, dtype=np.float64),
+        age=np.asarray(age, dtype=np.float64),
+        position=position,
+        contract_type=field('contract_type', 'UFA'),
+        term_years=field('term_years', 0),
+        aav_millions=field('aav_millions', 0),
+        potential=field('potential', 'bottom6'),
+        potential_certainty=field('potential_certainty', 0.5),
+        potential_volatility=field('potential_volatility', 0.5),
+        is_captain=field('is_captain', False),
+        is_alternate=field('is_alternate', False),
+        stanley_cups=field('stanley_cups', 0),
+        has_major_awards=field('has_major_awards', False)
+    )
+
+
+def store_trade_values(player_ids: Optional[List[Any]] = None) -> Tuple[List[Any], np.ndarray]:
+    """
+    Value players straight from the shared player store's columns.
+    
+    Same values as player_asset_value({'id': player_id}) for each player:
+    overall, age and position come from the store and the other parameters
+    take their defaults. Positions are passed on as the store's category
+    codes, so a whole league is valued without touching a dictionary.
+    
+    Parameters:
+    -----------
+    player_ids : List, optional
+        Players to value (every stored player when None); unknown ids are skipped
+    
+    Returns:
+    --------
+    Tuple[List, np.ndarray]
+        Player ids and their trade values on a 0-100 scale
+    """
+    store = get_player_store()
+    if player_ids is None:
+        rows = np.flatnonzero(store.valid_mask())
+    else:
+        rows = store.rows(player_ids)
+        rows = rows[rows >= 0]
+    
+    ids = store.column('id')[rows].tolist()
+    overall = store.column('overall')[rows]
+    age = store.column('age')[rows]
+    
+    # Missing positions (code -1) use the last entry, as in player_asset_value
+    positions = store.categories('position') + ['']
+    position_codes = store.column('position')[rows].astype(np.intp)
+    position_codes = np.where(position_codes >= 0, position_codes, len(positions) - 1)
+    
+    values = calculate_player_trade_values(
+        overall=np.where(np.isnan(overall), 0.0, overall),
+        age=np.where(np.isnan(age), 0.0, age),
+        position=(positions, position_codes)
+    )
+    return ids, values
+
+
 def evaluate_trade(
     team1_players: List[Dict[str, Any]], 
     team2_players: List[Dict[str, Any]],
@@ -722,21 +1129,7 @@ def evaluate_trade(
     # Process player assets for team1
     for player in team1_players:
         # Calculate the player's trade value
-        value = calculate_player_trade_value(
-            overall=player.get('overall', 0),
-            age=player.get('age', 0),
-            position=player.get('position', ''),
-            contract_type=player.get('contract_type', 'UFA'),
-            term_years=player.get('term_years', 0),
-            aav_millions=player.get('aav_millions', 0),
-            potential=player.get('potential', 'bottom6'),
-            potential_certainty=player.get('potential_certainty', 0.5),
-            potential_volatility=player.get('potential_volatility', 0.5),
-            is_captain=player.get('is_captain', False),
-            is_alternate=player.get('is_alternate', False),
-            stanley_cups=player.get('stanley_cups', 0),
-            has_major_awards=player.get('has_major_awards', False)
-        )
+        value = player_asset_value(player)
         
         # Add to outgoing value from team1
         team1_outgoing += value
@@ -755,21 +1148,7 @@ def evaluate_trade(
     
     # Process player assets for team2
     for player in team2_players:
-        value = calculate_player_trade_value(
-            overall=player.get('overall', 0),
-            age=player.get('age', 0),
-            position=player.get('position', ''),
-            contract_type=player.get('contract_type', 'UFA'),
-            term_years=player.get('term_years', 0),
-            aav_millions=player.get('aav_millions', 0),
-            potential=player.get('potential', 'bottom6'),
-            potential_certainty=player.get('potential_certainty', 0.5),
-            potential_volatility=player.get('potential_volatility', 0.5),
-            is_captain=player.get('is_captain', False),
-            is_alternate=player.get('is_alternate', False),
-            stanley_cups=player.get('stanley_cups', 0),
-            has_major_awards=player.get('has_major_awards', False)
-        )
+        value = player_asset_value(player)
         
         # Add to outgoing value from team2
         team2_outgoing += value
@@ -788,21 +1167,7 @@ def evaluate_trade(
     # Process player assets for team3 (if three-way trade)
     if is_three_way and team3_players:
         for player in team3_players:
-            value = calculate_player_trade_value(
-                overall=player.get('overall', 0),
-                age=player.get('age', 0),
-                position=player.get('position', ''),
-                contract_type=player.get('contract_type', 'UFA'),
-                term_years=player.get('term_years', 0),
-                aav_millions=player.get('aav_millions', 0),
-                potential=player.get('potential', 'bottom6'),
-                potential_certainty=player.get('potential_certainty', 0.5),
-                potential_volatility=player.get('potential_volatility', 0.5),
-                is_captain=player.get('is_captain', False),
-                is_alternate=player.get('is_alternate', False),
-                stanley_cups=player.get('stanley_cups', 0),
-                has_major_awards=player.get('has_major_awards', False)
-            )
+            value = player_asset_value(player)
             
             # Add to outgoing value from team3
             team3_outgoing += value
@@ -1048,6 +1413,52 @@ def evaluate_trade(
     return result
 
 
+def quality_tier_multiplier(value: float) -> float:
+    """
+    Quality premium of an asset in the quality vs. quantity adjustment.
+    Players over certain thresholds get extra weight to reflect the NHL premium on star players.
+    """
+    # Apply quality tiers with higher premiums for top players
+    if value >= 95:  # Generational tier (McDavid, etc.)
+        return 1.25  # Increased from 1.15
+    elif value >= 90:  # Superstar tier
+        return 1.18  # Increased from 1.15
+    elif value >= 85:  # Star tier
+        return 1.12  # Increased from 1.10
+    elif value >= 75:  # Elite tier
+        return 1.05
+    elif value >= 65:  # Top tier
+        return 1.02
+    return 1.0
+
+
+def quantity_discount(index: int) -> float:
+    """
+    Discount of the asset at `index` (0 = most valuable) in a package.
+    Each additional player has less impact, with steeper discounts for additional players.
+    """
+    if index == 0:
+        return 0.0  # No discount for primary player
+    elif index == 1:
+        return 0.15  # 15% discount for second player (increased from 8%)
+    elif index == 2:
+        return 0.25  # 25% discount for third player (increased from 16%)
+    # Steeper discounts for additional players
+    return min(0.25 + (index - 2) * 0.12, 0.7)  # Up to 70% discount (increased from 50%)
+
+
+# NHL teams value roster spots and consolidating talent
+MAX_EFFICIENT_PLAYERS = 2  # Reduced from 3 to 2 for stricter roster spot value
+
+
+def roster_spot_penalty(count: int, raw_total: float) -> float:
+    """Penalty for a team receiving more than MAX_EFFICIENT_PLAYERS assets in a deal."""
+    if count > MAX_EFFICIENT_PLAYERS:
+        # Increased penalty for having too many players in a deal
+        return 0.05 * (count - MAX_EFFICIENT_PLAYERS) * raw_total  # Increased from 0.03
+    return 0
+
+
 def apply_quality_adjustment(
     team1_values: List[Dict[str, float]], 
     team2_values: List[Dict[str, float]]
@@ -1086,34 +1497,7 @@ def apply_quality_adjustment(
         adjusted_total = 0
         
         for i, value in enumerate(player_values):
-            # Apply quality tiers with higher premiums for top players
-            if value >= 95:  # Generational tier (McDavid, etc.)
-                tier_multiplier = 1.25  # Increased from 1.15
-            elif value >= 90:  # Superstar tier
-                tier_multiplier = 1.18  # Increased from 1.15
-            elif value >= 85:  # Star tier
-                tier_multiplier = 1.12  # Increased from 1.10
-            elif value >= 75:  # Elite tier
-                tier_multiplier = 1.05
-            elif value >= 65:  # Top tier
-                tier_multiplier = 1.02
-            else:
-                tier_multiplier = 1.0
-            
-            # Apply quantity diminishing factor - each additional player has less impact
-            # First players have highest impact, additional players have steeper diminishing returns
-            # Steeper discounts for additional players
-            if i == 0:
-                position_discount = 0.0  # No discount for primary player
-            elif i == 1:
-                position_discount = 0.15  # 15% discount for second player (increased from 8%)
-            elif i == 2:
-                position_discount = 0.25  # 25% discount for third player (increased from 16%)
-            else:
-                # Steeper discounts for additional players
-                position_discount = min(0.25 + (i - 2) * 0.12, 0.7)  # Up to 70% discount (increased from 50%)
-            
-            player_adjusted = value * tier_multiplier * (1 - position_discount)
+            player_adjusted = value * quality_tier_multiplier(value) * (1 - quantity_discount(i))
             adjusted_total += player_adjusted
         
         return adjusted_total
@@ -1123,18 +1507,8 @@ def apply_quality_adjustment(
     team2_adjusted = calculate_quality_adjusted_value(team2_player_values)
     
     # Apply roster spot penalty for teams receiving many players
-    # NHL teams value roster spots and consolidating talent
-    max_efficient_players = 2  # Reduced from 3 to 2 for stricter roster spot value
-    
-    if len(team1_player_values) > max_efficient_players:
-        # Increased penalty for having too many players in a deal
-        roster_penalty = 0.05 * (len(team1_player_values) - max_efficient_players) * team1_raw_total  # Increased from 0.03
-        team1_adjusted -= roster_penalty
-    
-    if len(team2_player_values) > max_efficient_players:
-        # Increased penalty for having too many players in a deal
-        roster_penalty = 0.05 * (len(team2_player_values) - max_efficient_players) * team2_raw_total  # Increased from 0.03
-        team2_adjusted -= roster_penalty
+    team1_adjusted -= roster_spot_penalty(len(team1_player_values), team1_raw_total)
+    team2_adjusted -= roster_spot_penalty(len(team2_player_values), team2_raw_total)
     
     return team1_adjusted, team2_adjusted
 
@@ -1183,34 +1557,7 @@ def apply_quality_adjustment_three_way(
         adjusted_total = 0
         
         for i, value in enumerate(player_values):
-            # Apply quality tiers with higher premiums for top players
-            if value >= 95:  # Generational tier (McDavid, etc.)
-                tier_multiplier = 1.25  # Increased from 1.15
-            elif value >= 90:  # Superstar tier
-                tier_multiplier = 1.18  # Increased from 1.15
-            elif value >= 85:  # Star tier
-                tier_multiplier = 1.12  # Increased from 1.10
-            elif value >= 75:  # Elite tier
-                tier_multiplier = 1.05
-            elif value >= 65:  # Top tier
-                tier_multiplier = 1.02
-            else:
-                tier_multiplier = 1.0
-            
-            # Apply quantity diminishing factor - each additional player has less impact
-            # First players have highest impact, additional players have steeper diminishing returns
-            # Steeper discounts for additional players
-            if i == 0:
-                position_discount = 0.0  # No discount for primary player
-            elif i == 1:
-                position_discount = 0.15  # 15% discount for second player (increased from 8%)
-            elif i == 2:
-                position_discount = 0.25  # 25% discount for third player (increased from 16%)
-            else:
-                # Steeper discounts for additional players
-                position_discount = min(0.25 + (i - 2) * 0.12, 0.7)  # Up to 70% discount (increased from 50%)
-            
-            player_adjusted = value * tier_multiplier * (1 - position_discount)
+            player_adjusted = value * quality_tier_multiplier(value) * (1 - quantity_discount(i))
             adjusted_total += player_adjusted
         
         return adjusted_total
@@ -1221,23 +1568,9 @@ def apply_quality_adjustment_three_way(
     team3_adjusted = calculate_quality_adjusted_value(team3_player_values)
     
     # Apply roster spot penalty for teams receiving many players
-    # NHL teams value roster spots and consolidating talent
-    max_efficient_players = 2  # Reduced from 3 to 2 for stricter roster spot value
-    
-    if len(team1_player_values) > max_efficient_players:
-        # Increased penalty for having too many players in a deal
-        roster_penalty = 0.05 * (len(team1_player_values) - max_efficient_players) * team1_raw_total  # Increased from 0.03
-        team1_adjusted -= roster_penalty
-    
-    if len(team2_player_values) > max_efficient_players:
-        # Increased penalty for having too many players in a deal
-        roster_penalty = 0.05 * (len(team2_player_values) - max_efficient_players) * team2_raw_total  # Increased from 0.03
-        team2_adjusted -= roster_penalty
-    
-    if len(team3_player_values) > max_efficient_players:
-        # Increased penalty for having too many players in a deal
-        roster_penalty = 0.05 * (len(team3_player_values) - max_efficient_players) * team3_raw_total  # Increased from 0.03
-        team3_adjusted -= roster_penalty
+    team1_adjusted -= roster_spot_penalty(len(team1_player_values), team1_raw_total)
+    team2_adjusted -= roster_spot_penalty(len(team2_player_values), team2_raw_total)
+    team3_adjusted -= roster_spot_penalty(len(team3_player_values), team3_raw_total)
     
     return team1_adjusted, team2_adjusted, team3_adjusted
 
@@ -1,5 +1,8 @@
 import os
+import threading
+import httpx
 from supabase import create_client, Client
+from postgrest.utils import SyncClient
 from flask import current_app, Blueprint, jsonify
 from dotenv import load_dotenv
 from unittest.mock import MagicMock
@@ -17,8 +20,110 @@ load_dotenv()
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
-# Global Supabase client instance
-_supabase_client = None
+# Connection pool settings for the shared Supabase HTTP client
+SUPABASE_POOL_MAX_CONNECTIONS = int(os.getenv('SUPABASE_POOL_MAX_CONNECTIONS', 20))
+SUPABASE_POOL_MAX_KEEPALIVE = int(os.getenv('SUPABASE_POOL_MAX_KEEPALIVE', 10))
+SUPABASE_POOL_KEEPALIVE_EXPIRY = float(os.getenv('SUPABASE_POOL_KEEPALIVE_EXPIRY', 30))
+SUPABASE_HTTP_TIMEOUT = float(os.getenv('SUPABASE_HTTP_TIMEOUT', 120))
+# 'auto' enables HTTP/2 when the h2 package is installed
+SUPABASE_HTTP2 = os.getenv('SUPABASE_HTTP2', 'auto').lower()
+
+# Pooled clients keyed by (process id, url, key)
+_pooled_clients = {}
+_pooled_clients_lock = threading.Lock()
+
+
+def _http2_enabled() -> bool:
+    """Return whether the pooled HTTP client should negotiate HTTP/2."""
+    if SUPABASE_HTTP2 in ('0', 'false', 'no', 'off'):
+        return False
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        if SUPABASE_HTTP2 not in ('auto', ''):
+            print("WARNING: SUPABASE_HTTP2 is enabled but the h2 package is not installed, using HTTP/1.1")
+        return False
+
+
+def create_pooled_client(url: str, key: str) -> Client:
+    """
+    Create a Supabase client whose PostgREST session uses a keep-alive connection pool.
+    
+    The session created by create_client() is replaced with one configured
+    with the pool limits above (and HTTP/2 when available); headers, base URL
+    and timeout are carried over.
+    
+    Args:
+        url: Supabase URL
+        key: Supabase API key
+        
+    Returns:
+        Supabase client
+    """
+    client = create_client(url, key)
+    
+    session = client.postgrest.session
+    pooled_session = SyncClient(
+        base_url=session.base_url,
+        headers=session.headers,
+        timeout=httpx.Timeout(SUPABASE_HTTP_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=SUPABASE_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=SUPABASE_POOL_KEEPALIVE_EXPIRY
+        ),
+        http2=_http2_enabled()
+    )
+    session.close()
+    client.postgrest.session = pooled_session
+    
+    return client
+
+
+def get_pooled_client(url: str = None, key: str = None) -> Client:
+    """
+    Get the shared connection-pooled Supabase client.
+    
+    One client is created per process and set of credentials and reused by
+    every caller, so connections and TLS sessions are set up once instead of
+    on every request. Worker processes get their own client.
+    
+    Args:
+        url: Supabase URL (defaults to SUPABASE_URL)
+        key: Supabase API key (defaults to SUPABASE_KEY)
+        
+    Returns:
+        Supabase client
+    """
+    url = url or SUPABASE_URL
+    key = key or SUPABASE_KEY
+    cache_key = (os.getpid(), url, key)
+    
+    client = _pooled_clients.get(cache_key)
+    if client is not None:
+        return client
+    
+    with _pooled_clients_lock:
+        client = _pooled_clients.get(cache_key)
+        if client is None:
+            client = create_pooled_client(url, key)
+            _pooled_clients[cache_key] = client
+    return client
+
+
+def close_pooled_clients() -> None:
+    """Close every pooled client created by this process."""
+    with _pooled_clients_lock:
+        for cache_key, client in list(_pooled_clients.items()):
+            if cache_key[0] != os.getpid():
+                continue
+            try:
+                client.postgrest.session.close()
+            except Exception as e:
+                print(f"Error closing Supabase client: {e}")
+            del _pooled_clients[cache_key]
+
 
 def get_supabase() -> Client:
     """
@@ -28,12 +133,6 @@ def get_supabase() -> Client:
     Returns:
         Supabase client
     """
-    global _supabase_client
-    
-    # Return existing client if available
-    if _supabase_client is not None:
-        return _supabase_client
-    
     # Get URL and key from environment or Flask config if available
     url = SUPABASE_URL
     key = SUPABASE_KEY
@@ -55,9 +154,8 @@ def get_supabase() -> Client:
         mock_client.table().select().execute.return_value.data = []
         return mock_client
     
-    # Create new client
-    _supabase_client = create_client(url, key)
-    return _supabase_client
+    # Shared pooled client
+    return get_pooled_client(url, key)
 
 # Alias for backward compatibility and clarity
 get_supabase_client = get_supabase
@@ -500,6 +598,15 @@ def update_draft_pick(pick_id, pick_data):
     supabase = get_supabase()
     response = supabase.table('DraftPick').update(pick_data).eq('id', pick_id).execute()
     
+    # A pick with a player attached changes the drafting team's roster
+    if pick_data.get('player_id') is not None:
+        from .services.formation_cache import invalidate_roster_change
+        invalidate_roster_change(player_id=pick_data.get('player_id'), team_id=pick_data.get('team_id'))
+        
+        # The player is no longer on the board of available prospects
+        from .services.draft.draft_ranking import SUPABASE_SOURCE, remove_prospects
+        remove_prospects([pick_data.get('player_id')], SUPABASE_SOURCE)
+    
     if response.data and len(response.data) > 0:
         return response.data[0]
     return None
@@ -518,6 +625,19 @@ def update_player(player_id, player_data):
     supabase = get_supabase()
     response = supabase.table('Player').update(player_data).eq('id', player_id).execute()
     
+    # Drop cached formations for the player's old and new team
+    from .services.formation_cache import invalidate_roster_change
+    invalidate_roster_change(player_id=player_id, team_abbreviation=player_data.get('team'),
+                             team_id=player_data.get('team_id'))
+    
+    # Ratings, age or team may have changed the player's trade value
+    from .services.trade_value_index import refresh_trade_value
+    refresh_trade_value(player_id, player_data)
+    
+    # Keep cached draft boards in sync with the changed fields
+    from .services.draft.draft_ranking import SUPABASE_SOURCE, prospect_changed
+    prospect_changed(player_id, player_data, SUPABASE_SOURCE)
+    
     if response.data and len(response.data) > 0:
         return response.data[0]
     return None 
\ No newline at end of file
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for cached draft boards and the draft engine's prospect queue.
+Run this file from the backend directory: python3 test_draft_ranking.py
+"""
+
+from datetime import datetime
+from unittest import mock
+import unittest
+
+from app import create_app
+from app.config.config import config_by_name
+from app.extensions import db
+from app.services.player import Player
+from app.services.team_service import Team
+from app.services.draft.draft_engine import Draft, DraftEngine, DraftPick
+from app.services.draft.draft_ranking import (
+    LOCAL_SOURCE,
+    SUPABASE_SOURCE,
+    get_draft_board,
+    invalidate_draft_boards,
+    remove_prospects
+)
+from app.services.draft.prospect_queue import get_prospect_queue, invalidate_prospect_queue
+
+
+class TestDraftBoardSources(unittest.TestCase):
+    """Supabase and SQLAlchemy players share integer ids but are different players."""
+
+    def setUp(self):
+        config_by_name['testing'].SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        self.app = create_app('testing')
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        invalidate_draft_boards()
+        invalidate_prospect_queue()
+
+        self.year = datetime.now().year
+        for team_id in (1, 2):
+            db.session.add(Team(id=team_id, name=f'Team {team_id}', city='City', abbreviation=f'T{team_id:02d}'))
+        for player_id in range(1, 7):
+            db.session.add(Player(id=player_id, first_name='Local', last_name=str(player_id), position_primary='C',
+                                  overall_rating=40 + player_id, age=17))
+        db.session.commit()
+
+        # Same ids as the local players, other people (and one id unknown locally)
+        remote = [{'id': player_id, 'first_name': 'Remote', 'last_name': str(player_id), 'position': 'D',
+                   'overall_rating': 95 - player_id, 'age': 17} for player_id in (1, 2, 3, 4, 5, 6, 50)]
+        self.supabase = mock.patch('app.supabase_client.get_draft_eligible_players',
+                                   side_effect=lambda year=None, **kwargs: [dict(p) for p in remote])
+        self.supabase.start()
+
+    def tearDown(self):
+        self.supabase.stop()
+        invalidate_draft_boards()
+        invalidate_prospect_queue()
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+
+    def test_boards_keep_their_source(self):
+        """The public board reads Supabase, the engine's board reads SQLAlchemy"""
+        public = get_draft_board(self.year)
+        local = get_draft_board(self.year, LOCAL_SOURCE)
+        self.assertEqual(public.source, SUPABASE_SOURCE)
+        self.assertEqual(local.source, LOCAL_SOURCE)
+        self.assertIn(50, public)
+        self.assertNotIn(50, local)
+        self.assertEqual({p['first_name'] for p in local.page()}, {'Local'})
+
+    def test_queue_holds_local_players(self):
+        """The prospect queue is built from the database the engine writes picks to"""
+        get_draft_board(self.year)
+        queue = get_prospect_queue('draft', self.year)
+        prospects = queue.available()
+        self.assertEqual(sorted(p['id'] for p in prospects), list(range(1, 7)))
+        self.assertEqual({p['first_name'] for p in prospects}, {'Local'})
+
+        # A Supabase pick of a colliding id leaves the local prospect available
+        remove_prospects([1], SUPABASE_SOURCE)
+        self.assertNotIn(1, get_draft_board(self.year))
+        self.assertTrue(queue.is_available(1))
+        self.assertIn(1, get_draft_board(self.year, LOCAL_SOURCE))
+
+    def test_engine_drafts_local_prospects(self):
+        """A simulated draft records the best local prospects, not Supabase ids"""
+        draft = Draft(year=self.year, round_count=1, status='pending', current_round=1, current_pick=1)
+        db.session.add(draft)
+        db.session.commit()
+        for pick_num in (1, 2):
+            db.session.add(DraftPick(draft_id=draft.id, round_num=1, pick_num=pick_num, team_id=pick_num,
+                                     overall_pick=pick_num))
+        db.session.commit()
+
+        expected = [p['id'] for p in get_draft_board(self.year, LOCAL_SOURCE).page(limit=2)]
+        get_draft_board(self.year)
+
+        engine = DraftEngine()
+        engine.draft = draft
+        engine.draft_year = self.year
+        engine.simulate_entire_draft(in_memory=True)
+
+        picks = DraftPick.query.order_by(DraftPick.overall_pick).all()
+        self.assertEqual([pick.player_id for pick in picks], expected)
+        for player_id in expected:
+            self.assertEqual(Player.query.get(player_id).draft_year, self.year)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,11 +7,16 @@ Run this file from the backend directory: python3 test_trade_value.py
 import json
 from app.services.value_trade import (
     calculate_player_trade_value,
+    calculate_player_trade_values,
     calculate_draft_pick_value,
     evaluate_trade,
     visualize_trade_balance,
     apply_quality_adjustment
 )
+from app.services.trade_finder import build_assets, find_packages, adjusted_package_value
+from app.services.trade_value_index import get_trade_value_index
+import itertools
+import random
 import unittest
 
 
@@ -479,6 +484,121 @@ class TestTradeValue(unittest.TestCase):
         pick_values = [p for p in result["team2"]["players_values"] if "Round" in p["name"]]
         self.assertGreaterEqual(len(pick_values), 1, "Draft pick should be included in value list")
 
+    def test_batch_values_match_scalar(self):
+        """Test that batch trade values are exactly the scalar values"""
+        rng = random.Random(42)
+        players = []
+        for _ in range(3000):
+            players.append({
+                "overall": rng.choice([rng.randint(40, 99), round(rng.uniform(40, 99.9), 1)]),
+                "age": rng.randint(17, 42),
+                "position": rng.choice(["C", "LW", "RW", "D", "G", "Center", "Defense", "Wing"]),
+                "contract_type": rng.choice(["UFA", "RFA", "2Way", "Unsigned", "ELC"]),
+                "term_years": rng.randint(0, 8),
+                "aav_millions": round(rng.uniform(0.5, 15), 2),
+                "potential": rng.choice(["AHL", "4th", "bottom6", "Top9", "top6", "Elite", "Franchise", "Generational"]),
+                "potential_certainty": rng.choice([rng.uniform(-0.2, 1.2), "low", "High", "very high"]),
+                "potential_volatility": rng.choice([rng.uniform(-0.2, 1.2), "medium", "very low"]),
+                "is_captain": rng.random() < 0.1,
+                "is_alternate": rng.random() < 0.2,
+                "stanley_cups": rng.choice([0, 0, 0, 1, 2, 5]),
+                "has_major_awards": rng.random() < 0.1
+            })
+        
+        columns = {field: [p[field] for p in players] for field in players[0]}
+        batch_values = calculate_player_trade_values(**columns)
+        
+        for player, value in zip(players, batch_values):
+            self.assertEqual(value, calculate_player_trade_value(**player), f"Batch value differs for {player}")
+        
+    def test_batch_values_broadcast(self):
+        """Test that single values are shared by every player in a batch"""
+        values = calculate_player_trade_values([92, 75, 83], [27, 19, 37], "Center", contract_type="RFA", term_years=3)
+        expected = [calculate_player_trade_value(o, a, "Center", contract_type="RFA", term_years=3)
+                    for o, a in [(92, 27), (75, 19), (83, 37)]]
+        self.assertEqual(values.tolist(), expected)
+        self.assertEqual(len(calculate_player_trade_values([], [], "C")), 0)
+
+    def test_trade_finder_matches_exhaustive_search(self):
+        """Test that the trade finder returns the packages an exhaustive search finds"""
+        rng = random.Random(7)
+        roster = [{"id": i, "name": f"Player {i}", "overall": rng.randint(62, 92), "age": rng.randint(19, 35),
+                   "position": rng.choice(["C", "LW", "RW", "D", "G"]), "contract_type": "UFA",
+                   "term_years": rng.randint(1, 6), "aav_millions": round(rng.uniform(0.8, 11), 2)}
+                   for i in range(14)]
+        picks = [{"id": f"pick{r}", "round": r, "year": 2027} for r in range(1, 4)]
+        target = [{"id": 100, "overall": 88, "age": 25, "position": "D"}]
+        
+        result = find_packages(roster, picks, target_players=target, top_k=5, max_assets=3, time_budget=30)
+        self.assertTrue(result["complete"])
+        
+        target_value = adjusted_package_value([a["value"] for a in build_assets(target)])
+        assets = [a for a in build_assets(roster, picks) if a["value"] > 0]
+        expected = sorted(abs(adjusted_package_value([a["value"] for a in package]) - target_value)
+                          for size in range(1, 4) for package in itertools.combinations(assets, size))[:5]
+        found = [abs(adjusted_package_value([a["value"] for a in p["assets"]]) - target_value)
+                 for p in result["packages"]]
+        self.assertEqual(sorted(found), expected)
+
+
+class TestTradeValueIndexUpdates(unittest.TestCase):
+    """Player updates through PlayerService keep the trade value index grouped by team abbreviation."""
+    
+    def setUp(self):
+        from app import create_app
+        from app.config.config import config_by_name
+        from app.extensions import db
+        from app.services.player import Player
+        from app.services.team_service import Team
+        
+        config_by_name['testing'].SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        self.app = create_app('testing')
+        self.context = self.app.app_context()
+        self.context.push()
+        db.create_all()
+        
+        db.session.add(Team(id=1, name='Montreal Canadiens', city='Montreal', abbreviation='MTL'))
+        db.session.add(Team(id=2, name='Toronto Maple Leafs', city='Toronto', abbreviation='TOR'))
+        for player_id in (1, 2):
+            db.session.add(Player(id=player_id, first_name='Player', last_name=str(player_id), position_primary='C',
+                                  overall_rating=80, age=26, team_id=1))
+        db.session.commit()
+        
+        self.index = get_trade_value_index()
+        self.index.load([{'id': player_id, 'overall': 80, 'age': 26, 'position': 'C', 'team': 'MTL',
+                          'term_years': 3, 'aav_millions': 5.0} for player_id in (1, 2)])
+    
+    def tearDown(self):
+        from app.extensions import db
+        
+        self.index.load([])
+        db.session.remove()
+        db.drop_all()
+        self.context.pop()
+    
+    def test_update_keeps_team_partition(self):
+        """A rating update moves the player within its team, not to a team named after it"""
+        from app.services.player import PlayerService
+        
+        PlayerService.update_player(1, {'overall_rating': 90})
+        
+        mtl = {entry['id']: entry for entry in self.index.range(team='MTL')}
+        self.assertEqual(set(mtl), {1, 2})
+        self.assertGreater(mtl[1]['value'], mtl[2]['value'])
+        self.assertEqual(self.index.range(team='Montreal Canadiens'), [])
+        self.assertEqual(self.index.team_cap_hit('MTL'), 10.0)
+    
+    def test_team_change_moves_cap_hit(self):
+        """A trade moves the player and its AAV to the new team's abbreviation"""
+        from app.services.player import PlayerService
+        
+        PlayerService.update_player(1, {'team_id': 2})
+        
+        self.assertEqual([entry['id'] for entry in self.index.range(team='TOR')], [1])
+        self.assertEqual([entry['id'] for entry in self.index.range(team='MTL')], [2])
+        self.assertEqual(self.index.team_cap_hit('TOR'), 5.0)
+        self.assertEqual(self.index.team_cap_hit('MTL'), 5.0)
+
 
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file